@@ -0,0 +1,180 @@
+# Agregat penjualan (materialized) untuk dashboard
+# Pendapatan dan jumlah order per brand, kategori, customer, tanggal dan bulan disimpan
+# di array NumPy (satu slot per nilai dimensi). Agregat dibangun sekali saat graph
+# di-load dan diperbarui dari setiap insert/hapus (listener GraphStore): kontribusi
+# order yang berubah dicabut lalu dihitung ulang, tanpa scan ulang semua order.
+#
+# Order hanya punya ex:totalPrice (tanpa harga per item), jadi pendapatan order dibagi
+# rata ke produk di dalamnya untuk agregat brand/kategori. Jumlah order per brand/
+# kategori menghitung order yang berisi minimal satu produk dari brand/kategori itu.
+
+from rdflib import RDF
+from rdflib.namespace import FOAF
+import datetime
+import numpy as np
+import pandas as pd
+import threading
+
+from graph_store import EX, literal_values, local_name, local_namer
+
+DIMENSIONS = ('brand', 'category', 'customer', 'day', 'month')
+
+ORDER_PREDICATES = {RDF.type, EX.purchasedBy, EX.totalPrice, EX.hasDate, EX.orderContains}
+PRODUCT_PREDICATES = {EX.hasBrand, EX.belongsToCategory}
+
+
+class Aggregate:
+    def __init__(self, capacity=64):
+        self.keys = []
+        self.slots = {}
+        self.revenue = np.zeros(capacity)
+        self.orders = np.zeros(capacity, dtype=np.int64)
+
+    def add(self, key, revenue, orders):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.keys)
+            self.keys.append(key)
+            if slot >= len(self.revenue):
+                self.revenue = np.concatenate([self.revenue, np.zeros(len(self.revenue))])
+                self.orders = np.concatenate([self.orders, np.zeros(len(self.orders), dtype=np.int64)])
+        self.revenue[slot] += revenue
+        self.orders[slot] += orders
+
+    def frame(self, label):
+        n = len(self.keys)
+        df = pd.DataFrame({label: self.keys, 'revenue': self.revenue[:n], 'orders': self.orders[:n]})
+        df = df[df['orders'] > 0]
+        return df.sort_values('revenue', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def date_buckets(value, parsed=None):
+    # parsed: tanggal yang sudah di-parse (kamus term CompactStore), jika ada
+    day = parsed.date() if isinstance(parsed, datetime.datetime) else parsed
+    if day is None:
+        text = str(value)
+        try:
+            day = datetime.date.fromisoformat(text[:10])
+        except ValueError:
+            # tanggal tidak valid (mis. "12-12-2025") tetap dikelompokkan apa adanya
+            return text, text
+    return day.isoformat(), day.isoformat()[:7]
+
+
+class OrderAnalytics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.graph = None
+        self.local_name = local_name
+        self.value = None
+        self._reset()
+
+    def _reset(self):
+        self.aggregates = {d: Aggregate() for d in DIMENSIONS}
+        # order -> kontribusi yang sudah dijumlahkan [(dimensi, kunci, revenue, orders)]
+        self.contributions = {}
+        # produk/customer -> order terkait (untuk perubahan brand/kategori/nama)
+        self.product_orders = {}
+        self.customer_orders = {}
+
+    def rebuild(self, g):
+        # satu scan per predicate, lalu di-join di dict
+        def values(pred):
+            return {s: o for s, _, o in g.triples((None, pred, None))}
+
+        orders = set(g.subjects(RDF.type, EX.Order))
+        customers, totals, dates = values(EX.purchasedBy), values(EX.totalPrice), values(EX.hasDate)
+        brands, categories = values(EX.hasBrand), values(EX.belongsToCategory)
+        names = values(FOAF.name)
+        items = {}
+        for o, _, p in g.triples((None, EX.orderContains, None)):
+            items.setdefault(o, set()).add(p)
+        with self.lock:
+            self.graph = g
+            self.local_name, self.value = local_namer(g), literal_values(g)
+            self._reset()
+            for o in orders:
+                self._add_order(o, customers.get(o), totals.get(o), dates.get(o),
+                                items.get(o, set()), brands, categories, names)
+
+    def _typed(self, term):
+        return self.value(term) if self.value is not None else None
+
+    def _add_order(self, o, customer, total, date, products, brands, categories, names):
+        if total is not None:
+            price = self._typed(total)
+            total = price if price is not None else float(total)
+        else:
+            total = 0.0
+        local_name = self.local_name
+        contrib = []
+        if customer is not None:
+            self.customer_orders.setdefault(customer, set()).add(o)
+            name = names.get(customer)
+            contrib.append(('customer', str(name) if name is not None else local_name(customer), total, 1))
+        if date is not None:
+            day, month = date_buckets(date, self._typed(date))
+            contrib.append(('day', day, total, 1))
+            contrib.append(('month', month, total, 1))
+        if products:
+            share = total / len(products)
+            for dim, attr in (('brand', brands), ('category', categories)):
+                seen = set()
+                for p in products:
+                    value = attr.get(p)
+                    key = local_name(value) if value is not None else '(tidak ada)'
+                    contrib.append((dim, key, share, 0 if key in seen else 1))
+                    seen.add(key)
+        for p in products:
+            self.product_orders.setdefault(p, set()).add(o)
+        for dim, key, revenue, count in contrib:
+            self.aggregates[dim].add(key, revenue, count)
+        self.contributions[o] = (contrib, products, customer)
+
+    def _remove_order(self, o):
+        old = self.contributions.pop(o, None)
+        if old is None:
+            return
+        contrib, products, customer = old
+        for dim, key, revenue, count in contrib:
+            self.aggregates[dim].add(key, -revenue, -count)
+        for p in products:
+            self.product_orders.get(p, set()).discard(o)
+        if customer is not None:
+            self.customer_orders.get(customer, set()).discard(o)
+
+    def apply(self, added, removed):
+        touched = set()
+        for triples in (added, removed):
+            for s, p, o in triples:
+                if p in ORDER_PREDICATES and (p != RDF.type or o == EX.Order):
+                    touched.add(s)
+                elif p in PRODUCT_PREDICATES:
+                    touched.update(self.product_orders.get(s, ()))
+                elif p == FOAF.name:
+                    touched.update(self.customer_orders.get(s, ()))
+        if not touched:
+            return
+        g = self.graph
+        with self.lock:
+            for o in touched:
+                self._remove_order(o)
+                if (o, RDF.type, EX.Order) not in g:
+                    continue
+                products = set(g.objects(o, EX.orderContains))
+                brands = {p: g.value(p, EX.hasBrand) for p in products}
+                categories = {p: g.value(p, EX.belongsToCategory) for p in products}
+                customer = g.value(o, EX.purchasedBy)
+                names = {customer: g.value(customer, FOAF.name)} if customer is not None else {}
+                self._add_order(o, customer, g.value(o, EX.totalPrice), g.value(o, EX.hasDate),
+                                products, brands, categories, names)
+
+    def table(self, dimension):
+        labels = {'brand': 'Brand', 'category': 'Kategori', 'customer': 'Customer',
+                  'day': 'Tanggal', 'month': 'Bulan'}
+        with self.lock:
+            return self.aggregates[dimension].frame(labels[dimension])
+
+
+def get_analytics(store):
+    return store.attach('analytics', OrderAnalytics)
@@ -0,0 +1,124 @@
+# Benchmark tulis bersamaan: beberapa thread "session" menyimpan order (Tambah Order)
+# sementara thread pembaca menjalankan kasus 4 SPARQL_QUERIES. Dibandingkan:
+# - langsung: setiap session memanggil store.apply sendiri (log + fsync per order,
+#   dengan group commit fsync bawaan GraphStore)
+# - koordinator: write_coordinator.WriteCoordinator (satu penulis, batch per commit)
+# Pembaca memeriksa setiap order di hasil query lengkap (semua produknya terlihat);
+# di akhir, beberapa session menyimpan ID order yang sama: hanya satu yang boleh berhasil.
+# Jalankan: python benchmarks/bench_concurrent_writes.py [session] [order_per_session] [pembaca]
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib import Literal, RDF
+from rdflib.namespace import XSD
+import numpy as np
+
+from graph_store import EX, GraphStore
+import analytics
+import entity_index
+import product_view
+import sparql
+import write_coordinator
+
+ITEMS = 3
+READ_PAUSE = 0.02
+CHECK_QUERY = '''
+SELECT ?order (COUNT(?product) AS ?n) WHERE {
+  ?order a ex:Order ; ex:orderContains ?product .
+} GROUP BY ?order
+'''
+
+
+def order_triples(oid):
+    order = EX[oid]
+    triples = [
+        (order, RDF.type, EX.Order),
+        (order, EX.purchasedBy, EX.Budi),
+        (order, EX.totalPrice, Literal('100.0', datatype=XSD.decimal)),
+        (order, EX.hasDate, Literal('2024-01-01', datatype=XSD.date)),
+    ]
+    triples += [(order, EX.orderContains, EX[f'{oid}_P{j}']) for j in range(ITEMS)]
+    return order, triples
+
+
+def run(store, write, sessions, per_session, readers):
+    latencies, errors = [], []
+    stop = threading.Event()
+    reads = [0]
+
+    def session(i):
+        for j in range(per_session):
+            order, triples = order_triples(f'S{i}_O{j}')
+            start = time.perf_counter()
+            write(order, triples)
+            latencies.append(time.perf_counter() - start)
+
+    def reader():
+        while not stop.is_set():
+            df = sparql.run_sparql(store, CHECK_QUERY)
+            reads[0] += 1
+            if len(df) and (df['n'].astype(int) != ITEMS).any():
+                errors.append('order setengah tersimpan terlihat oleh pembaca')
+            # jeda seperti pengguna yang membuka halaman, bukan loop penuh
+            time.sleep(READ_PAUSE)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    start = time.perf_counter()
+    writers = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in threads:
+        t.join()
+    return elapsed, latencies, reads[0], errors
+
+
+def conflict_check(writer, sessions):
+    order, triples = order_triples('DUP')
+    futures = [writer.submit(triples, absent=[order]) for _ in range(sessions)]
+    ok = sum(1 for f in futures if f.exception() is None)
+    return ok, sum(1 for f in futures if isinstance(f.exception(), write_coordinator.WriteConflict))
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    total = sessions * per_session
+    print(f'{sessions} session x {per_session} order, {readers} pembaca')
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('langsung', 'koordinator'):
+            store = GraphStore(os.path.join(tmp, f'{name}.ttl'))
+            # listener yang sama dengan main.py: setiap commit juga memperbarui index/view
+            entity_index.get_index(store)
+            product_view.get_view(store)
+            analytics.get_analytics(store)
+            writer = write_coordinator.WriteCoordinator(store)
+            if name == 'langsung':
+                write = lambda order, triples: store.apply(added=triples)
+            else:
+                write = lambda order, triples: writer.write(triples, absent=[order])
+            elapsed, lat, reads, errors = run(store, write, sessions, per_session, readers)
+            lat = np.array(lat) * 1e3
+            print(f'{name:<12} {total / elapsed:8.0f} order/s  p50 {np.percentile(lat, 50):7.2f} ms  '
+                  f'p95 {np.percentile(lat, 95):7.2f} ms  {reads} query baca  '
+                  f'{len(errors)} baca tidak konsisten')
+            if name == 'koordinator':
+                print(f'{"":<12} {writer.commits} commit untuk {writer.requests} permintaan')
+                ok, conflicts = conflict_check(writer, sessions)
+                print(f'{"":<12} ID order sama dari {sessions} session: {ok} berhasil, {conflicts} WriteConflict')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Benchmark tulis ke database: satu koneksi + satu commit per baris (cara lama add_*)
+# dibandingkan API batch di db.py. Memakai SQLite sebagai pengganti MySQL.
+# Jalankan: python benchmarks/bench_db_writes.py [jumlah_order] [produk_per_order]
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+
+def per_row(path, orders):
+    # seperti helper lama: koneksi baru, satu INSERT, commit, tutup
+    for (oid, cust, total, date), items in orders:
+        conn = sqlite3.connect(path)
+        conn.execute('INSERT INTO orders (id, customer_id, total_price, order_date) VALUES (?, ?, ?, ?)',
+                     (oid, cust, total, date))
+        conn.commit()
+        conn.close()
+        for pid in items:
+            conn = sqlite3.connect(path)
+            conn.execute('INSERT INTO order_contains (order_id, product_id) VALUES (?, ?)', (oid, pid))
+            conn.commit()
+            conn.close()
+
+
+def per_order(path, orders):
+    # satu transaksi per order (header + item), koneksi dari pool
+    pool = db.sqlite_pool(path)
+    for header, items in orders:
+        db.add_orders_with_items([(header, items)], pool)
+    pool.close()
+
+
+def batched(path, orders):
+    # semua order dalam satu panggilan
+    pool = db.sqlite_pool(path)
+    db.add_orders_with_items(orders, pool)
+    pool.close()
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    orders = [((f'O{i}', f'C{i % 100}', 100.0 + i, '2024-01-01'), [f'P{i}_{j}' for j in range(items)])
+              for i in range(n_orders)]
+    rows = n_orders * (items + 1)
+    print(f'{n_orders} order x {items} produk = {rows} baris')
+    for name, fn in [('per baris', per_row), ('per order', per_order), ('batch', batched)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'shop.db')
+            db.create_sqlite_schema(path)
+            start = time.perf_counter()
+            fn(path, orders)
+            elapsed = time.perf_counter() - start
+        print(f'{name:<10} {elapsed:8.3f} s {rows / elapsed:12.0f} baris/s')
+
+
+if __name__ == '__main__':
+    main()
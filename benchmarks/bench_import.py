@@ -0,0 +1,38 @@
+# Benchmark import massal: G.parse satu thread dibandingkan bulk_import.py dengan
+# beberapa jumlah worker, pada file N-Triples sintetis (gadget_data.py). Angka
+# triple/detik mencakup parse + insert ke GraphStore, tanpa compaction di akhir.
+# Jalankan: python benchmarks/bench_import.py [skala] [worker,worker,...] [seed]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = [int(w) for w in (sys.argv[2] if len(sys.argv) > 2 else f'1,{os.cpu_count()}').split(',')]
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gadget_data
+    from graph_store import GraphStore, new_graph
+    import bulk_import
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'catalog.nt')
+        gadget_data.write_ntriples(src, n, seed)
+        start = time.perf_counter()
+        g = new_graph()
+        g.parse(src, format='nt')
+        elapsed = time.perf_counter() - start
+        print(f'{"G.parse":<12} {len(g):>9} triple  {elapsed:7.2f} s  {len(g) / elapsed:>9,.0f} triple/s')
+        for w in dict.fromkeys(workers):
+            store = GraphStore(os.path.join(tmp, f'store_{w}.ttl'))
+            stats = bulk_import.bulk_import(store, [src], workers=w, chunk_bytes=4 * 1024 * 1024, compact=False)
+            print(f'{f"workers={w}":<12} {stats["added"]:>9} triple  {stats["seconds"]:7.2f} s  '
+                  f'{stats["triples_per_sec"]:>9,.0f} triple/s  ({stats["chunks"]} potongan)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# Benchmark inferensi RDFS (inference.py) pada katalog sintetis (gadget_data.py) yang
+# diberi hierarki subkategori (SubN rdfs:subClassOf kategori lain, sebagian di bawah
+# ex:Laptop) dan produk yang dipindah ke subkategori tersebut. Diukur: waktu hitung
+# closure, kasus 3 "produk di kategori Laptop" dengan property path rdfs:subClassOf*
+# dibandingkan pola biasa atas graph + closure, dan biaya insert order dengan listener.
+# Jalankan: python benchmarks/bench_inference.py [skala] [subkategori] [seed]
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib import Literal, RDF, RDFS
+from rdflib.namespace import XSD
+
+from graph_store import EX, GraphStore
+import inference
+import queries
+import sparql
+
+REPEATS = 5
+INSERTS = 200
+PATH_QUERY = '''
+PREFIX ex: <http://example.org/gadgetstore#>
+SELECT DISTINCT ?product WHERE {
+  ?product a ex:Product .
+  ?product ex:belongsToCategory ?category .
+  ?category rdfs:subClassOf* ex:Laptop .
+}
+'''
+
+
+def hierarchy(categories, subs, products, rng):
+    # pohon biner: setiap kategori (termasuk subkategori) mendapat dua anak berurutan
+    triples, pool = [], list(categories)
+    for i in range(subs):
+        sub = EX[f'Sub{i}']
+        triples.append((sub, RDFS.subClassOf, pool[i // 2]))
+        pool.append(sub)
+    for p in rng.sample(products, min(len(products), subs * 20)):
+        triples.append((p, EX.belongsToCategory, rng.choice(pool[len(categories):])))
+    return triples
+
+
+def timed(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    subs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gadget_data
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data_gadget.ttl')
+        gadget_data.write_ntriples(path, n, seed)
+        store = GraphStore(path)
+        g = store.get_graph()
+        categories = sorted(set(g.subjects(RDF.type, EX.Category)))
+        products = sorted(set(g.subjects(RDF.type, EX.Product)))
+        store.apply(added=hierarchy(categories, subs, products, rng))
+        print(f'{len(g)} triple, {len(categories)} kategori + {subs} subkategori')
+
+        start = time.perf_counter()
+        closure = inference.get_closure(store)
+        print(f'closure          {time.perf_counter() - start:8.3f} s  {len(closure.inferred)} triple turunan')
+
+        q3 = sparql.prepare(queries.SPARQL_QUERIES['3. Produk berdasarkan Kategori (contoh: Laptop)']['query'])
+        path_q = sparql.prepare(PATH_QUERY)
+        with store.read() as g:
+            t_path, rows_path = timed(lambda: {r[0] for r in g.query(path_q)})
+            t_plain, rows_plain = timed(lambda: {r[0] for r in g.query(q3)})
+            union = closure.union()
+            t_inf, rows_inf = timed(lambda: {r[0] for r in union.query(q3)})
+        print(f'kasus 3 tanpa inferensi    {t_plain * 1e3:9.2f} ms  {len(rows_plain)} produk (hanya ex:Laptop langsung)')
+        print(f'kasus 3 subClassOf*        {t_path * 1e3:9.2f} ms  {len(rows_path)} produk')
+        print(f'kasus 3 graph + closure    {t_inf * 1e3:9.2f} ms  {len(rows_inf)} produk  '
+              f'(sama: {rows_inf == rows_path})')
+
+        def insert(i, sub):
+            order = EX[f'BenchOrder{i}']
+            store.apply(added=[
+                (order, RDF.type, EX.Order), (order, EX.purchasedBy, EX.Budi),
+                (order, EX.totalPrice, Literal('100.0', datatype=XSD.decimal)),
+                (order, EX.hasDate, Literal('2024-01-01', datatype=XSD.date)),
+                (order, EX.orderContains, EX.iPhone15),
+                (EX[f'BenchProduct{i}'], RDF.type, EX.Product),
+                (EX[f'BenchProduct{i}'], EX.belongsToCategory, sub),
+            ])
+
+        for label, offset in (('insert + closure', 0), ('insert tanpa', INSERTS)):
+            if offset:
+                store._listeners.pop('inference')
+            start = time.perf_counter()
+            for i in range(INSERTS):
+                insert(offset + i, EX[f'Sub{i % subs}'])
+            print(f'{label:<16} {(time.perf_counter() - start) / INSERTS * 1e3:8.3f} ms per order')
+
+
+if __name__ == '__main__':
+    main()
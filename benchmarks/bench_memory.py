@@ -0,0 +1,69 @@
+# Benchmark memori: Graph rdflib biasa (Memory store) dibandingkan CompactStore
+# (compact_store.py) pada katalog sintetis (gadget_data.py). Setiap kombinasi skala x
+# backend dijalankan di proses terpisah; yang diukur adalah kenaikan RSS setelah graph
+# dimuat, waktu load, dan waktu kasus 4 SPARQL_QUERIES (daftar order lengkap).
+# Jalankan: python benchmarks/bench_memory.py [skala,skala,...] [seed]
+
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKENDS = ['memory', 'compact']
+
+
+def rss_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure(path, backend):
+    from rdflib import Graph
+    from compact_store import CompactStore
+    import queries
+    import sparql
+    gc.collect()
+    before = rss_bytes()
+    start = time.perf_counter()
+    g = Graph(store=CompactStore()) if backend == 'compact' else Graph()
+    g.parse(path, format='turtle')
+    load_s = time.perf_counter() - start
+    gc.collect()
+    used = rss_bytes() - before
+    q = queries.SPARQL_QUERIES['4. Daftar Order lengkap (customer, total price, tanggal)']['query']
+    start = time.perf_counter()
+    rows = len(sparql.result_to_df(g.query(sparql.prepare(q))))
+    return {'backend': backend, 'triples': len(g), 'rss_mb': used / 1e6, 'bytes_per_triple': used / len(g),
+            'load_s': load_s, 'query_s': time.perf_counter() - start, 'rows': rows}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--single':
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+    scales = [int(s) for s in (sys.argv[1] if len(sys.argv) > 1 else '10000,100000,1000000').split(',')]
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gadget_data
+    for n in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'gadget.ttl')
+            gadget_data.write_ntriples(path, n, seed)
+            results = {}
+            for backend in BACKENDS:
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', path, backend],
+                                     check=True, stdout=subprocess.PIPE, text=True).stdout
+                results[backend] = r = json.loads(out.strip().splitlines()[-1])
+                print(f"{n:>9} {backend:<8} {r['rss_mb']:9.1f} MB {r['bytes_per_triple']:7.0f} B/triple "
+                      f"load {r['load_s']:7.2f} s  query {r['query_s']:7.2f} s")
+            ratio = results['memory']['rss_mb'] / max(results['compact']['rss_mb'], 1e-9)
+            print(f'{"":>9} RSS memory/compact = {ratio:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
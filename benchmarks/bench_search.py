@@ -0,0 +1,122 @@
+# Benchmark pencarian teks (search_index.py)
+# 1. Graph sintetis (gadget_data.py) di GraphStore: cari label produk dengan
+#    FILTER(regex) di SPARQL dibandingkan SearchIndex.search, hasilnya harus sama.
+# 2. Katalog dengan skala yang sama (brand/kategori/produk/customer, tanpa order)
+#    langsung ke index lewat apply(): waktu bangun, biaya insert per produk, dan latensi
+#    p50/p95/maks untuk campuran query (prefix, beberapa kata, salah ketik, potongan
+#    tengah kata). Untuk katalog ~1 juta produk pakai skala 16000000.
+# Jalankan: python benchmarks/bench_search.py [skala] [seed]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib import RDFS, Literal
+from rdflib.namespace import XSD
+import numpy as np
+
+from graph_store import EX, GraphStore
+import search_index
+import sparql
+
+BATCH = 10000
+REPEATS = 200
+REGEX_QUERY = '''
+SELECT ?product WHERE {
+  ?product a ex:Product ; rdfs:label ?label .
+  FILTER(regex(?label, "\\\\b%s", "i"))
+}
+'''
+QUERIES = ['apple', 'sams', 'lenovo lap', 'xiaomi tablet 12', 'citra', 'dewi lest',
+           'smartwatch 99', 'samsng', 'phone', 'brand1 aks', 'zzz']
+
+
+def catalog(n, seed):
+    # baris brand/kategori/produk/customer dari gadget_data, tanpa order
+    import gadget_data
+    for table, row in gadget_data.rows(n, seed):
+        if table == 'orders':
+            break
+        yield from gadget_data.TRIPLE_MAPPERS[table](row)
+
+
+def compare_regex(n, seed):
+    import gadget_data
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data_gadget.ttl')
+        gadget_data.write_ntriples(path, n, seed)
+        store = GraphStore(path)
+        index = search_index.get_search(store)
+        print(f'graph {len(store.get_graph())} triple')
+        for word in ('Appl', 'Smartw', 'Tablet 1'):
+            q = sparql.prepare(REGEX_QUERY % word)
+            with store.read() as g:
+                start = time.perf_counter()
+                rows = {r[0] for r in g.query(q)}
+                t_regex = time.perf_counter() - start
+            start = time.perf_counter()
+            hits = {iri for iri, _ in index.search(word, rdf_type=EX.Product, limit=len(rows) + 1)}
+            t_index = time.perf_counter() - start
+            print(f'  "{word}": regex {t_regex * 1e3:9.2f} ms, index {t_index * 1e3:7.3f} ms, '
+                  f'{len(rows)} produk (sama: {rows == hits})')
+
+
+def latency(n, seed):
+    index = search_index.SearchIndex()
+    batch, count = [], 0
+    start = time.perf_counter()
+    for t in catalog(n, seed):
+        batch.append(t)
+        if len(batch) >= BATCH:
+            index.apply(batch, ())
+            count += len(batch)
+            batch = []
+    index.apply(batch, ())
+    count += len(batch)
+    elapsed = time.perf_counter() - start
+    products = sum(1 for types in index.types.values() if EX.Product in types)
+    print(f'index {products} produk: {count} triple dalam {elapsed:.1f} s, '
+          f'{len(index.words)} dokumen, {len(index.tokens)} token')
+
+    start = time.perf_counter()
+    for i in range(1000):
+        p = EX[f'New{i}']
+        index.apply([(p, RDFS.label, Literal(f'Asus Laptop Baru {i}', datatype=XSD.string))], ())
+    print(f'insert 1 label       {(time.perf_counter() - start) / 1000 * 1e3:8.3f} ms per produk')
+
+    rng = random.Random(seed)
+    for q in QUERIES:
+        times, hits = [], []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            hits = index.search(q)
+            times.append(time.perf_counter() - start)
+        times = np.array(times) * 1e3
+        print(f'  {q!r:<20} p50 {np.percentile(times, 50):6.3f} ms  p95 {np.percentile(times, 95):6.3f} ms  '
+              f'maks {times.max():6.3f} ms  {len(hits)} hasil')
+    # label acak dari katalog: awal kata ke-2 + nomor produk lengkap
+    times = []
+    for _ in range(REPEATS):
+        i = rng.randrange(products)
+        start = time.perf_counter()
+        index.search(f'lap {i}')
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1e3
+    print(f'  {"lap <nomor acak>":<20} p50 {np.percentile(times, 50):6.3f} ms  '
+          f'p95 {np.percentile(times, 95):6.3f} ms  maks {times.max():6.3f} ms')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    compare_regex(n, seed)
+    latency(n, seed)
+
+
+if __name__ == '__main__':
+    main()
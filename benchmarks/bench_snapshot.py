@@ -0,0 +1,92 @@
+# Benchmark snapshot mmap (snapshot.py) pada katalog sintetis (gadget_data.py):
+# waktu dan ukuran publish snapshot, lalu throughput kasus SPARQL_QUERIES (tanpa infer)
+# di proses ini atas GraphStore dibandingkan ReadPool dengan 1..N proses pembaca yang
+# berbagi satu file snapshot. Terakhir: jeda dari insert sampai snapshot baru terlihat
+# di worker (publisher listener + os.replace).
+# Jalankan: python benchmarks/bench_snapshot.py [skala] [proses] [seed]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdflib import RDF
+
+from graph_store import EX, GraphStore
+import queries
+import snapshot
+import sparql
+
+ROUNDS = 3
+COUNT_QUERY = 'SELECT (COUNT(?p) AS ?n) WHERE { ?p a <http://example.org/gadgetstore#Product> }'
+
+
+def cases():
+    return [case['query'] for case in queries.SPARQL_QUERIES.values()
+            if 'query' in case and not case.get('infer')]
+
+
+# kedua sisi: evaluasi + serialisasi JSON tanpa cache hasil (seperti server.py)
+
+def local_rate(store, qs):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for q in qs:
+            with store.read() as g:
+                g.query(sparql.prepare(q)).serialize(format='json')
+    return len(qs) * ROUNDS / (time.perf_counter() - start)
+
+
+def pool_rate(path, processes, qs):
+    start = time.perf_counter()
+    pool = snapshot.ReadPool(path, processes)
+    pool.pool.starmap(snapshot._serialize, [(q, 'json') for q in qs * processes])
+    opened = time.perf_counter() - start
+    start = time.perf_counter()
+    pool.pool.starmap(snapshot._serialize, [(q, 'json') for q in qs * ROUNDS])
+    rate = len(qs) * ROUNDS / (time.perf_counter() - start)
+    pool.close()
+    return opened, rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gadget_data
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data_gadget.ttl')
+        gadget_data.write_ntriples(path, n, seed)
+        store = GraphStore(path)
+        print(f'graph {len(store.get_graph())} triple, {os.cpu_count()} CPU')
+
+        start = time.perf_counter()
+        publisher = snapshot.get_publisher(store)
+        print(f'publish          {time.perf_counter() - start:8.3f} s  '
+              f'{os.path.getsize(publisher.path) / 1e6:.1f} MB')
+
+        qs = cases()
+        for q in qs:
+            sparql.prepare(q)
+        print(f'proses ini       {local_rate(store, qs):8.1f} query/s')
+        for k in sorted({1, processes}):
+            opened, rate = pool_rate(publisher.path, k, qs)
+            print(f'ReadPool {k:2d} proses {rate:8.1f} query/s  (buka + query pertama {opened:.2f} s)')
+
+        pool = snapshot.ReadPool(publisher.path, 1, publisher)
+        before = int(pool.run(COUNT_QUERY).iloc[0, 0])
+        start = time.perf_counter()
+        store.apply(added=[(EX.SnapshotBench, RDF.type, EX.Product)])
+        publisher.wait(store.generation)
+        after = int(pool.run(COUNT_QUERY).iloc[0, 0])
+        print(f'insert -> worker {(time.perf_counter() - start) * 1e3:8.1f} ms  '
+              f'(produk {before} -> {after}, current: {pool.current(store)})')
+        pool.close()
+        publisher.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Benchmark waktu start: proses baru yang menjalankan bagian modul main.py (import,
+# load graph, bangun index/view/analytics) lalu satu "rerun" Streamlit (get_store +
+# get_graph lagi di proses yang sama). Diukur dingin (cache biner graph dihapus, Turtle
+# di-parse) dan hangat (cache data_gadget.ttl.cache dari start sebelumnya terpakai).
+# Jalankan: python benchmarks/bench_startup.py [skala,skala,...] [seed]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(path, backend):
+    start = time.perf_counter()
+    import analytics
+    import entity_index
+    import graph_store
+    import product_view
+    import queries
+    import sparql
+    import_s = time.perf_counter() - start
+    start = time.perf_counter()
+    store = graph_store.get_store(path, backend)
+    g = store.get_graph()
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    entity_index.get_index(store)
+    product_view.get_view(store)
+    analytics.get_analytics(store)
+    index_s = time.perf_counter() - start
+    start = time.perf_counter()
+    graph_store.get_store(path, backend).get_graph()
+    rerun_s = time.perf_counter() - start
+    return {'triples': len(g), 'import_s': import_s, 'load_s': load_s, 'index_s': index_s,
+            'rerun_s': rerun_s, 'total_s': import_s + load_s + index_s}
+
+
+def run(path, backend):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', path, backend],
+                         check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--single':
+        print(json.dumps(measure(sys.argv[2], sys.argv[3])))
+        return
+    scales = [int(s) for s in (sys.argv[1] if len(sys.argv) > 1 else '1000,10000,100000').split(',')]
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    backend = os.environ.get('GADGET_STORE_BACKEND', 'memory')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import gadget_data
+    for n in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data_gadget.ttl')
+            gadget_data.write_ntriples(path, n, seed)
+            for mode in ('cold', 'warm'):
+                if mode == 'cold' and os.path.exists(path + '.cache'):
+                    os.remove(path + '.cache')
+                r = run(path, backend)
+                print(f"{n:>9} {mode:<5} {r['triples']:>9} triple  import {r['import_s']:6.2f} s  "
+                      f"load {r['load_s']:7.2f} s  index {r['index_s']:6.2f} s  rerun {r['rerun_s'] * 1e3:7.3f} ms  "
+                      f"total {r['total_s']:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
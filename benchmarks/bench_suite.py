@@ -0,0 +1,197 @@
+# Benchmark utama: skala load, query, insert dan serialisasi graph
+# Untuk setiap skala (jumlah triple) data dibuat dengan gadget_data.py lalu diukur:
+# - load: GraphStore membaca file .ttl, plus build index/view (listener seperti main.py)
+# - query: empat kasus SPARQL_QUERIES tanpa cache hasil (median dari beberapa ulangan)
+#   dan sekali lewat cache run_sparql; halaman pertama tabel Produk
+# - insert: order baru satu per satu lewat STORE.add_triples (seperti form Tambah Order)
+# - serialize: G.serialize turtle dan nt
+# - sync (opsional, --sync): mysql_to_rdf dari SQLite berisi data yang sama
+# Setiap skala dijalankan di proses terpisah agar peak RSS tidak tercampur.
+# Hasil ditulis ke JSON; --compare hasil_lama.json menampilkan rasio terhadap hasil lama.
+#
+# Jalankan: python benchmarks/bench_suite.py --scales 1000,10000,100000 --out hasil.json
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SCALES = '1000,10000,100000'
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def repeat(fn, n):
+    return statistics.median(timed(fn)[0] for _ in range(n))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def bench_scale(n_triples, seed, repeats, inserts, sync):
+    from rdflib import Literal, RDF
+    from rdflib.namespace import XSD
+    import analytics
+    import entity_index
+    import gadget_data
+    import graph_store
+    import mysql_sync
+    import product_view
+    import queries
+    import sparql
+    EX = graph_store.EX
+
+    result = {'scale': n_triples, 'seed': seed}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gadget.ttl')
+        result['generate_s'], result['triples'] = timed(gadget_data.write_ntriples, path, n_triples, seed)
+        result['file_mb'] = os.path.getsize(path) / 1e6
+
+        store = graph_store.GraphStore(path)
+        result['load_s'], g = timed(store.get_graph)
+        result['graph_triples'] = len(g)
+        index_s = {}
+        for name, get in [('entities', entity_index.get_index), ('products', product_view.get_view),
+                          ('analytics', analytics.get_analytics)]:
+            index_s[name] = timed(get, store)[0]
+        result['index_s'] = index_s
+        products = store.attach('products', product_view.ProductView)
+
+        result['queries'] = {}
+        for title, case in queries.SPARQL_QUERIES.items():
+            if 'query' not in case:
+                continue
+            q = case['query']
+            parse_s = timed(sparql.prepare, q)[0]
+            uncached = repeat(lambda: sparql.result_to_df(g.query(sparql.prepare(q))), repeats)
+            first_s, df = timed(sparql.run_sparql, store, q)
+            cached_s = timed(sparql.run_sparql, store, q)[0]
+            result['queries'][title] = {'parse_s': parse_s, 'median_s': uncached, 'first_s': first_s,
+                                        'cached_s': cached_s, 'rows': len(df)}
+        # pertama kali mengurutkan, berikutnya memakai urutan yang di-cache view
+        result['product_page'] = {'first_s': timed(products.query, sort='Label')[0],
+                                  'cached_s': timed(products.query, sort='Label', page=1)[0]}
+
+        latencies = []
+        customer = next(g.subjects(RDF.type, EX.Customer))
+        product = EX.iPhone15
+        for i in range(inserts):
+            order = EX[f'BenchOrder{i}']
+            latencies.append(timed(store.add_triples, [
+                (order, RDF.type, EX.Order),
+                (order, EX.purchasedBy, customer),
+                (order, EX.totalPrice, Literal(1000000.0, datatype=XSD.decimal)),
+                (order, EX.hasDate, Literal('2024-06-01', datatype=XSD.date)),
+                (order, EX.orderContains, product),
+            ])[0])
+        if latencies:
+            result['insert'] = {'count': inserts, 'total_s': sum(latencies),
+                                'p50_s': percentile(latencies, 0.5), 'p95_s': percentile(latencies, 0.95),
+                                'per_s': inserts / sum(latencies)}
+
+        result['serialize_s'] = {fmt: timed(g.serialize, format=fmt)[0] for fmt in ('turtle', 'nt')}
+
+        if sync:
+            db_path = os.path.join(tmp, 'gadget.db')
+            result['sqlite_load_s'], pool = timed(gadget_data.load_sqlite, db_path, n_triples, seed)
+            result['mysql_to_rdf_s'] = timed(mysql_sync.mysql_to_rdf, pool)[0]
+            pool.close()
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_child(args, n):
+    cmd = [sys.executable, os.path.abspath(__file__), '--single', str(n), '--seed', str(args.seed),
+           '--repeats', str(args.repeats), '--inserts', str(args.inserts)]
+    if args.sync:
+        cmd.append('--sync')
+    out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def flatten(result, prefix=''):
+    for key, value in result.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f'{prefix}{key}.')
+        elif key.endswith('_s'):
+            yield prefix + key, value
+
+
+def compare(old, new):
+    old_by_scale = {r['scale']: dict(flatten(r)) for r in old['results']}
+    for r in new['results']:
+        before = old_by_scale.get(r['scale'])
+        if before is None:
+            continue
+        print(f"\n== {r['scale']} triple: {old.get('commit')} -> {new.get('commit')}")
+        for key, value in flatten(r):
+            if before.get(key):
+                print(f'{key:<70} {before[key]:10.4f} {value:10.4f} {value / before[key]:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark graph toko gadget')
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help='jumlah triple, dipisah koma (1000 .. 10000000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--inserts', type=int, default=200)
+    parser.add_argument('--sync', action='store_true', help='ukur juga mysql_to_rdf (SQLite)')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', help='file JSON hasil sebelumnya')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        print(json.dumps(bench_scale(args.single, args.seed, args.repeats, args.inserts, args.sync)))
+        return
+
+    import rdflib
+    report = {'commit': git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'python': platform.python_version(), 'rdflib': rdflib.__version__,
+              'platform': platform.platform(), 'results': []}
+    for n in (int(s) for s in args.scales.split(',')):
+        result = run_child(args, n)
+        report['results'].append(result)
+        print(f"{n:>10} triple  load {result['load_s']:8.3f} s  "
+              f"query {sum(q['median_s'] for q in result['queries'].values()):8.3f} s  "
+              f"insert p50 {result.get('insert', {}).get('p50_s', 0) * 1000:7.2f} ms  "
+              f"turtle {result['serialize_s']['turtle']:8.3f} s  rss {result['peak_rss_mb']:8.1f} MB")
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'hasil -> {args.out}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Generator data sintetis toko gadget untuk benchmark
+# Baris tabel (brand, category, product, customer, orders, order_contains) dibuat
+# deterministik dari seed, dengan jumlah yang diskalakan ke target jumlah triple.
+# Triple diturunkan dengan fungsi yang sama dengan sinkronisasi MySQL (mysql_sync.py),
+# jadi data di file RDF dan di database identik.
+#
+# Selalu ada produk ex:iPhone15 dan kategori ex:Laptop agar kasus 2 dan 3 di
+# SPARQL_QUERIES punya hasil. Produk populer lebih sering dibeli (distribusi miring).
+
+from rdflib.plugins.serializers.nt import _nt_row
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+import mysql_sync
+
+BRANDS = ['Apple', 'Samsung', 'Asus', 'Xiaomi', 'Lenovo']
+CATEGORIES = ['Laptop', 'Smartphone', 'Tablet', 'Smartwatch', 'Aksesoris']
+FIRST_NAMES = ['Andi', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hadi', 'Intan', 'Joko']
+LAST_NAMES = ['Santoso', 'Wijaya', 'Pratama', 'Lestari', 'Saputra', 'Hidayat', 'Kusuma', 'Nugroho']
+START_DATE = datetime.date(2023, 1, 1)
+
+# triple per baris (lihat mysql_sync.*_triples)
+ORDER_TRIPLES = 4
+ITEMS_PER_ORDER = (1, 4)
+
+TRIPLE_MAPPERS = dict(mysql_sync.TABLES)
+
+
+def sizes(n_triples):
+    brands = max(len(BRANDS), n_triples // 5000)
+    categories = max(len(CATEGORIES), n_triples // 20000)
+    products = max(10, n_triples // 16)
+    customers = max(10, n_triples // 20)
+    rest = n_triples - brands - categories - 4 * products - 2 * customers
+    per_order = ORDER_TRIPLES + sum(ITEMS_PER_ORDER) / 2
+    orders = max(1, int(rest / per_order))
+    return dict(brand=brands, category=categories, product=products, customer=customers, orders=orders)
+
+
+def names(base, n, prefix):
+    return base[:n] + [f'{prefix}{i}' for i in range(len(base), n)]
+
+
+def rows(n_triples, seed=0):
+    # menghasilkan (tabel, dict baris) secara streaming
+    rng = random.Random(seed)
+    n = sizes(n_triples)
+    brands = names(BRANDS, n['brand'], 'Brand')
+    categories = names(CATEGORIES, n['category'], 'Category')
+    for b in brands:
+        yield 'brand', {'id': b}
+    for c in categories:
+        yield 'category', {'id': c}
+    products = ['iPhone15'] + [f'P{i}' for i in range(1, n['product'])]
+    for i, p in enumerate(products):
+        brand = 'Apple' if i == 0 else rng.choice(brands)
+        category = 'Smartphone' if i == 0 else rng.choice(categories)
+        yield 'product', {'id': p, 'label': f'{brand} {category} {i}', 'brand_id': brand, 'category_id': category}
+    customers = [f'C{i}' for i in range(n['customer'])]
+    for c in customers:
+        yield 'customer', {'id': c, 'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'}
+    for i in range(n['orders']):
+        oid = f'O{i}'
+        items = set()
+        for _ in range(rng.randint(*ITEMS_PER_ORDER)):
+            items.add(products[int(len(products) * rng.random() ** 3)])
+        date = START_DATE + datetime.timedelta(days=rng.randrange(730))
+        total = sum(rng.randrange(500, 30000) * 1000 for _ in items)
+        yield 'orders', {'id': oid, 'customer_id': rng.choice(customers),
+                         'total_price': total, 'order_date': date.isoformat()}
+        for p in sorted(items):
+            yield 'order_contains', {'order_id': oid, 'product_id': p}
+
+
+def triples(n_triples, seed=0):
+    for table, row in rows(n_triples, seed):
+        yield from TRIPLE_MAPPERS[table](row)
+
+
+def write_ntriples(path, n_triples, seed=0):
+    # N-Triples juga Turtle yang valid, jadi file .ttl ini bisa dibaca GraphStore
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for t in triples(n_triples, seed):
+            f.write(_nt_row(t))
+            count += 1
+    return count
+
+
+def load_sqlite(path, n_triples, seed=0, chunk_size=mysql_sync.CHUNK_SIZE):
+    # isi database SQLite (pengganti MySQL) dengan baris yang sama
+    db.create_sqlite_schema(path)
+    pool = db.sqlite_pool(path)
+    cols = {}
+    pending = {}
+    for table, row in rows(n_triples, seed):
+        cols.setdefault(table, tuple(row))
+        batch = pending.setdefault(table, [])
+        batch.append(tuple(row.values()))
+        if len(batch) >= chunk_size:
+            db.bulk_insert(table, cols[table], batch, pool)
+            batch.clear()
+    for table, batch in pending.items():
+        db.bulk_insert(table, cols[table], batch, pool)
+    return pool
+
+
+if __name__ == '__main__':
+    # python benchmarks/gadget_data.py output.ttl [jumlah_triple] [seed]
+    out = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    print(f'{write_ntriples(out, n, seed)} triple -> {out}')
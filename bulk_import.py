@@ -0,0 +1,171 @@
+# Import massal file N-Triples/Turtle ke GraphStore dengan process pool
+# G.parse() berjalan di satu thread; untuk katalog supplier berukuran jutaan triple
+# parse-nya yang paling lama. Di sini:
+# - file N-Triples (.nt) dipotong per CHUNK_BYTES di batas baris, setiap potongan
+#   di-parse di proses worker terpisah. Label blank node (_:b1) dipetakan per file,
+#   bukan per potongan, jadi _:b1 di dua potongan tetap node yang sama.
+# - file Turtle (.ttl) tidak bisa dipotong per baris (prefix, pernyataan multi-baris),
+#   jadi di-parse utuh satu file per worker; paralel antar file dalam satu direktori.
+# - worker mengirim hasil sebagai kamus term + array id (graph_store.encode_triples),
+#   sudah bebas duplikat di dalam potongannya.
+# - proses utama memasukkan hasil ke store per BATCH_SIZE triple lewat store.apply
+#   (log, listener, dan dedup terhadap isi graph tetap berlaku) sambil worker lanjut
+#   mem-parse potongan berikutnya. Compaction otomatis ditunda sampai import selesai.
+# Jalankan: python bulk_import.py FILE|DIREKTORI [...] [--store data_gadget.ttl]
+#           [--workers N] [--format nt|turtle]
+
+from rdflib import BNode, Graph
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+import multiprocessing
+import os
+import time
+import uuid
+
+from graph_store import decode_triples, encode_triples
+import profiling
+
+CHUNK_BYTES = 16 * 1024 * 1024
+BATCH_SIZE = 100000
+FORMATS = {'.nt': 'nt', '.ttl': 'turtle'}
+
+
+class TripleSink:
+    def __init__(self):
+        self.triples = []
+
+    def triple(self, s, p, o):
+        self.triples.append((s, p, o))
+
+
+class FileBNodes(dict):
+    # label blank node -> BNode yang sama di semua potongan satu file
+    def __init__(self, prefix):
+        super().__init__()
+        self.prefix = prefix
+
+    def get(self, label, default=None):
+        return BNode(self.prefix + label)
+
+
+def file_format(path, fmt=None):
+    return fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def list_files(paths, fmt=None):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if file_format(n, fmt))
+        else:
+            if not file_format(path, fmt):
+                raise ValueError(f'Format file tidak dikenal: {path}')
+            files.append(path)
+    return files
+
+
+def split_lines(path, chunk_bytes=CHUNK_BYTES):
+    # rentang byte (awal, akhir) yang selalu berakhir di akhir baris
+    size = os.path.getsize(path)
+    ranges, start = [], 0
+    with open(path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def tasks(files, fmt=None, chunk_bytes=CHUNK_BYTES):
+    for path in files:
+        kind = file_format(path, fmt)
+        if kind == 'nt':
+            prefix = uuid.uuid4().hex
+            for start, end in split_lines(path, chunk_bytes):
+                yield path, kind, start, end, prefix
+        else:
+            yield path, kind, 0, None, None
+
+
+def parse_chunk(task):
+    path, kind, start, end, prefix = task
+    if kind == 'nt':
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        sink = TripleSink()
+        W3CNTriplesParser(sink, bnode_context=FileBNodes(prefix)).parsestring(data)
+        triples = dict.fromkeys(sink.triples)
+        parsed = len(sink.triples)
+    else:
+        g = Graph()
+        g.parse(path, format=kind)
+        triples = g
+        parsed = len(g)
+    terms, data = encode_triples(triples)
+    return path, parsed, terms, data
+
+
+def bulk_import(store, paths, workers=None, fmt=None, chunk_bytes=CHUNK_BYTES, batch_size=BATCH_SIZE,
+                compact=True, progress=None):
+    # mengembalikan ringkasan: jumlah file/potongan, triple ter-parse, triple baru,
+    # triple/detik (parse + insert; compaction di akhir dihitung terpisah)
+    files = list_files(paths, fmt)
+    start = time.perf_counter()
+    with profiling.profile('graph', 'bulk_import', detail=', '.join(paths)) as prof:
+        before = len(store.get_graph())
+        stats = {'files': len(files), 'chunks': 0, 'parsed': 0}
+        batch = []
+        # compaction otomatis ditahan selama import; satu snapshot di akhir
+        limit = getattr(store, 'compact_bytes', None)
+        if limit is not None:
+            store.compact_bytes = float('inf')
+        try:
+            ctx = multiprocessing.get_context('spawn')
+            with ctx.Pool(workers) as pool:
+                for path, parsed, terms, data in pool.imap_unordered(parse_chunk, tasks(files, fmt, chunk_bytes)):
+                    stats['chunks'] += 1
+                    stats['parsed'] += parsed
+                    with profiling.phase('decode'):
+                        batch.extend(decode_triples(terms, data))
+                    if len(batch) >= batch_size:
+                        store.apply(batch, [])
+                        batch = []
+                    if progress:
+                        progress(stats)
+            if batch:
+                store.apply(batch, [])
+        finally:
+            if limit is not None:
+                store.compact_bytes = limit
+        stats['added'] = len(store.get_graph()) - before
+        stats['duplicates'] = stats['parsed'] - stats['added']
+        stats['seconds'] = time.perf_counter() - start
+        stats['triples_per_sec'] = stats['parsed'] / max(stats['seconds'], 1e-9)
+        prof.rows = stats['added']
+        if stats['added'] and compact:
+            # snapshot Turtle baru berisi hasil import (mengosongkan log)
+            with profiling.phase('compact'):
+                store.compact()
+    stats['compact_seconds'] = time.perf_counter() - start - stats['seconds']
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+    from graph_store import get_store
+    parser = argparse.ArgumentParser(description='Import massal N-Triples/Turtle ke graph store')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--store', default='data_gadget.ttl')
+    parser.add_argument('--backend', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--format', choices=sorted(set(FORMATS.values())), default=None)
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 1024 / 1024)
+    args = parser.parse_args()
+    store = get_store(args.store, args.backend)
+    stats = bulk_import(store, args.paths, args.workers, args.format, int(args.chunk_mb * 1024 * 1024))
+    print(f"{stats['files']} file, {stats['chunks']} potongan: {stats['parsed']} triple di-parse, "
+          f"{stats['added']} baru, {stats['duplicates']} duplikat dalam {stats['seconds']:.1f} s "
+          f"({stats['triples_per_sec']:,.0f} triple/s), compaction {stats['compact_seconds']:.1f} s")
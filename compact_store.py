@@ -0,0 +1,235 @@
+# Backend graph in-memory yang ringkas (GADGET_STORE_BACKEND=compact)
+# Store Memory bawaan rdflib menyimpan setiap triple di beberapa dict bersarang (SPO,
+# POS, OSP, plus konteks per triple) dengan objek term di setiap level. Di sini setiap
+# term (IRI/literal) disimpan sekali di kamus term dan diberi id integer; triple
+# disimpan sebagai tiga kolom array('i') dan index per term berisi nomor baris (juga
+# array('i')). Untuk katalog besar ini memotong pemakaian memori beberapa kali lipat
+# (lihat benchmarks/bench_memory.py).
+#
+# Saat term didaftarkan, local name IRI (ex:iPhone15 -> 'iPhone15') dan nilai literal
+# bertipe (xsd:decimal -> float, xsd:date -> datetime.date) langsung dihitung sekali,
+# jadi bisa dibaca per id tanpa str(...).split('#') atau konversi ulang. Listener
+# (entity_index, product_view, analytics) memakainya lewat graph_store.local_namer /
+# literal_values jika graph memakai CompactStore.
+#
+# Baris yang dihapus ditandai (predicate = -1) dan dipakai ulang oleh insert berikutnya.
+# Untuk setiap baris juga disimpan posisinya di ketiga array index, sehingga hapus
+# cukup menukar entri itu dengan entri terakhir lalu pop (O(1), bukan array.remove
+# yang menggeser seluruh array term yang sering dipakai seperti rdf:type).
+
+from rdflib import Literal, URIRef
+from rdflib.store import Store
+from array import array
+import datetime
+import threading
+
+from graph_store import GraphStore, local_name, new_graph
+from sparql import DATE_TYPES, NUMERIC_TYPES
+
+DELETED = -1
+FETCH_SIZE = 1000
+
+
+def typed_value(term):
+    # nilai Python untuk literal angka/tanggal; None jika bukan atau tidak valid
+    if not isinstance(term, Literal):
+        return None
+    if term.datatype in NUMERIC_TYPES:
+        try:
+            return float(str(term))
+        except ValueError:
+            return None
+    if term.datatype in DATE_TYPES:
+        text = str(term)
+        try:
+            if 'T' in text:
+                return datetime.datetime.fromisoformat(text)
+            return datetime.date.fromisoformat(text)
+        except ValueError:
+            return None
+    return None
+
+
+class TermDictionary:
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self.local_names = []
+        self.values = []
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, term):
+        return self.ids.get(term)
+
+    def intern(self, term):
+        tid = self.ids.get(term)
+        if tid is None:
+            # list diisi sebelum id terlihat: pembaca tanpa lock tidak melihat id setengah jadi
+            tid = len(self.terms)
+            self.terms.append(term)
+            self.local_names.append(local_name(term) if isinstance(term, URIRef) else None)
+            self.values.append(typed_value(term))
+            self.ids[term] = tid
+        return tid
+
+    def local_name(self, term):
+        tid = self.ids.get(term)
+        return self.local_names[tid] if tid is not None else local_name(term)
+
+    def value(self, term):
+        tid = self.ids.get(term)
+        return self.values[tid] if tid is not None else typed_value(term)
+
+
+class CompactStore(Store):
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.dictionary = TermDictionary()
+        self.s = array('i')
+        self.p = array('i')
+        self.o = array('i')
+        # id term -> nomor baris, per posisi
+        self.by_s = {}
+        self.by_p = {}
+        self.by_o = {}
+        # nomor baris -> posisi baris di by_s[s] / by_p[p] / by_o[o]
+        self.pos_s = array('i')
+        self.pos_p = array('i')
+        self.pos_o = array('i')
+        self._free = []
+        self._count = 0
+        self._namespaces = {}
+        self._lock = threading.RLock()
+
+    def _find(self, s, p, o):
+        for row in self.by_s.get(s, ()):
+            if self.p[row] == p and self.o[row] == o:
+                return row
+        return None
+
+    def _add_ids(self, s, p, o):
+        if self._find(s, p, o) is not None:
+            return False
+        if self._free:
+            row = self._free.pop()
+            self.s[row], self.p[row], self.o[row] = s, p, o
+        else:
+            row = len(self.s)
+            self.s.append(s)
+            self.p.append(p)
+            self.o.append(o)
+            for pos in (self.pos_s, self.pos_p, self.pos_o):
+                pos.append(0)
+        for index, pos, tid in ((self.by_s, self.pos_s, s), (self.by_p, self.pos_p, p),
+                                (self.by_o, self.pos_o, o)):
+            rows = index.get(tid)
+            if rows is None:
+                rows = index[tid] = array('i')
+            pos[row] = len(rows)
+            rows.append(row)
+        self._count += 1
+        return True
+
+    def add(self, triple, context=None, quoted=False):
+        with self._lock:
+            intern = self.dictionary.intern
+            if self._add_ids(*(intern(t) for t in triple)):
+                Store.add(self, triple, context, quoted)
+
+    def addN(self, quads):
+        with self._lock:
+            intern = self.dictionary.intern
+            for s, p, o, _ in quads:
+                self._add_ids(intern(s), intern(p), intern(o))
+
+    def _rows(self, triple):
+        # nomor baris yang cocok dengan pola; mulai dari index term terikat yang terkecil
+        ids = []
+        for term in triple:
+            if term is None:
+                ids.append(None)
+                continue
+            tid = self.dictionary.lookup(term)
+            if tid is None:
+                return []
+            ids.append(tid)
+        s, p, o = ids
+        candidates = [(index.get(tid, ()), tid) for index, tid in
+                      ((self.by_s, s), (self.by_p, p), (self.by_o, o)) if tid is not None]
+        if not candidates:
+            return range(len(self.p))
+        rows = min(candidates, key=lambda c: len(c[0]))[0]
+        cols = self.s, self.p, self.o
+        checks = [(cols[i], tid) for i, tid in enumerate(ids) if tid is not None]
+        return [row for row in rows if all(col[row] == tid for col, tid in checks)]
+
+    def remove(self, triple, context=None):
+        with self._lock:
+            terms = self.dictionary.terms
+            for row in [r for r in self._rows(triple) if self.p[r] != DELETED]:
+                s, p, o = self.s[row], self.p[row], self.o[row]
+                for index, pos, tid in ((self.by_s, self.pos_s, s), (self.by_p, self.pos_p, p),
+                                        (self.by_o, self.pos_o, o)):
+                    rows = index[tid]
+                    # entri terakhir pindah ke posisi baris yang dihapus
+                    last = rows.pop()
+                    if last != row:
+                        rows[pos[row]] = last
+                        pos[last] = pos[row]
+                    if not rows:
+                        del index[tid]
+                self.p[row] = DELETED
+                self._free.append(row)
+                self._count -= 1
+                Store.remove(self, (terms[s], terms[p], terms[o]), context)
+
+    def triples(self, triple_pattern, context=None):
+        # id (s, p, o) disalin di bawah lock: baris yang dihapus bisa dipakai ulang oleh
+        # insert berikutnya. Term di-decode per FETCH_SIZE baris, bukan sekaligus; kamus
+        # term hanya bertambah, jadi decode aman tanpa lock.
+        with self._lock:
+            ids = [(self.s[r], p, self.o[r]) for r in self._rows(triple_pattern)
+                   for p in (self.p[r],) if p != DELETED]
+        terms = self.dictionary.terms
+        for start in range(0, len(ids), FETCH_SIZE):
+            chunk = [(terms[s], terms[p], terms[o]) for s, p, o in ids[start:start + FETCH_SIZE]]
+            for t in chunk:
+                yield t, iter(())
+
+    def __len__(self, context=None):
+        return self._count
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        with self._lock:
+            if not override and prefix in self._namespaces:
+                return
+            self._namespaces[prefix] = URIRef(namespace)
+
+    def namespace(self, prefix):
+        return self._namespaces.get(prefix)
+
+    def prefix(self, namespace):
+        for prefix, uri in self._namespaces.items():
+            if uri == namespace:
+                return prefix
+        return None
+
+    def namespaces(self):
+        yield from list(self._namespaces.items())
+
+
+class CompactGraphStore(GraphStore):
+    # GraphStore (Turtle + log) dengan CompactStore sebagai penyimpanan graph di memori
+
+    def _new_graph(self):
+        return new_graph(CompactStore())
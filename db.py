@@ -0,0 +1,253 @@
+# Koneksi database toko (MySQL)
+# Semua akses MySQL memakai satu pool koneksi per proses, bukan membuka koneksi baru
+# untuk setiap query. Pool menerima fungsi `connect` apa saja yang mengembalikan
+# koneksi DB-API, sehingga bisa diuji lokal dengan SQLite sebagai pengganti MySQL.
+
+from contextlib import contextmanager
+import queue
+import sqlite3
+import threading
+
+import profiling
+
+MYSQL_CONFIG = dict(host='localhost', user='root', password='password', database='gadgetstore')
+POOL_SIZE = 8
+
+# Skema tabel toko (SQL standar, dipakai untuk database SQLite pengganti MySQL)
+SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS brand (id VARCHAR(255) PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS category (id VARCHAR(255) PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS product (
+    id VARCHAR(255) PRIMARY KEY,
+    label VARCHAR(255),
+    brand_id VARCHAR(255),
+    category_id VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS customer (id VARCHAR(255) PRIMARY KEY, name VARCHAR(255));
+CREATE TABLE IF NOT EXISTS orders (
+    id VARCHAR(255) PRIMARY KEY,
+    customer_id VARCHAR(255),
+    total_price DECIMAL(12, 2),
+    order_date DATE
+);
+CREATE TABLE IF NOT EXISTS order_contains (
+    order_id VARCHAR(255),
+    product_id VARCHAR(255),
+    PRIMARY KEY (order_id, product_id)
+);
+'''
+
+
+# Log perubahan untuk sinkronisasi inkremental (mysql_sync.incremental_sync): trigger
+# insert/update/delete pada setiap tabel mencatat kunci baris yang berubah dengan nomor
+# urut yang selalu naik. Dipasang saat tabel pertama kali disinkronkan.
+CHANGE_LOG_SQL = {
+    'qmark': '''CREATE TABLE IF NOT EXISTS sync_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tbl VARCHAR(64) NOT NULL,
+        k1 VARCHAR(255) NOT NULL,
+        k2 VARCHAR(255)
+    )''',
+    'format': '''CREATE TABLE IF NOT EXISTS sync_log (
+        seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+        tbl VARCHAR(64) NOT NULL,
+        k1 VARCHAR(255) NOT NULL,
+        k2 VARCHAR(255)
+    )''',
+}
+CHANGE_LOG_INDEX = 'CREATE INDEX sync_log_tbl ON sync_log (tbl, seq)'
+# seq terakhir yang sudah diterapkan per pembaca sync_log (satu baris per checkpoint
+# dan tabel); sync_log hanya dipangkas sampai seq terkecil di sini
+CHANGE_CONSUMER_SQL = '''CREATE TABLE IF NOT EXISTS sync_consumer (
+    consumer VARCHAR(255) NOT NULL,
+    tbl VARCHAR(64) NOT NULL,
+    seq BIGINT NOT NULL,
+    PRIMARY KEY (consumer, tbl)
+)'''
+# event trigger -> baris yang kuncinya dicatat (update mencatat kunci lama dan baru)
+CHANGE_LOG_EVENTS = {'insert': ('NEW',), 'update': ('OLD', 'NEW'), 'delete': ('OLD',)}
+
+
+def mysql_connect():
+    import mysql.connector
+    return mysql.connector.connect(**MYSQL_CONFIG)
+
+
+def sqlite_connect(path):
+    def connect():
+        return sqlite3.connect(path, check_same_thread=False)
+    return connect
+
+
+def sqlite_pool(path, size=POOL_SIZE):
+    return ConnectionPool(sqlite_connect(path), size, paramstyle='qmark')
+
+
+def create_sqlite_schema(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.commit()
+    conn.close()
+
+
+def install_change_log(conn, pool, table, key_cols):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CHANGE_LOG_SQL[pool.paramstyle])
+        cursor.execute(CHANGE_CONSUMER_SQL)
+        try:
+            cursor.execute(CHANGE_LOG_INDEX)
+        except Exception:
+            pass  # index sudah ada (MySQL tidak punya CREATE INDEX IF NOT EXISTS)
+        for event, rows in CHANGE_LOG_EVENTS.items():
+            values = ', '.join(
+                "('%s', %s)" % (table, ', '.join(
+                    [f'{row}.{col}' for col in key_cols] + ['NULL'] * (2 - len(key_cols))))
+                for row in rows)
+            name = f'{table}_sync_{event}'
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'CREATE TRIGGER {name} AFTER {event.upper()} ON {table} FOR EACH ROW '
+                           f'BEGIN INSERT INTO sync_log (tbl, k1, k2) VALUES {values}; END')
+    finally:
+        cursor.close()
+    conn.commit()
+
+
+class ConnectionPool:
+    # paramstyle 'format' (%s, MySQL) atau 'qmark' (?, SQLite)
+    def __init__(self, connect, size=POOL_SIZE, paramstyle='format'):
+        self._connect = connect
+        self.paramstyle = paramstyle
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except Exception:
+                # koneksi bisa dalam keadaan tidak jelas: jangan dikembalikan ke pool
+                conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def sql(self, text):
+        # query ditulis dengan placeholder %s; diganti sesuai driver
+        return text.replace('%s', '?') if self.paramstyle == 'qmark' else text
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(mysql_connect)
+    return _pool
+
+
+# -----------------------------
+# Tulis data secara batch
+# -----------------------------
+# Banyak baris per panggilan dengan executemany (mysql.connector mengubah executemany
+# INSERT menjadi satu INSERT multi-baris), memakai koneksi dari pool, satu commit.
+
+@contextmanager
+def transaction(pool=None):
+    pool = pool or get_pool()
+    with pool.connection() as conn:
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        with profiling.phase('commit'):
+            conn.commit()
+
+
+def insert_rows(conn, pool, table, cols, rows):
+    rows = list(rows)
+    if not rows:
+        return 0
+    placeholders = ', '.join(['%s'] * len(cols))
+    sql = pool.sql(f'INSERT INTO {table} ({", ".join(cols)}) VALUES ({placeholders})')
+    cursor = conn.cursor()
+    try:
+        with profiling.phase('execute'):
+            cursor.executemany(sql, rows)
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def bulk_insert(table, cols, rows, pool=None):
+    pool = pool or get_pool()
+    with profiling.profile('db', table) as prof:
+        with transaction(pool) as conn:
+            prof.rows = insert_rows(conn, pool, table, cols, rows)
+    return prof.rows
+
+
+def add_brands(rows, pool=None):
+    # rows: [(id,), ...]
+    return bulk_insert('brand', ('id',), rows, pool)
+
+
+def add_categories(rows, pool=None):
+    # rows: [(id,), ...]
+    return bulk_insert('category', ('id',), rows, pool)
+
+
+def add_products(rows, pool=None):
+    # rows: [(id, label, brand_id, category_id), ...]
+    return bulk_insert('product', ('id', 'label', 'brand_id', 'category_id'), rows, pool)
+
+
+def add_customers(rows, pool=None):
+    # rows: [(id, name), ...]
+    return bulk_insert('customer', ('id', 'name'), rows, pool)
+
+
+def add_orders(rows, pool=None):
+    # rows: [(id, customer_id, total_price, order_date), ...]
+    return bulk_insert('orders', ('id', 'customer_id', 'total_price', 'order_date'), rows, pool)
+
+
+def add_order_contains(rows, pool=None):
+    # rows: [(order_id, product_id), ...]
+    return bulk_insert('order_contains', ('order_id', 'product_id'), rows, pool)
+
+
+def add_orders_with_items(orders, pool=None):
+    # orders: [((id, customer_id, total_price, order_date), [product_id, ...]), ...]
+    # Header order dan semua baris order_contains ditulis dalam satu transaksi:
+    # gagal satu, tidak ada yang tersimpan.
+    pool = pool or get_pool()
+    orders = list(orders)
+    with profiling.profile('db', 'orders_with_items') as prof, transaction(pool) as conn:
+        prof.rows = insert_rows(conn, pool, 'orders', ('id', 'customer_id', 'total_price', 'order_date'),
+                                [header for header, _ in orders])
+        prof.rows += insert_rows(conn, pool, 'order_contains', ('order_id', 'product_id'),
+                                 [(header[0], pid) for header, items in orders for pid in items])
+    return len(orders)
+
+
+def add_order_with_items(order_id, customer_id, total_price, order_date, product_ids, pool=None):
+    return add_orders_with_items([((order_id, customer_id, total_price, order_date), product_ids)], pool)
@@ -0,0 +1,83 @@
+# Index entitas per tipe untuk dropdown di UI
+# Menyimpan local name -> IRI per tipe (Product, Brand, Category, Customer, Order)
+# beserta rdfs:label dan foaf:name yang sudah di-resolve. Index dibangun sekali saat
+# graph di-load dan diperbarui dari setiap insert/hapus (listener GraphStore), sehingga
+# get_rdf_entities/get_rdf_customers tidak perlu scan graph atau G.value per entitas.
+
+from rdflib import RDF, RDFS
+from rdflib.namespace import FOAF
+import threading
+
+from graph_store import EX, local_name, local_namer
+
+TYPES = (EX.Product, EX.Brand, EX.Category, EX.Customer, EX.Order)
+
+
+class EntityIndex:
+    def __init__(self, types=TYPES):
+        self.types = types
+        self.lock = threading.Lock()
+        self.local_name = local_name
+        self.by_type = {t: {} for t in types}
+        self.labels = {}
+        self.names = {}
+        self._lists = {}
+
+    def rebuild(self, g):
+        by_type = {t: {} for t in self.types}
+        name = local_namer(g)
+        for s, _, t in g.triples((None, RDF.type, None)):
+            if t in by_type:
+                by_type[t][name(s)] = s
+        labels = {s: o for s, _, o in g.triples((None, RDFS.label, None))}
+        names = {s: o for s, _, o in g.triples((None, FOAF.name, None))}
+        with self.lock:
+            self.by_type, self.labels, self.names = by_type, labels, names
+            self.local_name = name
+            self._lists = {}
+
+    def apply(self, added, removed):
+        with self.lock:
+            for s, p, o in removed:
+                if p == RDF.type and o in self.by_type:
+                    self.by_type[o].pop(self.local_name(s), None)
+                    self._lists.pop(o, None)
+                elif p == RDFS.label and self.labels.get(s) == o:
+                    del self.labels[s]
+                elif p == FOAF.name and self.names.get(s) == o:
+                    del self.names[s]
+            for s, p, o in added:
+                if p == RDF.type and o in self.by_type:
+                    self.by_type[o][self.local_name(s)] = s
+                    self._lists.pop(o, None)
+                elif p == RDFS.label:
+                    self.labels[s] = o
+                elif p == FOAF.name:
+                    self.names[s] = o
+            self._lists.pop('customers', None)
+
+    def local_names(self, rdf_type):
+        # list di-cache sampai ada perubahan pada tipe ini; jangan diubah oleh pemanggil
+        with self.lock:
+            names = self._lists.get(rdf_type)
+            if names is None:
+                names = self._lists[rdf_type] = list(self.by_type.get(rdf_type, ()))
+            return names
+
+    def iri(self, rdf_type, name):
+        return self.by_type.get(rdf_type, {}).get(name)
+
+    def label(self, iri):
+        return self.labels.get(iri)
+
+    def customers(self):
+        with self.lock:
+            rows = self._lists.get('customers')
+            if rows is None:
+                rows = self._lists['customers'] = [
+                    (name, str(self.names.get(iri))) for name, iri in self.by_type[EX.Customer].items()]
+            return rows
+
+
+def get_index(store):
+    return store.attach('entities', EntityIndex)
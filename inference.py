@@ -0,0 +1,130 @@
+# Inferensi RDFS: closure dimaterialisasi di graph terpisah
+# Triple hasil inferensi disimpan di graph sendiri (tidak ikut ke file Turtle / log),
+# dan query yang butuh penalaran dijalankan atas gabungan graph asli + graph inferensi
+# (union(), ReadOnlyGraphAggregate). Hierarki kategori cukup dijawab dengan pola biasa
+# yang ter-index (?p ex:belongsToCategory ex:Gadget) tanpa property path
+# rdfs:subClassOf* yang lambat di rdflib.
+#
+# Aturan:
+# - rdfs11 / rdfs5: rdfs:subClassOf dan rdfs:subPropertyOf transitif
+# - rdfs9: x a C, C subClassOf D -> x a D
+# - rdfs7: x p y, p subPropertyOf q -> x q y
+# - rdfs2 / rdfs3: rdfs:domain dan rdfs:range memberi tipe pada subjek / objek (IRI)
+# - aplikasi: kategori juga disusun dengan rdfs:subClassOf (ex:Smartphone rdfs:subClassOf
+#   ex:Gadget), jadi produk di ex:Smartphone juga ex:belongsToCategory ex:Gadget
+#
+# Listener GraphStore: insert data diturunkan bertahap (worklist dari triple baru saja).
+# Hapus, atau perubahan skema (subClassOf, subPropertyOf, domain, range), menghitung
+# ulang seluruh closure karena asal setiap triple turunan tidak dicatat.
+
+from rdflib import Literal, RDF, RDFS
+from rdflib.graph import ReadOnlyGraphAggregate
+
+from graph_store import EX, new_graph
+
+SCHEMA_PREDICATES = {RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range}
+
+
+def transitive(edges):
+    # node -> semua node yang bisa dicapai lewat edges (tanpa node itu sendiri)
+    closure = {}
+    for start, targets in edges.items():
+        seen, stack = set(), list(targets)
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(edges.get(node, ()))
+        seen.discard(start)
+        closure[start] = seen
+    return closure
+
+
+def edges(g, predicate):
+    out = {}
+    for s, _, o in g.triples((None, predicate, None)):
+        out.setdefault(s, set()).add(o)
+    return out
+
+
+class RDFSClosure:
+    def __init__(self):
+        self.base = None
+        self.inferred = new_graph()
+        self.super_classes = {}
+        self.super_properties = {}
+        self.domains = {}
+        self.ranges = {}
+        self._union = None
+
+    def rebuild(self, g):
+        self.base = g
+        self.super_classes = transitive(edges(g, RDFS.subClassOf))
+        self.super_properties = transitive(edges(g, RDFS.subPropertyOf))
+        self.domains = edges(g, RDFS.domain)
+        self.ranges = edges(g, RDFS.range)
+        self.inferred = new_graph()
+        self._union = None
+        pending = []
+        for c, supers in self.super_classes.items():
+            pending.extend((c, RDFS.subClassOf, d) for d in supers)
+        for p, supers in self.super_properties.items():
+            pending.extend((p, RDFS.subPropertyOf, q) for q in supers)
+        self._derive(pending)
+        # hanya triple yang bisa memicu aturan yang perlu dibaca
+        pending = []
+        for p in set(self.super_properties) | set(self.domains) | set(self.ranges):
+            pending.extend(g.triples((None, p, None)))
+        for c in self.super_classes:
+            pending.extend(g.triples((None, RDF.type, c)))
+            pending.extend(g.triples((None, EX.belongsToCategory, c)))
+        self._run(pending)
+
+    def apply(self, added, removed):
+        if removed or any(p in SCHEMA_PREDICATES for _, p, _ in added):
+            self.rebuild(self.base)
+            return
+        for t in added:
+            # triple yang sekarang eksplisit tidak disimpan dua kali
+            if t in self.inferred:
+                self.inferred.remove(t)
+        self._run(list(added))
+
+    def _derive(self, triples):
+        # tambahkan yang belum ada; kembalikan triple yang benar-benar baru
+        new = []
+        for t in triples:
+            if t not in self.base and t not in self.inferred:
+                self.inferred.add(t)
+                new.append(t)
+        return new
+
+    def _run(self, pending):
+        while pending:
+            pending.extend(self._derive(self._consequences(*pending.pop())))
+
+    def _consequences(self, s, p, o):
+        for q in self.super_properties.get(p, ()):
+            yield (s, q, o)
+        if p == RDF.type:
+            for d in self.super_classes.get(o, ()):
+                yield (s, RDF.type, d)
+        elif p == EX.belongsToCategory:
+            for d in self.super_classes.get(o, ()):
+                yield (s, EX.belongsToCategory, d)
+        for c in self.domains.get(p, ()):
+            yield (s, RDF.type, c)
+        if not isinstance(o, Literal):
+            for c in self.ranges.get(p, ()):
+                yield (o, RDF.type, c)
+
+    def union(self):
+        # graph asli + inferensi untuk query (baca di dalam store.read())
+        union = self._union
+        if union is None or union.graphs[0] is not self.base or union.graphs[1] is not self.inferred:
+            union = self._union = ReadOnlyGraphAggregate([self.base, self.inferred])
+        return union
+
+
+def get_closure(store):
+    return store.attach('inference', RDFSClosure)
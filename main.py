@@ -4,115 +4,120 @@
 # Run with: pip install rdflib streamlit pandas
 # Then: streamlit run streamlit_gadget_store.py
 
-from rdflib import Graph, Namespace, Literal, RDF, RDFS, URIRef
+from rdflib import Literal, RDF, RDFS, URIRef
 from rdflib.namespace import XSD, FOAF
+import concurrent.futures
 import streamlit as st
 import pandas as pd
-import os
+
+from graph_store import EX, get_store, local_name
+import analytics
+import db
+import entity_index
+import inference
+import product_view
+import profiling
+import queries
+import search_index
+import sparql
+import sparql_client
+import write_coordinator
 
 # -----------------------------
 # Konfigurasi
 # -----------------------------
 RDF_FILE = 'data_gadget.ttl'
 
-# Build ontology graph (in-memory)
+# Graph ontologi dimuat sekali per proses dan dipakai bersama semua session
+# (lihat graph_store.py); hanya di-load ulang jika isi file berubah.
+# Dengan GADGET_API_URL aplikasi menjadi klien tipis: graph, listener dan log tidak
+# dibuka di proses ini (server.py satu-satunya penulis), semua baca/tulis lewat endpoint.
 # -----------------------------
-EX = Namespace("http://example.org/gadgetstore#")
-G = Graph()
-G.bind('ex', EX)
-G.bind('foaf', FOAF)
-
-# Load RDF dari file jika ada
-if os.path.exists(RDF_FILE):
-    G.parse(RDF_FILE, format='turtle')
-
-# Classes
-G.add((EX.Product, RDF.type, RDFS.Class))
-G.add((EX.Category, RDF.type, RDFS.Class))
-G.add((EX.Brand, RDF.type, RDFS.Class))
-G.add((EX.Customer, RDF.type, RDFS.Class))
-G.add((EX.Order, RDF.type, RDFS.Class))
-
-# Properties
-G.add((EX.hasBrand, RDF.type, RDF.Property))
-G.add((EX.belongsToCategory, RDF.type, RDF.Property))
-G.add((EX.purchasedBy, RDF.type, RDF.Property))
-G.add((EX.orderContains, RDF.type, RDF.Property))
-G.add((EX.hasPrice, RDF.type, RDF.Property))
-G.add((EX.hasDate, RDF.type, RDF.Property))
-G.add((EX.totalPrice, RDF.type, RDF.Property))
+API_URL = sparql_client.API_URL
+if API_URL:
+    STORE = None
+    ENTITIES = sparql_client.RemoteEntities(API_URL)
+    PRODUCTS = sparql_client.RemoteProducts(API_URL)
+    ANALYTICS = sparql_client.RemoteAnalytics(API_URL)
+    SEARCH = sparql_client.RemoteSearch(API_URL)
+else:
+    STORE = get_store(RDF_FILE)
+    STORE.get_graph()
+    ENTITIES = entity_index.get_index(STORE)
+    PRODUCTS = product_view.get_view(STORE)
+    ANALYTICS = analytics.get_analytics(STORE)
+    # closure RDFS (subkategori, subclass, subproperty) untuk kasus dengan 'infer'
+    INFERENCE = inference.get_closure(STORE)
+    # index teks label produk / nama customer untuk kotak pencarian di sidebar
+    SEARCH = search_index.get_search(STORE)
+    # semua insert dari UI lewat satu thread penulis (batch + group commit, lihat write_coordinator.py)
+    WRITER = write_coordinator.get_writer(STORE)
 
 # -----------------------------
-# SPARQL queries (4 kasus utama)
+# SPARQL queries (4 kasus utama + dashboard, lihat queries.py)
 # -----------------------------
-SPARQL_QUERIES = {
-    '1. Produk dan Merek (Brand)': {
-        'query': '''
-PREFIX ex: <http://example.org/gadgetstore#>
-SELECT ?product ?brand WHERE {
-  ?product a ex:Product .
-  ?product ex:hasBrand ?brand .
-}
-''',
-        'desc': 'Menampilkan semua produk beserta brand/mereknya.'
-    },
-    '2. Siapa yang membeli produk tertentu (contoh: iPhone15)': {
-        'query': '''
-PREFIX ex: <http://example.org/gadgetstore#>
-PREFIX foaf: <http://xmlns.com/foaf/0.1/>
-SELECT ?customerName ?order WHERE {
-  ?order a ex:Order .
-  ?order ex:orderContains ex:iPhone15 .
-  ?order ex:purchasedBy ?customer .
-  ?customer foaf:name ?customerName .
-}
-''',
-        'desc': 'Menampilkan nama customer yang membeli produk iPhone15 beserta nomor order.'
-    },
-    '3. Produk berdasarkan Kategori (contoh: Laptop)': {
-        'query': '''
-PREFIX ex: <http://example.org/gadgetstore#>
-SELECT ?product WHERE {
-  ?product a ex:Product .
-  ?product ex:belongsToCategory ex:Laptop .
-}
-''',
-        'desc': 'Menampilkan produk yang termasuk kategori Laptop.'
-    },
-    '4. Daftar Order lengkap (customer, total price, tanggal)': {
-        'query': '''
-PREFIX ex: <http://example.org/gadgetstore#>
-PREFIX foaf: <http://xmlns.com/foaf/0.1/>
-SELECT ?order ?customerName ?total ?date WHERE {
-  ?order a ex:Order .
-  ?order ex:purchasedBy ?customer .
-  ?customer foaf:name ?customerName .
-  OPTIONAL { ?order ex:totalPrice ?total }
-  OPTIONAL { ?order ex:hasDate ?date }
-}
-''',
-        'desc': 'Menampilkan semua order beserta nama customer, total harga, dan tanggal pembelian.'
-    }
-}
+# disalin per rerun: kasus yang ditambahkan lewat UI tidak mengubah katalog modul
+SPARQL_QUERIES = dict(queries.SPARQL_QUERIES)
 
 # helper untuk menjalankan query dan mengembalikan DataFrame
-
-def run_sparql(q):
-    qres = G.query(q)
-    cols = [str(v) for v in qres.vars]
-    rows = []
-    for row in qres:
-        rows.append([str(x) if x is not None else '' for x in row])
-    if not rows:
-        return pd.DataFrame(columns=cols)
-    return pd.DataFrame(rows, columns=cols)
+# (query di-compile dan hasilnya di-cache per versi graph, lihat sparql.py;
+# dengan GADGET_API_URL query dijalankan di endpoint server.py)
+
+def run_sparql(q, label=None, infer=False):
+    if API_URL:
+        with profiling.profile('sparql', label or sparql.query_label(q), detail=q):
+            with profiling.phase('remote'):
+                return sparql_client.run_sparql(API_URL, q, infer=infer)
+    return sparql.run_sparql(STORE, q, label=label, infer=infer)
+
+# simpan entitas baru; ditolak jika ID sudah dipakai (termasuk oleh session lain yang
+# menyimpan pada saat bersamaan), bukan digabung dengan entitas yang sudah ada.
+# Timeout menunggu commit/endpoint dan error apply/fsync/HTTP ditampilkan ke pengguna,
+# bukan menghentikan halaman; setelah timeout data mungkin tetap tersimpan belakangan.
+def add_new(uri, triples):
+    try:
+        if API_URL:
+            sparql_client.insert_data(API_URL, triples, absent=[uri])
+        else:
+            WRITER.write(triples, absent=[uri])
+    except write_coordinator.WriteConflict as e:
+        st.error(f'{e}. Gunakan ID lain.')
+        return False
+    except sparql_client.EndpointError as e:
+        if e.status == 409:
+            st.error(f'ID {local_name(uri)} sudah dipakai. Gunakan ID lain.')
+        else:
+            st.error(f'Gagal menyimpan ke endpoint: {e}')
+        return False
+    except (TimeoutError, concurrent.futures.TimeoutError):
+        st.error(f'Penyimpanan {local_name(uri)} belum selesai (timeout). Data mungkin tetap '
+                 'tersimpan; muat ulang halaman sebelum mencoba lagi.')
+        return False
+    except Exception as e:
+        st.error(f'Gagal menyimpan {local_name(uri)}: {e}')
+        return False
+    return True
+
+# hasil pencarian sidebar: [(IRI, teks, tipe)]
+def search_hits(text):
+    if API_URL:
+        return SEARCH.search(text)
+    hits = SEARCH.search(text)
+    with SEARCH.lock:
+        return [(iri, label, list(SEARCH.types.get(iri, ()))) for iri, label in hits]
+
+# cursor query custom: di endpoint dalam mode API, lokal jika tidak
+def open_cursor(q):
+    if API_URL:
+        return sparql_client.RemoteCursor(API_URL, q)
+    return sparql.SparqlCursor(STORE, q)
 
 # -----------------------------
 # Koneksi MySQL dan CRUD
 # -----------------------------
 
 def get_conn():
-    return mysql.connector.connect(host='localhost', user='root', password='password', database='gadgetstore')
+    return db.mysql_connect()
 
 def get_all_brands():
     conn = get_conn()
@@ -162,85 +167,38 @@ def get_order_contains():
     conn.close()
     return oc
 
-# Fungsi tambah data
+# Fungsi tambah data (koneksi dari pool, lihat db.py)
 
 def add_brand(id):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO brand (id) VALUES (%s)', (id,))
-    conn.commit()
-    conn.close()
+    db.add_brands([(id,)])
 
 def add_category(id):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO category (id) VALUES (%s)', (id,))
-    conn.commit()
-    conn.close()
+    db.add_categories([(id,)])
 
 def add_product(id, label, brand_id, category_id):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO product (id, label, brand_id, category_id) VALUES (%s, %s, %s, %s)', (id, label, brand_id, category_id))
-    conn.commit()
-    conn.close()
+    db.add_products([(id, label, brand_id, category_id)])
 
 def add_customer(id, name):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO customer (id, name) VALUES (%s, %s)', (id, name))
-    conn.commit()
-    conn.close()
+    db.add_customers([(id, name)])
 
 def add_order(id, customer_id, total_price, order_date):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO orders (id, customer_id, total_price, order_date) VALUES (%s, %s, %s, %s)', (id, customer_id, total_price, order_date))
-    conn.commit()
-    conn.close()
+    db.add_orders([(id, customer_id, total_price, order_date)])
 
 def add_order_contains(order_id, product_id):
-    conn = get_conn()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO order_contains (order_id, product_id) VALUES (%s, %s)', (order_id, product_id))
-    conn.commit()
-    conn.close()
+    db.add_order_contains([(order_id, product_id)])
+
+# Order beserta produknya dalam satu transaksi (untuk banyak baris sekaligus gunakan
+# db.add_products, db.add_orders_with_items, dst.)
+
+def add_order_with_items(id, customer_id, total_price, order_date, product_ids):
+    db.add_order_with_items(id, customer_id, total_price, order_date, product_ids)
 
 # Fungsi generate RDF dari data MySQL
+# (ekstraksi paralel dengan pool koneksi dan insert per chunk, lihat mysql_sync.py)
 
 def mysql_to_rdf():
-    G = Graph()
-    G.bind('ex', EX)
-    G.bind('foaf', FOAF)
-    # Brand
-    for b in get_all_brands():
-        G.add((EX[b['id']], RDF.type, EX.Brand))
-    # Category
-    for c in get_all_categories():
-        G.add((EX[c['id']], RDF.type, EX.Category))
-    # Product
-    for p in get_all_products():
-        G.add((EX[p['id']], RDF.type, EX.Product))
-        if p['label']:
-            G.add((EX[p['id']], RDFS.label, Literal(p['label'], datatype=XSD.string)))
-        G.add((EX[p['id']], EX.hasBrand, EX[p['brand_id']]))
-        G.add((EX[p['id']], EX.belongsToCategory, EX[p['category_id']]))
-    # Customer
-    for cu in get_all_customers():
-        G.add((EX[cu['id']], RDF.type, EX.Customer))
-        G.add((EX[cu['id']], FOAF.name, Literal(cu['name'], datatype=XSD.string)))
-    # Order
-    for o in get_all_orders():
-        G.add((EX[o['id']], RDF.type, EX.Order))
-        G.add((EX[o['id']], EX.purchasedBy, EX[o['customer_id']]))
-        if o['total_price']:
-            G.add((EX[o['id']], EX.totalPrice, Literal(float(o['total_price']), datatype=XSD.decimal)))
-        if o['order_date']:
-            G.add((EX[o['id']], EX.hasDate, Literal(str(o['order_date']), datatype=XSD.date)))
-    # Order Contains
-    for oc in get_order_contains():
-        G.add((EX[oc['order_id']], EX.orderContains, EX[oc['product_id']]))
-    return G
+    import mysql_sync  # hanya dibutuhkan saat generate dari MySQL
+    return mysql_sync.mysql_to_rdf()
 
 # -----------------------------
 # Streamlit UI
@@ -250,14 +208,31 @@ st.title('Demo Ontologi Toko Online Gadget (RDF + SPARQL)')
 
 # Sidebar menu navigasi
 menu = st.sidebar.selectbox('Menu', ['Utama', 'Produk', 'Brand', 'Kategori', 'Customer'])
+cache = sparql.cache_info()
+st.sidebar.caption(f"Cache SPARQL: {cache['hits']} hit / {cache['misses']} miss, {cache['prepared']} query ter-compile")
+
+# Pencarian cepat (prefix / fuzzy) lewat index teks, tanpa FILTER(regex) ke graph
+search_text = st.sidebar.text_input('Cari produk / customer', key='search_text')
+if search_text:
+    with profiling.profile('search', 'sidebar', detail=search_text) as prof:
+        hits = search_hits(search_text)
+        prof.rows = len(hits)
+    if hits:
+        st.sidebar.dataframe(pd.DataFrame(
+            [(local_name(iri), text, ', '.join(local_name(t) for t in types))
+             for iri, text, types in hits],
+            columns=['ID', 'Nama', 'Tipe']), hide_index=True)
+    else:
+        st.sidebar.caption('Tidak ada yang cocok.')
 
 # Helper: ambil data dinamis dari RDF
+# (dari index entitas yang diperbarui di setiap insert, lihat entity_index.py)
 
 def get_rdf_entities(rdf_type):
-    return [str(s).split('#')[-1] for s in G.subjects(RDF.type, rdf_type)]
+    return ENTITIES.local_names(rdf_type)
 
 def get_rdf_customers():
-    return [(str(s).split('#')[-1], str(G.value(s, FOAF.name))) for s in G.subjects(RDF.type, EX.Customer)]
+    return ENTITIES.customers()
 
 # Tampilkan notifikasi sukses jika ada di session state
 if st.session_state.get('notif_success'):
@@ -285,11 +260,19 @@ if menu == 'Utama':
     st.subheader(choice)
     st.write(selected['desc'])
     try:
-        df = run_sparql(selected['query'])
-        if df.empty:
-            st.info('Tidak ada hasil untuk query ini.')
-        else:
-            st.dataframe(df)
+        # fase parse/eval/frame dicatat run_sparql, render ditambahkan di sini
+        with profiling.profile('sparql', choice, detail=selected.get('query')) as prof:
+            if 'view' in selected:
+                with profiling.phase('view'):
+                    df = ANALYTICS.table(selected['view'])
+                prof.rows = len(df)
+            else:
+                df = run_sparql(selected['query'], label=choice, infer=selected.get('infer', False))
+            with profiling.phase('render'):
+                if df.empty:
+                    st.info('Tidak ada hasil untuk query ini.')
+                else:
+                    st.dataframe(df)
     except Exception as e:
         st.error(f'Error menjalankan query: {e}')
 
@@ -306,14 +289,16 @@ if menu == 'Utama':
         if st.button('Tambah Produk', key='btn_prod_main'):
             if prod_name and prod_brand and prod_cat:
                 prod_uri = EX[prod_name]
-                G.add((prod_uri, RDF.type, EX.Product))
-                G.add((prod_uri, EX.hasBrand, EX[prod_brand]))
-                G.add((prod_uri, EX.belongsToCategory, EX[prod_cat]))
+                triples = [
+                    (prod_uri, RDF.type, EX.Product),
+                    (prod_uri, EX.hasBrand, EX[prod_brand]),
+                    (prod_uri, EX.belongsToCategory, EX[prod_cat]),
+                ]
                 if prod_label:
-                    G.add((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
-                st.rerun()
+                    triples.append((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
+                if add_new(prod_uri, triples):
+                    st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Lengkapi semua field produk!')
         st.markdown('---')
@@ -322,10 +307,9 @@ if menu == 'Utama':
         if st.button('Tambah Brand', key='btn_brand_main'):
             if brand_id:
                 brand_uri = EX[brand_id]
-                G.add((brand_uri, RDF.type, EX.Brand))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Brand {brand_id} berhasil ditambahkan!'
-                st.rerun()
+                if add_new(brand_uri, [(brand_uri, RDF.type, EX.Brand)]):
+                    st.session_state['notif_success'] = f'Brand {brand_id} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Masukkan ID Brand!')
     elif choice == '2. Siapa yang membeli produk tertentu (contoh: iPhone15)':
@@ -340,11 +324,13 @@ if menu == 'Utama':
         if st.button('Tambah Customer', key='btn_cust_main'):
             if cust_id and cust_name:
                 cust_uri = EX[cust_id]
-                G.add((cust_uri, RDF.type, EX.Customer))
-                G.add((cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
-                st.rerun()
+                triples = [
+                    (cust_uri, RDF.type, EX.Customer),
+                    (cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)),
+                ]
+                if add_new(cust_uri, triples):
+                    st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Masukkan ID dan Nama Customer!')
         st.markdown('---')
@@ -359,15 +345,17 @@ if menu == 'Utama':
         if st.button('Tambah Order', key='btn_order_main'):
             if order_id and cust_select and total_price and order_date and order_products:
                 order_uri = EX[order_id]
-                G.add((order_uri, RDF.type, EX.Order))
-                G.add((order_uri, EX.purchasedBy, EX[cust_select]))
-                G.add((order_uri, EX.totalPrice, Literal(float(total_price), datatype=XSD.decimal)))
-                G.add((order_uri, EX.hasDate, Literal(order_date, datatype=XSD.date)))
+                triples = [
+                    (order_uri, RDF.type, EX.Order),
+                    (order_uri, EX.purchasedBy, EX[cust_select]),
+                    (order_uri, EX.totalPrice, Literal(float(total_price), datatype=XSD.decimal)),
+                    (order_uri, EX.hasDate, Literal(order_date, datatype=XSD.date)),
+                ]
                 for prod in order_products:
-                    G.add((order_uri, EX.orderContains, EX[prod]))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Order {order_id} berhasil ditambahkan!'
-                st.rerun()
+                    triples.append((order_uri, EX.orderContains, EX[prod]))
+                if add_new(order_uri, triples):
+                    st.session_state['notif_success'] = f'Order {order_id} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Lengkapi semua field order dan pilih produk!')
         # Instruksi jika hasil query kosong
@@ -380,10 +368,9 @@ if menu == 'Utama':
         if st.button('Tambah Kategori', key='btn_cat_main'):
             if cat_id:
                 cat_uri = EX[cat_id]
-                G.add((cat_uri, RDF.type, EX.Category))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Kategori {cat_id} berhasil ditambahkan!'
-                st.rerun()
+                if add_new(cat_uri, [(cat_uri, RDF.type, EX.Category)]):
+                    st.session_state['notif_success'] = f'Kategori {cat_id} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Masukkan ID Kategori!')
         st.markdown('---')
@@ -397,14 +384,16 @@ if menu == 'Utama':
         if st.button('Tambah Produk', key='btn_prod_main3'):
             if prod_name and prod_brand and prod_cat:
                 prod_uri = EX[prod_name]
-                G.add((prod_uri, RDF.type, EX.Product))
-                G.add((prod_uri, EX.hasBrand, EX[prod_brand]))
-                G.add((prod_uri, EX.belongsToCategory, EX[prod_cat]))
+                triples = [
+                    (prod_uri, RDF.type, EX.Product),
+                    (prod_uri, EX.hasBrand, EX[prod_brand]),
+                    (prod_uri, EX.belongsToCategory, EX[prod_cat]),
+                ]
                 if prod_label:
-                    G.add((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
-                st.rerun()
+                    triples.append((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
+                if add_new(prod_uri, triples):
+                    st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Lengkapi semua field produk!')
     elif choice == '4. Daftar Order lengkap (customer, total price, tanggal)':
@@ -415,11 +404,13 @@ if menu == 'Utama':
         if st.button('Tambah Customer', key='btn_cust_main4'):
             if cust_id and cust_name:
                 cust_uri = EX[cust_id]
-                G.add((cust_uri, RDF.type, EX.Customer))
-                G.add((cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
-                st.rerun()
+                triples = [
+                    (cust_uri, RDF.type, EX.Customer),
+                    (cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)),
+                ]
+                if add_new(cust_uri, triples):
+                    st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Masukkan ID dan Nama Customer!')
         st.markdown('---')
@@ -434,28 +425,54 @@ if menu == 'Utama':
         if st.button('Tambah Order', key='btn_order_main4'):
             if order_id and cust_select and total_price and order_date and order_products:
                 order_uri = EX[order_id]
-                G.add((order_uri, RDF.type, EX.Order))
-                G.add((order_uri, EX.purchasedBy, EX[cust_select]))
-                G.add((order_uri, EX.totalPrice, Literal(float(total_price), datatype=XSD.decimal)))
-                G.add((order_uri, EX.hasDate, Literal(order_date, datatype=XSD.date)))
+                triples = [
+                    (order_uri, RDF.type, EX.Order),
+                    (order_uri, EX.purchasedBy, EX[cust_select]),
+                    (order_uri, EX.totalPrice, Literal(float(total_price), datatype=XSD.decimal)),
+                    (order_uri, EX.hasDate, Literal(order_date, datatype=XSD.date)),
+                ]
                 for prod in order_products:
-                    G.add((order_uri, EX.orderContains, EX[prod]))
-                G.serialize(destination=RDF_FILE, format='turtle')
-                st.session_state['notif_success'] = f'Order {order_id} berhasil ditambahkan!'
-                st.rerun()
+                    triples.append((order_uri, EX.orderContains, EX[prod]))
+                if add_new(order_uri, triples):
+                    st.session_state['notif_success'] = f'Order {order_id} berhasil ditambahkan!'
+                    st.rerun()
             else:
                 st.warning('Lengkapi semua field order dan pilih produk!')
 
     st.markdown('---')
     st.subheader('Jalankan SPARQL custom')
     user_q = st.text_area('Masukkan SPARQL query di sini', value='''PREFIX ex: <http://example.org/gadgetstore#>\nSELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 50''', height=160)
+    # Query custom dijalankan bertahap: halaman pertama langsung tampil, halaman
+    # berikutnya diambil saat diminta (lihat sparql.SparqlCursor)
     if st.button('Jalankan query'):
+        if st.session_state.get('sparql_cursor'):
+            st.session_state['sparql_cursor'].cancel()
+        st.session_state['sparql_cursor'] = open_cursor(user_q)
+        st.session_state['sparql_page'] = 0
+    cursor = st.session_state.get('sparql_cursor')
+    if cursor:
+        page = st.session_state.get('sparql_page', 0)
         try:
-            df2 = run_sparql(user_q)
-            if df2.empty:
+            df2 = cursor.fetch_page(page)
+            if df2.empty and page == 0:
                 st.info('Query berjalan tetapi tidak mengembalikan hasil.')
+            elif df2.empty:
+                st.info('Tidak ada baris lagi.')
             else:
                 st.dataframe(df2)
+                start = page * cursor.page_size
+                st.caption(f'Halaman {page + 1}, baris {start + 1}–{start + len(df2)}')
+            if cursor.truncated and not cursor.has_next(page):
+                st.warning(f'Hasil dipotong pada {cursor.max_rows} baris. Tambahkan LIMIT atau FILTER pada query.')
+            col_prev, col_next = st.columns(2)
+            if page > 0 and col_prev.button('Halaman sebelumnya'):
+                st.session_state['sparql_page'] = page - 1
+                st.rerun()
+            if cursor.has_next(page) and col_next.button('Halaman berikutnya'):
+                st.session_state['sparql_page'] = page + 1
+                st.rerun()
+        except sparql.QueryBudgetExceeded as e:
+            st.error(str(e))
         except Exception as e:
             st.error(f'Error menjalankan SPARQL: {e}')
     st.markdown('---')
@@ -463,19 +480,24 @@ if menu == 'Utama':
 
 elif menu == 'Produk':
     st.header('Data Produk')
-    produk = []
-    for s in G.subjects(RDF.type, EX.Product):
-        label = G.value(s, RDFS.label)
-        brand = G.value(s, EX.hasBrand)
-        cat = G.value(s, EX.belongsToCategory)
-        produk.append({
-            'ID': str(s).split('#')[-1],
-            'Label': str(label) if label else '',
-            'Brand': str(brand).split('#')[-1] if brand else '',
-            'Kategori': str(cat).split('#')[-1] if cat else ''
-        })
-    if produk:
-        st.dataframe(pd.DataFrame(produk))
+    # filter, sort dan halaman dihitung dari view produk (lihat product_view.py)
+    col_brand, col_cat, col_sort = st.columns(3)
+    filter_brand = col_brand.selectbox('Filter Brand', ['(Semua)'] + get_rdf_entities(EX.Brand), key='prod_filter_brand')
+    filter_cat = col_cat.selectbox('Filter Kategori', ['(Semua)'] + get_rdf_entities(EX.Category), key='prod_filter_cat')
+    sort_col = col_sort.selectbox('Urutkan', product_view.COLUMNS, key='prod_sort')
+    filter_brand = None if filter_brand == '(Semua)' else filter_brand
+    filter_cat = None if filter_cat == '(Semua)' else filter_cat
+    total = PRODUCTS.count(filter_brand, filter_cat)
+    if total:
+        pages = (total - 1) // product_view.PAGE_SIZE + 1
+        if st.session_state.get('prod_page', 1) > pages:
+            # filter baru menghasilkan lebih sedikit halaman
+            st.session_state['prod_page'] = pages
+        page = st.number_input('Halaman', min_value=1, max_value=pages, value=1, key='prod_page') - 1
+        produk, total = PRODUCTS.query(filter_brand, filter_cat, sort=sort_col, page=page)
+        st.dataframe(produk)
+        start = page * product_view.PAGE_SIZE
+        st.caption(f'Menampilkan {start + 1}–{start + len(produk)} dari {total} produk')
     else:
         st.info('Belum ada produk.')
     st.subheader('Tambah Produk Baru')
@@ -488,14 +510,16 @@ elif menu == 'Produk':
     if st.button('Tambah Produk'):
         if prod_name and prod_brand and prod_cat:
             prod_uri = EX[prod_name]
-            G.add((prod_uri, RDF.type, EX.Product))
-            G.add((prod_uri, EX.hasBrand, EX[prod_brand]))
-            G.add((prod_uri, EX.belongsToCategory, EX[prod_cat]))
+            triples = [
+                (prod_uri, RDF.type, EX.Product),
+                (prod_uri, EX.hasBrand, EX[prod_brand]),
+                (prod_uri, EX.belongsToCategory, EX[prod_cat]),
+            ]
             if prod_label:
-                G.add((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
-            G.serialize(destination=RDF_FILE, format='turtle')
-            st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
-            st.rerun()
+                triples.append((prod_uri, RDFS.label, Literal(prod_label, datatype=XSD.string)))
+            if add_new(prod_uri, triples):
+                st.session_state['notif_success'] = f'Produk {prod_name} berhasil ditambahkan!'
+                st.rerun()
         else:
             st.warning('Lengkapi semua field produk!')
 
@@ -511,10 +535,9 @@ elif menu == 'Brand':
     if st.button('Tambah Brand'):
         if brand_id:
             brand_uri = EX[brand_id]
-            G.add((brand_uri, RDF.type, EX.Brand))
-            G.serialize(destination=RDF_FILE, format='turtle')
-            st.session_state['notif_success'] = f'Brand {brand_id} berhasil ditambahkan!'
-            st.rerun()
+            if add_new(brand_uri, [(brand_uri, RDF.type, EX.Brand)]):
+                st.session_state['notif_success'] = f'Brand {brand_id} berhasil ditambahkan!'
+                st.rerun()
         else:
             st.warning('Masukkan ID Brand!')
 
@@ -530,10 +553,9 @@ elif menu == 'Kategori':
     if st.button('Tambah Kategori'):
         if cat_id:
             cat_uri = EX[cat_id]
-            G.add((cat_uri, RDF.type, EX.Category))
-            G.serialize(destination=RDF_FILE, format='turtle')
-            st.session_state['notif_success'] = f'Kategori {cat_id} berhasil ditambahkan!'
-            st.rerun()
+            if add_new(cat_uri, [(cat_uri, RDF.type, EX.Category)]):
+                st.session_state['notif_success'] = f'Kategori {cat_id} berhasil ditambahkan!'
+                st.rerun()
         else:
             st.warning('Masukkan ID Kategori!')
 
@@ -550,11 +572,13 @@ elif menu == 'Customer':
     if st.button('Tambah Customer'):
         if cust_id and cust_name:
             cust_uri = EX[cust_id]
-            G.add((cust_uri, RDF.type, EX.Customer))
-            G.add((cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)))
-            G.serialize(destination=RDF_FILE, format='turtle')
-            st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
-            st.rerun()
+            triples = [
+                (cust_uri, RDF.type, EX.Customer),
+                (cust_uri, FOAF.name, Literal(cust_name, datatype=XSD.string)),
+            ]
+            if add_new(cust_uri, triples):
+                st.session_state['notif_success'] = f'Customer {cust_name} berhasil ditambahkan!'
+                st.rerun()
         else:
             st.warning('Masukkan ID dan Nama Customer!')
 
@@ -563,7 +587,31 @@ elif menu == 'Customer':
 # -----------------------------
 st.markdown('---')
 if st.checkbox('Tampilkan RDF (Turtle)'):
-    turtle = G.serialize(format='turtle')
-    if isinstance(turtle, bytes):
-        turtle = turtle.decode('utf-8')
-    st.code(turtle, language='turtle')
+    with profiling.profile('graph', 'serialize') as prof:
+        with profiling.phase('serialize'):
+            if API_URL:
+                turtle = sparql_client.serialize(API_URL, format='turtle')
+            else:
+                with STORE.read() as g:
+                    turtle = g.serialize(format='turtle')
+                    prof.rows = len(g)
+        if isinstance(turtle, bytes):
+            turtle = turtle.decode('utf-8')
+        with profiling.phase('render'):
+            st.code(turtle, language='turtle')
+
+# -----------------------------
+# Diagnostik (lihat profiling.py)
+# -----------------------------
+with st.sidebar.expander('Diagnostik'):
+    stats = profiling.PROFILER.summary()
+    if stats:
+        st.dataframe(pd.DataFrame(stats).sort_values('p95_ms', ascending=False), hide_index=True)
+    else:
+        st.caption('Belum ada operasi yang tercatat.')
+    slow = profiling.PROFILER.slow_queries()
+    st.caption(f'Slow log (>= {profiling.PROFILER.slow_seconds:g} s): {len(slow)} entri')
+    if slow:
+        st.dataframe(pd.DataFrame(slow)[['time', 'op', 'key', 'seconds', 'rows', 'detail']], hide_index=True)
+    if st.button('Export metrik (Prometheus)', key='btn_export_metrics'):
+        st.caption(f'Ditulis ke {profiling.PROFILER.write_prometheus()}')
@@ -0,0 +1,290 @@
+# Sinkronisasi data MySQL -> graph RDF
+# Keenam tabel diekstrak paralel, masing-masing dengan koneksi dari pool (db.py).
+# Baris dibaca dengan cursor streaming + fetchmany per CHUNK_SIZE baris (tidak ada
+# fetchall seluruh tabel), diubah menjadi triple, lalu dimasukkan ke graph sekaligus
+# per chunk dengan G.addN. Penulisan ke graph hanya dari satu thread karena graph
+# rdflib tidak thread-safe.
+#
+# incremental_sync(): hanya menerapkan perubahan sejak sinkronisasi terakhir ke graph
+# yang sedang dipakai (GraphStore), tanpa membangun ulang graph. Perubahan dibaca dari
+# tabel sync_log yang diisi trigger insert/update/delete (db.install_change_log):
+# - high-water mark per tabel adalah seq terakhir di sync_log yang sudah diterapkan,
+#   disimpan di file checkpoint JSON; query memakai seq > hwm (nomor urut selalu naik,
+#   tidak ada baris yang terlewat seperti pada timestamp yang sama)
+# - hanya baris dengan kunci yang tercatat yang dibaca ulang; kunci yang barisnya sudah
+#   tidak ada (atau deleted_at terisi) dianggap dihapus
+# - sinkronisasi pertama sebuah tabel memasang trigger lalu membaca tabel itu sekali
+# - setiap tabel hanya memiliki rdf:type kelasnya sendiri dan predicate miliknya: IRI
+#   yang juga bertipe lain (dari tabel lain atau dari UI) tidak kehilangan tipe itu
+# - baris dibaca dari MySQL tanpa lock graph; selisih terhadap graph dihitung dan
+#   diterapkan di bawah store.lock, jadi tidak ada tulisan lain di antaranya
+# - sync_log bisa dibaca beberapa pembaca (store/checkpoint berbeda): seq terakhir
+#   tiap pembaca dicatat di sync_consumer dan sync_log hanya dipangkas sampai seq
+#   terkecil. Pembaca yang tidak dipakai lagi harus dihapus dari sync_consumer agar
+#   sync_log tidak tumbuh terus.
+
+from rdflib import Literal, RDF, RDFS
+from rdflib.namespace import XSD, FOAF
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import queue
+
+from db import get_pool, install_change_log, transaction
+from graph_store import EX, new_graph
+
+CHUNK_SIZE = 5000
+# kunci per SELECT saat membaca ulang baris yang berubah
+KEY_BATCH = 200
+
+
+def brand_triples(b):
+    yield (EX[b['id']], RDF.type, EX.Brand)
+
+
+def category_triples(c):
+    yield (EX[c['id']], RDF.type, EX.Category)
+
+
+def product_triples(p):
+    yield (EX[p['id']], RDF.type, EX.Product)
+    if p['label']:
+        yield (EX[p['id']], RDFS.label, Literal(p['label'], datatype=XSD.string))
+    yield (EX[p['id']], EX.hasBrand, EX[p['brand_id']])
+    yield (EX[p['id']], EX.belongsToCategory, EX[p['category_id']])
+
+
+def customer_triples(cu):
+    yield (EX[cu['id']], RDF.type, EX.Customer)
+    yield (EX[cu['id']], FOAF.name, Literal(cu['name'], datatype=XSD.string))
+
+
+def order_triples(o):
+    yield (EX[o['id']], RDF.type, EX.Order)
+    yield (EX[o['id']], EX.purchasedBy, EX[o['customer_id']])
+    if o['total_price']:
+        yield (EX[o['id']], EX.totalPrice, Literal(float(o['total_price']), datatype=XSD.decimal))
+    if o['order_date']:
+        yield (EX[o['id']], EX.hasDate, Literal(str(o['order_date']), datatype=XSD.date))
+
+
+def order_contains_triples(oc):
+    yield (EX[oc['order_id']], EX.orderContains, EX[oc['product_id']])
+
+
+# tabel -> fungsi baris ke triple (sinkronisasi penuh)
+TABLES = [
+    ('brand', brand_triples),
+    ('category', category_triples),
+    ('product', product_triples),
+    ('customer', customer_triples),
+    ('orders', order_triples),
+    ('order_contains', order_contains_triples),
+]
+
+
+# tabel, kolom kunci, kelas rdf:type, predicate lain milik tabel (diganti saat baris
+# berubah), fungsi triple. order_contains tidak punya kelas maupun predicate sendiri:
+# triple-nya ditentukan dari kuncinya.
+SYNC_TABLES = [
+    ('brand', ('id',), EX.Brand, (), brand_triples),
+    ('category', ('id',), EX.Category, (), category_triples),
+    ('product', ('id',), EX.Product, (RDFS.label, EX.hasBrand, EX.belongsToCategory), product_triples),
+    ('customer', ('id',), EX.Customer, (FOAF.name,), customer_triples),
+    ('orders', ('id',), EX.Order, (EX.purchasedBy, EX.totalPrice, EX.hasDate), order_triples),
+    ('order_contains', ('order_id', 'product_id'), None, None, order_contains_triples),
+]
+
+
+def stream_rows(conn, sql, params=(), chunk_size=CHUNK_SIZE):
+    # menghasilkan list dict per chunk; cursor default mysql.connector tidak di-buffer
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        cols = [d[0] for d in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(zip(cols, r)) for r in rows]
+    finally:
+        cursor.close()
+
+
+def sync_to_graph(g, pool=None, tables=TABLES, chunk_size=CHUNK_SIZE):
+    pool = pool or get_pool()
+    chunks = queue.Queue(maxsize=2 * len(tables))
+
+    def extract(table, to_triples):
+        # tanda selesai dikirim dari worker sendiri, juga saat gagal; callback Future
+        # bisa berjalan di thread utama sebelum queue dikosongkan dan macet di put()
+        try:
+            with pool.connection() as conn:
+                for rows in stream_rows(conn, f'SELECT * FROM {table}', chunk_size=chunk_size):
+                    chunks.put([(s, p, o, g) for row in rows for s, p, o in to_triples(row)])
+        finally:
+            chunks.put(None)
+
+    count = 0
+    error = None
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        futures = [executor.submit(extract, table, fn) for table, fn in tables]
+        remaining = len(futures)
+        while remaining:
+            quads = chunks.get()
+            if quads is None:
+                remaining -= 1
+            elif error is None:
+                # setelah error, sisa chunk tetap diambil agar worker tidak macet di put()
+                try:
+                    g.addN(quads)
+                    count += len(quads)
+                except Exception as e:
+                    error = e
+        for f in futures:
+            f.result()
+    if error is not None:
+        raise error
+    return count
+
+
+def mysql_to_rdf(pool=None):
+    g = new_graph()
+    sync_to_graph(g, pool)
+    return g
+
+
+# -----------------------------
+# Sinkronisasi inkremental
+# -----------------------------
+
+def load_checkpoint(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'tables': {}}
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def owned_triples(g, spec, key):
+    # triple di graph yang berasal dari baris dengan kunci ini
+    table, key_cols, rdf_class, predicates, to_triples = spec
+    if predicates is None:
+        return {t for t in to_triples(dict(zip(key_cols, key))) if t in g}
+    s = EX[key[0]]
+    owned = {(s, p, o) for p in predicates for o in g.objects(s, p)}
+    if (s, RDF.type, rdf_class) in g:
+        owned.add((s, RDF.type, rdf_class))
+    return owned
+
+
+def key_where(key_cols, keys):
+    # (c1 = %s AND c2 = %s) OR ... untuk satu batch kunci
+    cond = '(' + ' AND '.join(f'{c} = %s' for c in key_cols) + ')'
+    return ' OR '.join([cond] * len(keys)), [v for key in keys for v in key]
+
+
+def read_changes(conn, pool, spec, state):
+    # baris yang berubah sejak checkpoint: {kunci: baris, atau None jika sudah dihapus}
+    table, key_cols = spec[0], spec[1]
+
+    def key_of(row):
+        return tuple(str(row[c]) for c in key_cols)
+
+    def last_seq():
+        cursor = conn.cursor()
+        cursor.execute(pool.sql('SELECT COALESCE(MAX(seq), 0) FROM sync_log WHERE tbl = %s'), (table,))
+        seq = cursor.fetchone()[0]
+        cursor.close()
+        return seq
+
+    changes = {}
+    if 'seq' not in state:
+        # trigger dipasang sebelum tabel dibaca: perubahan selama pembacaan ikut
+        # diterapkan lagi pada sinkronisasi berikutnya (hasilnya sama)
+        install_change_log(conn, pool, table, key_cols)
+        seq = last_seq()
+        for rows in stream_rows(conn, f'SELECT * FROM {table}'):
+            changes.update((key_of(row), row) for row in rows)
+        return changes, {'seq': seq}
+
+    seq = state['seq']
+    keys = {}
+    sql = pool.sql('SELECT seq, k1, k2 FROM sync_log WHERE tbl = %s AND seq > %s ORDER BY seq')
+    for rows in stream_rows(conn, sql, (table, seq)):
+        for r in rows:
+            keys[(r['k1'], r['k2'])[:len(key_cols)]] = None
+            seq = r['seq']
+    keys = list(keys)
+    for start in range(0, len(keys), KEY_BATCH):
+        batch = keys[start:start + KEY_BATCH]
+        where, params = key_where(key_cols, batch)
+        found = {}
+        for rows in stream_rows(conn, pool.sql(f'SELECT * FROM {table} WHERE {where}'), params):
+            found.update((key_of(row), row) for row in rows)
+        for key in batch:
+            changes[key] = found.get(key)
+    return changes, {'seq': seq}
+
+
+def diff_table(g, spec, changes, added, removed):
+    # triple lama milik setiap kunci diganti triple dari baris barunya
+    to_triples = spec[-1]
+    stats = {'upserted': 0, 'deleted': 0}
+    for key, row in changes.items():
+        old = owned_triples(g, spec, key)
+        new = set(to_triples(row)) if row is not None and not row.get('deleted_at') else set()
+        removed.update(old - new)
+        added.update(new - old)
+        stats['upserted' if new else 'deleted'] += 1
+    return stats
+
+
+def prune_change_log(pool, checkpoint, consumer):
+    # catat posisi pembaca ini, lalu pangkas sampai posisi terkecil semua pembaca
+    with transaction(pool) as conn:
+        cursor = conn.cursor()
+        for table, state in checkpoint['tables'].items():
+            cursor.execute(pool.sql('REPLACE INTO sync_consumer (consumer, tbl, seq) VALUES (%s, %s, %s)'),
+                           (consumer, table, state['seq']))
+            cursor.execute(pool.sql('DELETE FROM sync_log WHERE tbl = %s AND seq <= '
+                                    '(SELECT MIN(seq) FROM sync_consumer WHERE tbl = %s)'), (table, table))
+        cursor.close()
+
+
+def incremental_sync(store, pool=None, checkpoint_path=None, tables=SYNC_TABLES):
+    pool = pool or get_pool()
+    checkpoint_path = checkpoint_path or store.path + '.sync.json'
+    checkpoint = load_checkpoint(checkpoint_path)
+    changes = []
+    with pool.connection() as conn:
+        for spec in tables:
+            rows, state = read_changes(conn, pool, spec, checkpoint['tables'].get(spec[0], {}))
+            changes.append((spec, rows))
+            checkpoint['tables'][spec[0]] = state
+    added, removed, stats = set(), set(), {}
+    # selisih dihitung dan diterapkan pada versi graph yang sama (tulisan lain menunggu)
+    with store.lock:
+        g = store.get_graph()
+        for spec, rows in changes:
+            stats[spec[0]] = diff_table(g, spec, rows, added, removed)
+        # graph dulu (tercatat di log), baru checkpoint: jika proses mati di antaranya,
+        # sinkronisasi berikutnya menerapkan ulang perubahan yang sama tanpa efek ganda
+        store.apply(added=added - removed, removed=removed - added)
+    save_checkpoint(checkpoint_path, checkpoint)
+    prune_change_log(pool, checkpoint, os.path.abspath(checkpoint_path))
+    return stats
+
+
+if __name__ == '__main__':
+    from graph_store import get_store
+    print(incremental_sync(get_store('data_gadget.ttl')))
@@ -0,0 +1,115 @@
+# Tabel produk (materialized view) untuk halaman 'Produk'
+# Baris ID/Label/Brand/Kategori dibangun sekali dengan satu scan per predicate lalu
+# di-join di dict, bukan tiga G.value per produk. Setelah itu view diperbarui dari
+# setiap insert/hapus (listener GraphStore): hanya produk yang tersentuh yang dihitung
+# ulang. Filter brand/kategori memakai index set, urutan hasil sort di-cache sampai ada
+# perubahan, dan yang dikirim ke UI hanya satu halaman.
+
+from rdflib import RDF, RDFS
+import pandas as pd
+import threading
+
+from graph_store import EX, local_name, local_namer
+
+COLUMNS = ['ID', 'Label', 'Brand', 'Kategori']
+PAGE_SIZE = 50
+
+# predicate -> (kolom, konversi nilai); local_name diganti local_namer(g) saat rebuild
+FIELDS = {
+    RDFS.label: (1, str),
+    EX.hasBrand: (2, local_name),
+    EX.belongsToCategory: (3, local_name),
+}
+
+
+class ProductView:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.graph = None
+        self.local_name = local_name
+        self.fields = FIELDS
+        self.rows = {}
+        self.by_brand = {}
+        self.by_category = {}
+        self._sorted = {}
+
+    def rebuild(self, g):
+        name = local_namer(g)
+        fields = {pred: (col, name if conv is local_name else conv) for pred, (col, conv) in FIELDS.items()}
+        rows = {s: [name(s), '', '', ''] for s in g.subjects(RDF.type, EX.Product)}
+        for pred, (col, conv) in fields.items():
+            for s, _, o in g.triples((None, pred, None)):
+                row = rows.get(s)
+                if row is not None:
+                    row[col] = conv(o)
+        by_brand, by_category = {}, {}
+        for s, row in rows.items():
+            by_brand.setdefault(row[2], set()).add(s)
+            by_category.setdefault(row[3], set()).add(s)
+        with self.lock:
+            self.graph = g
+            self.local_name, self.fields = name, fields
+            self.rows, self.by_brand, self.by_category = rows, by_brand, by_category
+            self._sorted = {}
+
+    def apply(self, added, removed):
+        touched = set()
+        for triples in (added, removed):
+            for s, p, o in triples:
+                if p in FIELDS or (p == RDF.type and o == EX.Product):
+                    touched.add(s)
+        if not touched:
+            return
+        with self.lock:
+            for s in touched:
+                self._refresh_row(s)
+            self._sorted = {}
+
+    def _refresh_row(self, s):
+        old = self.rows.pop(s, None)
+        if old is not None:
+            self.by_brand[old[2]].discard(s)
+            self.by_category[old[3]].discard(s)
+        g = self.graph
+        if (s, RDF.type, EX.Product) not in g:
+            return
+        row = [self.local_name(s), '', '', '']
+        for pred, (col, conv) in self.fields.items():
+            value = g.value(s, pred)
+            if value is not None:
+                row[col] = conv(value)
+        self.rows[s] = row
+        self.by_brand.setdefault(row[2], set()).add(s)
+        self.by_category.setdefault(row[3], set()).add(s)
+
+    def _keys(self, brand, category):
+        if brand is not None and category is not None:
+            return self.by_brand.get(brand, set()) & self.by_category.get(category, set())
+        if brand is not None:
+            return self.by_brand.get(brand, ())
+        if category is not None:
+            return self.by_category.get(category, ())
+        return self.rows
+
+    def count(self, brand=None, category=None):
+        with self.lock:
+            return len(self._keys(brand, category))
+
+    def query(self, brand=None, category=None, sort='ID', descending=False, page=0, page_size=PAGE_SIZE):
+        # mengembalikan (DataFrame satu halaman, jumlah total produk yang lolos filter)
+        with self.lock:
+            key = (brand, category, sort, descending)
+            order = self._sorted.get(key)
+            if order is None:
+                col = COLUMNS.index(sort)
+                rows = self.rows
+                order = sorted(self._keys(brand, category),
+                               key=lambda s: (rows[s][col], rows[s][0]), reverse=descending)
+                self._sorted[key] = order
+            start = page * page_size
+            chunk = [list(self.rows[s]) for s in order[start:start + page_size]]
+        return pd.DataFrame(chunk, columns=COLUMNS), len(order)
+
+
+def get_view(store):
+    return store.attach('products', ProductView)
@@ -0,0 +1,240 @@
+# Instrumentasi jalur utama (SPARQL, load/serialize graph, tulis DB/graph)
+# Setiap operasi dicatat sebagai satu profil: (op, key), waktu per fase, jumlah baris
+# dan peak memory. Pemakaian:
+#
+#     with profiling.profile('sparql', judul) as prof:
+#         with profiling.phase('parse'):
+#             ...
+#         prof.rows = len(df)
+#
+# profiling.phase() menambah waktu ke profil yang sedang aktif di thread ini (tanpa
+# profil aktif: tidak melakukan apa-apa), jadi fungsi tingkat bawah bisa mengukur
+# fasenya tanpa tahu siapa pemanggilnya. profile() bersarang dengan op yang sama
+# digabung ke profil terluar (mis. main.py menambah fase 'render' ke profil
+# run_sparql). Waktu yang tidak masuk fase mana pun dicatat sebagai 'other'.
+#
+# Per (op, key) disimpan WINDOW durasi terakhir untuk p50/p95/p99, plus total kumulatif
+# untuk ekspor Prometheus. Key query ad-hoc (awalan ADHOC_PREFIX, satu per teks query)
+# dibatasi MAX_ADHOC_SERIES dan semua key dibatasi MAX_SERIES; key baru setelah batas
+# itu digabung ke key OTHER_KEY per op, sehingga memori dan jumlah label Prometheus
+# tidak tumbuh tanpa batas. Operasi yang lebih lama dari SLOW_SECONDS masuk slow log
+# (SLOW_LOG_SIZE entri terakhir). Peak memory per operasi memakai tracemalloc dan hanya
+# aktif dengan GADGET_PROFILE_MEMORY=1 (tracemalloc memperlambat semua alokasi; peak
+# bersifat global per proses, jadi operasi yang berjalan bersamaan ikut terhitung).
+
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+WINDOW = 1000
+MAX_SERIES = 500
+MAX_ADHOC_SERIES = 50
+ADHOC_PREFIX = 'q:'
+OTHER_KEY = '(lainnya)'
+SLOW_SECONDS = float(os.environ.get('GADGET_SLOW_QUERY_SECONDS', '0.5'))
+SLOW_LOG_SIZE = 100
+TRACE_MEMORY = os.environ.get('GADGET_PROFILE_MEMORY') == '1'
+METRICS_FILE = os.environ.get('GADGET_METRICS_FILE', 'gadget_metrics.prom')
+QUANTILES = (0.5, 0.95, 0.99)
+
+_local = threading.local()
+
+
+class Profile:
+    def __init__(self, op, key, detail=None):
+        self.op = op
+        self.key = key
+        self.detail = detail
+        self.rows = None
+        self.peak = None
+        self.phases = {}
+        self.total = 0.0
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+class Series:
+    def __init__(self):
+        self.durations = deque(maxlen=WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.phases = {}
+        self.rows = 0
+        self.last_rows = None
+        self.peak = None
+
+    def add(self, prof):
+        self.durations.append(prof.total)
+        self.count += 1
+        self.total += prof.total
+        for name, seconds in prof.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if prof.rows is not None:
+            self.rows += prof.rows
+            self.last_rows = prof.rows
+        if prof.peak is not None:
+            self.peak = max(self.peak or 0, prof.peak)
+
+    def quantiles(self):
+        return dict(zip(QUANTILES, np.quantile(np.fromiter(self.durations, float), QUANTILES)))
+
+
+class Profiler:
+    def __init__(self, slow_seconds=SLOW_SECONDS, trace_memory=TRACE_MEMORY):
+        self.slow_seconds = slow_seconds
+        self.trace_memory = trace_memory
+        self.lock = threading.Lock()
+        self.series = {}
+        self._adhoc = 0
+        self.slow_log = deque(maxlen=SLOW_LOG_SIZE)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def record(self, prof):
+        with self.lock:
+            key = (prof.op, prof.key)
+            if key not in self.series:
+                adhoc = str(prof.key).startswith(ADHOC_PREFIX)
+                if len(self.series) >= MAX_SERIES or (adhoc and self._adhoc >= MAX_ADHOC_SERIES):
+                    key = (prof.op, OTHER_KEY)
+                elif adhoc:
+                    self._adhoc += 1
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = Series()
+            series.add(prof)
+            if prof.total >= self.slow_seconds:
+                self.slow_log.append({
+                    'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'op': prof.op, 'key': prof.key, 'seconds': prof.total,
+                    'phases': dict(prof.phases), 'rows': prof.rows, 'peak': prof.peak,
+                    'detail': (prof.detail or '')[:500],
+                })
+
+    def summary(self):
+        # satu baris per (op, key); waktu dalam milidetik
+        rows = []
+        with self.lock:
+            for (op, key), s in self.series.items():
+                q = s.quantiles()
+                row = {'op': op, 'key': key, 'count': s.count,
+                       'p50_ms': q[0.5] * 1000, 'p95_ms': q[0.95] * 1000, 'p99_ms': q[0.99] * 1000}
+                for name, seconds in s.phases.items():
+                    row[f'{name}_ms'] = seconds / s.count * 1000
+                row['rows'] = s.last_rows
+                row['peak_mb'] = s.peak / 1e6 if s.peak is not None else None
+                rows.append(row)
+        return rows
+
+    def slow_queries(self):
+        with self.lock:
+            return list(reversed(self.slow_log))
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+            self._adhoc = 0
+            self.slow_log.clear()
+
+    def prometheus_text(self):
+        out = []
+
+        def metric(name, kind, help_text):
+            out.append(f'# HELP {name} {help_text}')
+            out.append(f'# TYPE {name} {kind}')
+
+        with self.lock:
+            items = sorted(self.series.items())
+            metric('gadget_op_duration_seconds', 'summary', 'Durasi operasi (jendela terakhir untuk quantile)')
+            for (op, key), s in items:
+                labels = f'op="{escape(op)}",key="{escape(key)}"'
+                for quantile, value in s.quantiles().items():
+                    out.append(f'gadget_op_duration_seconds{{{labels},quantile="{quantile}"}} {value:.6f}')
+                out.append(f'gadget_op_duration_seconds_sum{{{labels}}} {s.total:.6f}')
+                out.append(f'gadget_op_duration_seconds_count{{{labels}}} {s.count}')
+            metric('gadget_op_phase_seconds_total', 'counter', 'Total waktu per fase operasi')
+            for (op, key), s in items:
+                for phase_name, seconds in sorted(s.phases.items()):
+                    out.append(f'gadget_op_phase_seconds_total{{op="{escape(op)}",key="{escape(key)}",'
+                               f'phase="{escape(phase_name)}"}} {seconds:.6f}')
+            metric('gadget_op_rows_total', 'counter', 'Total baris/triple yang diproses')
+            for (op, key), s in items:
+                out.append(f'gadget_op_rows_total{{op="{escape(op)}",key="{escape(key)}"}} {s.rows}')
+            metric('gadget_op_peak_memory_bytes', 'gauge', 'Peak memory tracemalloc per operasi')
+            for (op, key), s in items:
+                if s.peak is not None:
+                    out.append(f'gadget_op_peak_memory_bytes{{op="{escape(op)}",key="{escape(key)}"}} {s.peak}')
+            metric('gadget_slow_queries', 'gauge', 'Jumlah entri di slow log')
+            out.append(f'gadget_slow_queries {len(self.slow_log)}')
+        metric('gadget_process_max_rss_bytes', 'gauge', 'Peak RSS proses')
+        out.append(f'gadget_process_max_rss_bytes {max_rss_bytes()}')
+        return '\n'.join(out) + '\n'
+
+    def write_prometheus(self, path=METRICS_FILE):
+        # ditulis ke file sementara lalu diganti, agar pembaca (node_exporter textfile) tidak
+        # pernah melihat file setengah jadi
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+        return path
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def max_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+PROFILER = Profiler()
+
+
+def active():
+    return getattr(_local, 'profile', None)
+
+
+@contextmanager
+def profile(op, key, detail=None, profiler=PROFILER):
+    outer = active()
+    if outer is not None and outer.op == op:
+        yield outer
+        return
+    prof = Profile(op, key, detail)
+    _local.profile = prof
+    if profiler.trace_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield prof
+    finally:
+        prof.total = time.perf_counter() - start
+        _local.profile = outer
+        other = prof.total - sum(prof.phases.values())
+        if other > 0:
+            prof.add('other', other)
+        if profiler.trace_memory:
+            prof.peak = tracemalloc.get_traced_memory()[1]
+        profiler.record(prof)
+
+
+@contextmanager
+def phase(name):
+    prof = active()
+    if prof is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        prof.add(name, time.perf_counter() - start)
@@ -0,0 +1,78 @@
+# Katalog kasus SPARQL yang ditampilkan di aplikasi
+# Dipisah dari main.py agar bisa dipakai tanpa Streamlit (benchmark, endpoint HTTP).
+# Entri dengan 'query' dijalankan sebagai SPARQL; entri dengan 'view' dibaca dari
+# agregat di analytics.py. 'infer': True menjalankan query atas graph + closure RDFS
+# (inference.py), mis. subkategori lewat rdfs:subClassOf.
+
+SPARQL_QUERIES = {
+    '1. Produk dan Merek (Brand)': {
+        'query': '''
+PREFIX ex: <http://example.org/gadgetstore#>
+SELECT ?product ?brand WHERE {
+  ?product a ex:Product .
+  ?product ex:hasBrand ?brand .
+}
+''',
+        'desc': 'Menampilkan semua produk beserta brand/mereknya.'
+    },
+    '2. Siapa yang membeli produk tertentu (contoh: iPhone15)': {
+        'query': '''
+PREFIX ex: <http://example.org/gadgetstore#>
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+SELECT ?customerName ?order WHERE {
+  ?order a ex:Order .
+  ?order ex:orderContains ex:iPhone15 .
+  ?order ex:purchasedBy ?customer .
+  ?customer foaf:name ?customerName .
+}
+''',
+        'desc': 'Menampilkan nama customer yang membeli produk iPhone15 beserta nomor order.'
+    },
+    '3. Produk berdasarkan Kategori (contoh: Laptop)': {
+        'query': '''
+PREFIX ex: <http://example.org/gadgetstore#>
+SELECT ?product WHERE {
+  ?product a ex:Product .
+  ?product ex:belongsToCategory ex:Laptop .
+}
+''',
+        'infer': True,
+        'desc': 'Menampilkan produk yang termasuk kategori Laptop, termasuk subkategorinya '
+                '(kategori X rdfs:subClassOf ex:Laptop).'
+    },
+    '4. Daftar Order lengkap (customer, total price, tanggal)': {
+        'query': '''
+PREFIX ex: <http://example.org/gadgetstore#>
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+SELECT ?order ?customerName ?total ?date WHERE {
+  ?order a ex:Order .
+  ?order ex:purchasedBy ?customer .
+  ?customer foaf:name ?customerName .
+  OPTIONAL { ?order ex:totalPrice ?total }
+  OPTIONAL { ?order ex:hasDate ?date }
+}
+''',
+        'desc': 'Menampilkan semua order beserta nama customer, total harga, dan tanggal pembelian.'
+    },
+    # Dashboard: dibaca dari agregat yang sudah dihitung (analytics.py), bukan query SPARQL
+    '5. Dashboard: Pendapatan per Brand': {
+        'view': 'brand',
+        'desc': 'Total pendapatan dan jumlah order per brand (total order dibagi rata ke produknya).'
+    },
+    '6. Dashboard: Pendapatan per Kategori': {
+        'view': 'category',
+        'desc': 'Total pendapatan dan jumlah order per kategori produk.'
+    },
+    '7. Dashboard: Pendapatan per Customer': {
+        'view': 'customer',
+        'desc': 'Total belanja dan jumlah order setiap customer.'
+    },
+    '8. Dashboard: Pendapatan per Tanggal': {
+        'view': 'day',
+        'desc': 'Total pendapatan dan jumlah order per tanggal order.'
+    },
+    '9. Dashboard: Pendapatan per Bulan': {
+        'view': 'month',
+        'desc': 'Total pendapatan dan jumlah order per bulan.'
+    }
+}
@@ -0,0 +1,287 @@
+# Index pencarian teks untuk label produk dan nama customer
+# Inverted index di memori: teks rdfs:label dan foaf:name dinormalisasi (huruf kecil,
+# tanpa aksen) dan dipecah menjadi token; token -> set IRI. Token unik juga disimpan
+# terurut sehingga pencarian prefix cukup dua bisect ("sams gal" menemukan
+# "Samsung Galaxy"), tanpa scan graph atau FILTER(regex) di SPARQL.
+#
+# Pencarian: setiap kata query adalah prefix. Kata dengan posting terkecil menjadi
+# penggerak; IRI-nya dicek terhadap kata lain dan pencarian berhenti begitu 'limit'
+# hasil terkumpul, jadi biaya tidak tumbuh dengan ukuran katalog. Token yang sama
+# persis didahulukan dari yang hanya cocok prefix. Jika kombinasi kata jarang
+# (SCAN_BUDGET dokumen dicek tanpa cukup hasil), sisanya dihitung dengan irisan set.
+#
+# Kata yang tidak punya token dengan prefix tersebut (salah ketik, atau potongan di
+# tengah kata seperti "phone" untuk "Smartphone") dicocokkan lewat trigram: token
+# dengan cukup banyak trigram yang sama dipakai sebagai penggantinya. Token yang
+# hanya berisi angka tidak diberi trigram (nomor seri tidak perlu fuzzy dan
+# jumlahnya bisa jutaan).
+#
+# Listener GraphStore: dibangun sekali saat graph di-load, lalu diperbarui dari setiap
+# insert/hapus hanya untuk IRI yang teksnya berubah.
+
+from bisect import bisect_left, insort
+from collections import Counter
+from rdflib import RDF, RDFS
+from rdflib.namespace import FOAF
+import re
+import threading
+import unicodedata
+
+from graph_store import EX
+
+TEXT_PREDICATES = (RDFS.label, FOAF.name)
+TYPES = frozenset((EX.Product, EX.Customer, EX.Brand, EX.Category))
+# satu lookup dict per triple di apply()
+PREDICATES = dict.fromkeys(TEXT_PREDICATES, 'text')
+PREDICATES[RDF.type] = 'type'
+LIMIT = 20
+# skor minimal (bagian trigram kata query yang ada di token) untuk pencocokan fuzzy
+FUZZY_SCORE = 0.6
+FUZZY_TOKENS = 5
+# kata dengan lebih banyak token prefix dari ini tidak dihitung ukuran posting-nya
+ESTIMATE_TOKENS = 256
+# sampai sekian token, kata lain dicek dengan membership set; lebih dari itu lewat
+# token dokumen
+CHECK_TOKENS = 16
+# dokumen penggerak yang dicek sebelum beralih ke irisan set
+SCAN_BUDGET = 256
+# token baru/hilang dalam satu apply() di atas ini: list token di-sort ulang sekali
+BULK_TOKENS = 256
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    text = str(text)
+    if text.isascii():
+        return text.casefold()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text):
+    return _WORD.findall(normalize(text))
+
+
+def trigrams(token):
+    padded = f'${token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.texts = {}
+        self.types = {}
+        # IRI -> ' token1 token2 ...' (cek prefix kata = satu pencarian substring)
+        self.words = {}
+        self.postings = {}
+        self.tokens = []
+        self.grams = {}
+
+    def rebuild(self, g):
+        texts, types = {}, {}
+        for pred in TEXT_PREDICATES:
+            for s, _, o in g.triples((None, pred, None)):
+                texts.setdefault(s, []).append(str(o))
+        for t in TYPES:
+            for s in g.subjects(RDF.type, t):
+                types.setdefault(s, set()).add(t)
+        words, postings = {}, {}
+        for s, values in texts.items():
+            tokens = self._doc_tokens(values)
+            words[s] = ' ' + ' '.join(tokens)
+            for tok in tokens:
+                postings.setdefault(tok, set()).add(s)
+        grams = {}
+        for tok in postings:
+            if not tok.isdigit():
+                for gram in trigrams(tok):
+                    grams.setdefault(gram, set()).add(tok)
+        with self.lock:
+            self.texts, self.types = texts, types
+            self.words, self.postings, self.grams = words, postings, grams
+            self.tokens = sorted(postings)
+
+    def apply(self, added, removed):
+        with self.lock:
+            changed = set()
+            for s, p, o in removed:
+                kind = PREDICATES.get(p)
+                if kind == 'text':
+                    values = self.texts.get(s)
+                    if values and str(o) in values:
+                        values.remove(str(o))
+                        changed.add(s)
+                elif kind == 'type' and o in TYPES:
+                    self.types.get(s, set()).discard(o)
+            for s, p, o in added:
+                kind = PREDICATES.get(p)
+                if kind == 'text':
+                    self.texts.setdefault(s, []).append(str(o))
+                    changed.add(s)
+                elif kind == 'type' and o in TYPES:
+                    self.types.setdefault(s, set()).add(o)
+            # token -> sudah ada di list token sebelum apply ini
+            touched = {}
+            for s in changed:
+                self._reindex(s, touched)
+            self._update_tokens(touched)
+
+    def _doc_tokens(self, values):
+        # urutan token dipertahankan, tanpa duplikat
+        return tuple(dict.fromkeys(tok for value in values for tok in tokenize(value)))
+
+    def _reindex(self, s, touched):
+        old = set(self.words.get(s, '').split())
+        values = self.texts.get(s)
+        tokens = self._doc_tokens(values) if values else ()
+        if tokens:
+            self.words[s] = ' ' + ' '.join(tokens)
+        else:
+            self.texts.pop(s, None)
+            self.words.pop(s, None)
+        for tok in old.difference(tokens):
+            docs = self.postings[tok]
+            docs.discard(s)
+            if not docs:
+                del self.postings[tok]
+                touched.setdefault(tok, True)
+                if not tok.isdigit():
+                    for gram in trigrams(tok):
+                        self.grams[gram].discard(tok)
+        for tok in set(tokens).difference(old):
+            docs = self.postings.get(tok)
+            if docs is None:
+                docs = self.postings[tok] = set()
+                touched.setdefault(tok, False)
+                if not tok.isdigit():
+                    for gram in trigrams(tok):
+                        self.grams.setdefault(gram, set()).add(tok)
+            docs.add(s)
+
+    def _update_tokens(self, touched):
+        # insert kecil: bisect per token; import besar: gabung lalu sort (timsort
+        # tinggal menggabungkan dua bagian yang sudah terurut)
+        new = [tok for tok, existed in touched.items() if not existed and tok in self.postings]
+        gone = [tok for tok, existed in touched.items() if existed and tok not in self.postings]
+        if len(new) + len(gone) <= BULK_TOKENS:
+            for tok in gone:
+                del self.tokens[bisect_left(self.tokens, tok)]
+            for tok in new:
+                insort(self.tokens, tok)
+            return
+        if gone:
+            self.tokens = [tok for tok in self.tokens if tok in self.postings]
+        self.tokens.extend(new)
+        self.tokens.sort()
+
+    def _fuzzy(self, word):
+        # token dengan trigram terbanyak yang sama dengan kata query
+        grams = trigrams(word)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.grams.get(gram, ()))
+        scored = [(n / len(grams), -abs(len(tok) - len(word)), tok)
+                  for tok, n in counts.items() if n / len(grams) >= FUZZY_SCORE]
+        scored.sort(reverse=True)
+        return [tok for _, _, tok in scored[:FUZZY_TOKENS]]
+
+    def _term(self, word):
+        lo = bisect_left(self.tokens, word)
+        hi = bisect_left(self.tokens, word + '\U0010ffff', lo)
+        if lo < hi:
+            return Term(self, word, lo=lo, hi=hi)
+        return Term(self, word, tokens=self._fuzzy(word) if len(word) >= 2 else [])
+
+    def search(self, text, rdf_type=None, limit=LIMIT):
+        # [(IRI, teks)] untuk IRI yang teksnya memuat semua kata query (sebagai prefix)
+        words = list(dict.fromkeys(tokenize(text)))
+        if not words:
+            return []
+        with self.lock:
+            terms = sorted((self._term(w) for w in words), key=lambda term: term.size)
+            if not terms[0].size:
+                return []
+            driver, others = terms[0], terms[1:]
+            results, seen = [], set()
+
+            def accept(s):
+                if rdf_type is None or rdf_type in self.types.get(s, ()):
+                    results.append((s, self.texts[s][0]))
+                return len(results) >= limit
+
+            # 1. jalan di posting penggerak (token sama persis lebih dulu) sampai limit;
+            #    cukup untuk satu kata atau kata-kata yang sering muncul bersama
+            budget = SCAN_BUDGET if others else None
+            for docs in driver.postings():
+                for s in docs:
+                    if s in seen:
+                        continue
+                    seen.add(s)
+                    if all(term.contains(s) for term in others) and accept(s):
+                        return results
+                    if budget is not None:
+                        budget -= 1
+                        if not budget:
+                            break
+                else:
+                    continue
+                break
+            else:
+                return results
+            # 2. kombinasi jarang: irisan set (di C), dari kata dengan posting terkecil
+            candidates = driver.union()
+            for term in others:
+                candidates = term.intersect(candidates)
+                if not candidates:
+                    break
+            for s in candidates:
+                if s not in seen and accept(s):
+                    break
+            return results
+
+
+class Term:
+    # satu kata query: token yang cocok (rentang di index.tokens atau hasil fuzzy)
+    def __init__(self, index, word, lo=0, hi=0, tokens=None):
+        self.index = index
+        self.needle = ' ' + word
+        self.lo, self.hi = lo, hi
+        self.tokens = tokens
+        count = self.count = len(tokens) if tokens is not None else hi - lo
+        if count <= ESTIMATE_TOKENS:
+            self.size = sum(len(index.postings[tok]) for tok in self.matched())
+        else:
+            # terlalu banyak token untuk dihitung; jangan jadi penggerak
+            self.size = float('inf')
+        self.sets = [index.postings[tok] for tok in self.matched()] if count <= CHECK_TOKENS else None
+
+    def matched(self):
+        if self.tokens is not None:
+            return self.tokens
+        return (self.index.tokens[i] for i in range(self.lo, self.hi))
+
+    def postings(self):
+        return (self.index.postings[tok] for tok in self.matched())
+
+    def contains(self, s):
+        if self.sets is not None:
+            return any(s in docs for docs in self.sets)
+        return self.needle in self.index.words[s]
+
+    def union(self):
+        return set().union(*self.postings())
+
+    def intersect(self, candidates):
+        if self.sets is not None and len(self.sets) == 1:
+            return candidates & self.sets[0]
+        # union set di C jauh lebih murah per elemen daripada cek satu per satu
+        cost = self.size if self.size != float('inf') else self.count
+        if cost <= len(candidates) * 8:
+            return candidates & self.union()
+        return {s for s in candidates if self.contains(s)}
+
+
+def get_search(store):
+    return store.attach('search', SearchIndex)
@@ -0,0 +1,509 @@
+# Endpoint HTTP SPARQL tanpa UI (SPARQL 1.1 Protocol)
+# Server asyncio (stdlib, tanpa framework) di atas GraphStore, katalog SPARQL_QUERIES
+# dan agregat dashboard yang sama dengan aplikasi Streamlit:
+#
+#   GET  /sparql?query=...                       query (SELECT/ASK/CONSTRUCT/DESCRIBE)
+#        &infer=1                                atas graph + closure RDFS (inference.py)
+#        &offset=n&max_rows=m                    hanya baris/triple [n, n + m)
+#        &timeout=detik                          batas waktu (maks. sparql.TIME_BUDGET); 503
+#   POST /sparql  application/x-www-form-urlencoded  query=... atau update=...
+#   POST /sparql  application/sparql-query       body = query
+#   POST /sparql  application/sparql-update      body = update
+#   GET  /cases                                  katalog kasus (JSON)
+#   GET  /cases/<n>                              jalankan kasus ke-n (1, 2, ...)
+#   GET  /entities?type=<IRI>, GET /customers     ID entitas untuk dropdown (entity_index.py)
+#   GET  /products?brand=&category=&sort=&page=  satu halaman view produk (product_view.py)
+#   GET  /search?q=...                           pencarian teks (search_index.py)
+#   GET  /views/<dimensi>                        agregat dashboard (analytics.py)
+#   GET  /health, GET /metrics (Prometheus, lihat profiling.py)
+#
+# Format hasil dipilih dari header Accept: SELECT/ASK -> sparql-results+json (default),
+# sparql-results+xml, text/csv; CONSTRUCT/DESCRIBE -> text/turtle (default),
+# application/n-triples, application/rdf+xml, application/ld+json.
+#
+# Query dijalankan paralel di thread pool; update dijalankan satu per satu di thread
+# penulis tunggal. Gate baca/tulis menahan query baru selama update berjalan dan
+# update menunggu query yang sedang berjalan selesai, karena graph rdflib tidak aman
+# dibaca sambil diubah. Update hanya mendukung INSERT DATA / DELETE DATA pada default
+# graph: perubahan diteruskan ke store.apply sehingga tercatat di log yang sama.
+# Parameter absent=<IRI> (boleh berulang) menolak update dengan 409 jika IRI tersebut
+# sudah dipakai; dicek di thread penulis sehingga tidak ada update lain di antaranya.
+# Endpoint JSON di atas dipakai aplikasi Streamlit dalam mode API (sparql_client.py),
+# sehingga aplikasi tidak perlu memuat graph sendiri.
+# Hasil yang sudah diserialisasi di-cache per (generation graph, query, format).
+# Dengan GADGET_SNAPSHOT_READERS=n query dievaluasi di n proses pembaca snapshot mmap
+# (snapshot.py) selama snapshot sama dengan versi graph; lihat execute_query.
+#
+# Jalankan: python server.py [--host 127.0.0.1] [--port 8000] [--ttl data_gadget.ttl]
+
+from rdflib import URIRef
+from rdflib.plugins.sparql import prepareUpdate
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import os
+
+from graph_store import get_store, local_name
+import analytics
+import entity_index
+import inference
+import product_view
+import profiling
+import queries
+import search_index
+import snapshot
+import sparql
+
+HOST = '127.0.0.1'
+PORT = 8000
+READ_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+MAX_BODY = 10 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+RESULT_TYPES = {
+    'application/sparql-results+json': 'json',
+    'application/json': 'json',
+    'application/sparql-results+xml': 'xml',
+    'application/xml': 'xml',
+    'text/csv': 'csv',
+}
+GRAPH_TYPES = {
+    'text/turtle': 'turtle',
+    'application/n-triples': 'nt',
+    'application/rdf+xml': 'xml',
+    'application/ld+json': 'json-ld',
+}
+REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 406: 'Not Acceptable', 409: 'Conflict', 413: 'Payload Too Large',
+           415: 'Unsupported Media Type', 500: 'Internal Server Error', 501: 'Not Implemented',
+           503: 'Service Unavailable'}
+
+RESPONSE_CACHE = sparql.ResultCache()
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def negotiate(accept, types):
+    # media type pertama dari Accept (urut q) yang didukung; default: entri pertama
+    choices = []
+    for i, part in enumerate((accept or '*/*').split(',')):
+        fields = part.strip().split(';')
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        choices.append((-q, i, fields[0].strip().lower()))
+    for q, _, mime in sorted(choices):
+        if q == 0:
+            continue
+        if mime in types:
+            return mime
+        if mime in ('*/*', 'application/*', 'text/*'):
+            default = next(iter(types))
+            if mime == '*/*' or default.startswith(mime[:-1]):
+                return default
+    raise HttpError(406, 'Format hasil tidak didukung: ' + (accept or ''))
+
+
+def execute_query(store, q, accept, label=None, infer=False, pool=None, offset=0, max_rows=None,
+                  time_budget=sparql.TIME_BUDGET):
+    # dijalankan di thread pool; mengembalikan (content type, body bytes). Evaluasi dibatasi
+    # time_budget detik (503 jika lewat, lock baca dilepas) dan hanya baris/triple
+    # [offset, offset + max_rows) yang dikirim. Dengan pool (snapshot.ReadPool) query
+    # tanpa inferensi dijalankan di proses pembaca snapshot jika snapshot sama dengan
+    # versi graph yang sedang dibaca.
+    with profiling.profile('sparql', label or sparql.query_label(q), detail=q) as prof:
+        with profiling.phase('parse'):
+            try:
+                prepared = sparql.prepare(q)
+            except Exception as e:
+                raise HttpError(400, f'Query tidak valid: {e}')
+        graph_result = prepared.algebra.name in ('ConstructQuery', 'DescribeQuery')
+        types = GRAPH_TYPES if graph_result else RESULT_TYPES
+        mime = negotiate(accept, types)
+        closure = inference.get_closure(store) if infer else None
+        try:
+            with store.read() as g:
+                if closure is not None:
+                    g = closure.union()
+                key = (store, store.generation, q, mime, infer, offset, max_rows)
+                with profiling.phase('cache'):
+                    body = RESPONSE_CACHE.get(key)
+                qres = None
+                if body is None and pool is not None and closure is None and pool.current(store):
+                    with profiling.phase('snapshot'):
+                        body = pool.serialize(q, types[mime], offset, max_rows, time_budget)
+                    RESPONSE_CACHE.put(key, body)
+                elif body is None:
+                    with profiling.phase('eval'):
+                        qres = sparql.evaluate(g, prepared, offset, max_rows, time_budget)
+                        if qres.type == 'SELECT':
+                            prof.rows = len(qres.bindings)
+        except sparql.QueryBudgetExceeded as e:
+            raise HttpError(503, str(e))
+        if qres is not None:
+            with profiling.phase('serialize'):
+                body = qres.serialize(format=types[mime])
+            RESPONSE_CACHE.put(key, body)
+    return mime + '; charset=utf-8', body
+
+
+def int_param(params, name, default):
+    try:
+        value = int(params[name][0]) if name in params else default
+    except ValueError:
+        raise HttpError(400, f'Parameter {name} tidak valid')
+    if value is not None and value < 0:
+        raise HttpError(400, f'Parameter {name} tidak valid')
+    return value
+
+
+def execute_update(store, text, absent=()):
+    # dijalankan di thread penulis; hanya INSERT DATA / DELETE DATA
+    with profiling.profile('sparql', 'update', detail=text) as prof:
+        with profiling.phase('parse'):
+            try:
+                with sparql.PARSE_LOCK:
+                    update = prepareUpdate(text, initNs=sparql.INIT_NS)
+            except Exception as e:
+                raise HttpError(400, f'Update tidak valid: {e}')
+        added, removed = [], []
+        for op in update.algebra:
+            if op.name not in ('InsertData', 'DeleteData'):
+                raise HttpError(501, f'Operasi update {op.name} tidak didukung (hanya INSERT DATA / DELETE DATA)')
+            if any(op.quads.values()):
+                raise HttpError(400, 'Named graph tidak didukung')
+            (added if op.name == 'InsertData' else removed).extend(op.triples)
+        prof.rows = len(added) + len(removed)
+        with store.read() as g:
+            for iri in absent:
+                if (URIRef(iri), None, None) in g:
+                    raise HttpError(409, f'ID {local_name(iri)} sudah dipakai')
+        store.apply(added=added, removed=removed)
+
+
+def run_case(store, number, accept, pool=None):
+    titles = list(queries.SPARQL_QUERIES)
+    if not 1 <= number <= len(titles):
+        raise HttpError(404, f'Kasus {number} tidak ada')
+    title = titles[number - 1]
+    case = queries.SPARQL_QUERIES[title]
+    if 'query' in case:
+        return execute_query(store, case['query'], accept, label=title, infer=case.get('infer', False), pool=pool)
+    store.get_graph()
+    return frame_body(analytics.get_analytics(store).table(case['view']))
+
+
+def json_body(value):
+    return 'application/json; charset=utf-8', json.dumps(value).encode('utf-8')
+
+
+def frame_body(df):
+    return 'application/json; charset=utf-8', df.to_json(orient='split', index=False).encode('utf-8')
+
+
+def list_entities(store, params):
+    store.get_graph()
+    index = entity_index.get_index(store)
+    if 'type' not in params:
+        raise HttpError(400, 'Parameter type tidak ada')
+    return json_body(index.local_names(URIRef(params['type'][0])))
+
+
+def list_customers(store):
+    store.get_graph()
+    return json_body(entity_index.get_index(store).customers())
+
+
+def product_page(store, params):
+    store.get_graph()
+    view = product_view.get_view(store)
+    sort = params.get('sort', ['ID'])[0]
+    if sort not in product_view.COLUMNS:
+        raise HttpError(400, 'Kolom sort tidak dikenal: ' + sort)
+    try:
+        page = int(params.get('page', ['0'])[0])
+    except ValueError:
+        raise HttpError(400, 'Parameter page tidak valid')
+    df, total = view.query(params.get('brand', [None])[0], params.get('category', [None])[0],
+                           sort=sort, page=max(page, 0))
+    return json_body({'total': total, 'columns': list(df.columns), 'data': df.values.tolist()})
+
+
+def search_text(store, params):
+    store.get_graph()
+    index = search_index.get_search(store)
+    text = params.get('q', [''])[0]
+    try:
+        limit = int(params.get('limit', [search_index.LIMIT])[0])
+    except ValueError:
+        raise HttpError(400, 'Parameter limit tidak valid')
+    hits = index.search(text, limit=limit)
+    with index.lock:
+        return json_body([[iri, label, sorted(index.types.get(iri, ()))] for iri, label in hits])
+
+
+def view_table(store, name):
+    store.get_graph()
+    try:
+        df = analytics.get_analytics(store).table(name)
+    except KeyError:
+        raise HttpError(404, f'View {name} tidak ada')
+    return frame_body(df)
+
+
+def catalog():
+    cases = []
+    for i, (title, case) in enumerate(queries.SPARQL_QUERIES.items(), 1):
+        cases.append({'id': i, 'title': title, 'desc': case['desc'],
+                      'query': case.get('query'), 'view': case.get('view'), 'infer': case.get('infer', False)})
+    return cases
+
+
+class ReadWriteGate:
+    # banyak pembaca atau satu penulis; penulis yang menunggu didahulukan
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    async def acquire_read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+
+    async def release_read(self):
+        async with self._cond:
+            self._readers -= 1
+            self._cond.notify_all()
+
+    async def acquire_write(self):
+        async with self._cond:
+            self._waiting_writers += 1
+            await self._cond.wait_for(lambda: not self._writing and not self._readers)
+            self._waiting_writers -= 1
+            self._writing = True
+
+    async def release_write(self):
+        async with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+
+
+class SparqlServer:
+    def __init__(self, store, host=HOST, port=PORT, read_workers=READ_WORKERS,
+                 snapshot_readers=snapshot.SNAPSHOT_READERS):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.snapshot_readers = snapshot_readers
+        self.pool = None
+        self.readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix='sparql-read')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sparql-write')
+        self.gate = None
+        self.server = None
+
+    async def start(self):
+        self.gate = ReadWriteGate()
+        # graph, agregat dan index untuk mode API dimuat sebelum menerima koneksi
+        loop = asyncio.get_running_loop()
+        for attach in (analytics.get_analytics, entity_index.get_index, product_view.get_view,
+                       search_index.get_search):
+            await loop.run_in_executor(self.writer, attach, self.store)
+        if self.snapshot_readers:
+            # snapshot pertama ditulis sebelum worker dibuka
+            publisher = await loop.run_in_executor(self.writer, snapshot.get_publisher, self.store)
+            self.pool = snapshot.ReadPool(publisher.path, self.snapshot_readers, publisher)
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+        if self.pool is not None:
+            self.pool.close()
+
+    async def read(self, fn, *args):
+        await self.gate.acquire_read()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.readers, fn, *args)
+        finally:
+            await self.gate.release_read()
+
+    async def write(self, fn, *args):
+        await self.gate.acquire_write()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.writer, fn, *args)
+        finally:
+            await self.gate.release_write()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, ctype, payload = await self.route(method, target, headers, body)
+                except HttpError as e:
+                    status, ctype, payload = e.status, 'text/plain; charset=utf-8', str(e).encode('utf-8')
+                except Exception as e:
+                    status, ctype, payload = 500, 'text/plain; charset=utf-8', repr(e).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await write_response(writer, status, ctype, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as e:
+            await write_response(writer, e.status, 'text/plain; charset=utf-8', str(e).encode('utf-8'), False)
+        finally:
+            writer.close()
+
+    async def route(self, method, target, headers, body):
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        accept = headers.get('accept')
+        if url.path == '/sparql':
+            return await self.sparql(method, params, headers, body, accept)
+        if method != 'GET':
+            raise HttpError(405, 'Hanya GET')
+        if url.path == '/cases':
+            return 200, 'application/json; charset=utf-8', json.dumps(catalog()).encode('utf-8')
+        if url.path.startswith('/cases/'):
+            try:
+                number = int(url.path[len('/cases/'):])
+            except ValueError:
+                raise HttpError(404, 'Kasus tidak ada')
+            return (200,) + await self.read(run_case, self.store, number, accept, self.pool)
+        if url.path == '/entities':
+            return (200,) + await self.read(list_entities, self.store, params)
+        if url.path == '/customers':
+            return (200,) + await self.read(list_customers, self.store)
+        if url.path == '/products':
+            return (200,) + await self.read(product_page, self.store, params)
+        if url.path == '/search':
+            return (200,) + await self.read(search_text, self.store, params)
+        if url.path.startswith('/views/'):
+            return (200,) + await self.read(view_table, self.store, url.path[len('/views/'):])
+        if url.path == '/health':
+            return 200, 'application/json', json.dumps({'status': 'ok', 'generation': self.store.generation}).encode()
+        if url.path == '/metrics':
+            return 200, 'text/plain; version=0.0.4', profiling.PROFILER.prometheus_text().encode('utf-8')
+        raise HttpError(404, 'Tidak ditemukan')
+
+    async def sparql(self, method, params, headers, body, accept):
+        ctype = headers.get('content-type', '').split(';')[0].strip().lower()
+        if method == 'GET':
+            if 'update' in params:
+                raise HttpError(400, 'Update harus memakai POST')
+        elif method == 'POST':
+            if ctype == 'application/x-www-form-urlencoded':
+                params = parse_qs(body.decode('utf-8'))
+            elif ctype == 'application/sparql-query':
+                params = dict(params, query=[body.decode('utf-8')])
+            elif ctype == 'application/sparql-update':
+                params = dict(params, update=[body.decode('utf-8')])
+            else:
+                raise HttpError(415, f'Content-Type tidak didukung: {ctype}')
+        else:
+            raise HttpError(405, 'Hanya GET dan POST')
+        for name in ('default-graph-uri', 'named-graph-uri', 'using-graph-uri', 'using-named-graph-uri'):
+            if name in params:
+                raise HttpError(400, 'Dataset RDF hanya satu graph; parameter ' + name + ' tidak didukung')
+        if 'query' in params and 'update' in params:
+            raise HttpError(400, 'Hanya satu dari query atau update')
+        if 'update' in params:
+            await self.write(execute_update, self.store, params['update'][0], params.get('absent', ()))
+            return 204, None, b''
+        if 'query' not in params:
+            raise HttpError(400, 'Parameter query tidak ada')
+        infer = params.get('infer', ['0'])[0].lower() in ('1', 'true')
+        offset = int_param(params, 'offset', 0)
+        max_rows = int_param(params, 'max_rows', None)
+        try:
+            # klien boleh meminta batas waktu lebih pendek, tidak lebih panjang
+            budget = min(float(params.get('timeout', [sparql.TIME_BUDGET])[0]), sparql.TIME_BUDGET)
+        except ValueError:
+            budget = None
+        if budget is None or not budget > 0:
+            raise HttpError(400, 'Parameter timeout tidak valid')
+        return (200,) + await self.read(execute_query, self.store, params['query'][0], accept, None, infer,
+                                        self.pool, offset, max_rows, budget)
+
+
+async def read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, 'Request line tidak valid')
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, 'Header terlalu banyak')
+    if version == 'HTTP/1.0' and 'connection' not in headers:
+        headers['connection'] = 'close'
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HttpError(400, 'Content-Length tidak valid')
+    if length < 0:
+        raise HttpError(400, 'Content-Length tidak valid')
+    if length > MAX_BODY:
+        raise HttpError(413, 'Body terlalu besar')
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+
+async def write_response(writer, status, ctype, payload, keep_alive):
+    head = [f'HTTP/1.1 {status} {REASONS.get(status, "")}', f'Content-Length: {len(payload)}',
+            'Connection: ' + ('keep-alive' if keep_alive else 'close')]
+    if ctype:
+        head.append('Content-Type: ' + ctype)
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+    await writer.drain()
+
+
+async def serve(path, host=HOST, port=PORT):
+    server = await SparqlServer(get_store(path), host, port).start()
+    print(f'SPARQL endpoint: http://{server.host}:{server.port}/sparql')
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Endpoint SPARQL toko gadget')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--ttl', default='data_gadget.ttl')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.ttl, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
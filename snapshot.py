@@ -0,0 +1,580 @@
+# Snapshot biner graph (read-only) untuk dibaca banyak proses
+# Format file (.snap), ditulis sekali lalu tidak pernah diubah:
+#   magic 'GSNAP001' | panjang metadata (uint64) | metadata JSON | padding ke 8 byte
+#   | section data (posisi tiap section tercatat di metadata, relatif ke awal data)
+# Section:
+#   offsets  uint64[n_terms + 1]  batas tiap kunci term di blob
+#   blob     kunci term (bytes), terurut, sehingga id term = urutannya dan term bisa
+#            dicari dengan binary search tanpa membangun dict
+#   spo, pos, osp  masing-masing tiga kolom int32 (triple terurut per index)
+# Kunci term: jenis (U=IRI, B=blank node, L=literal) + datatype atau '@' + lang + NUL + nilai.
+#
+# Pembaca membuka file dengan mmap dan memakai kolom lewat np.frombuffer (zero-copy):
+# page cache dipakai bersama oleh semua proses yang membuka snapshot yang sama. Pola
+# triple dijawab dengan searchsorted pada index yang cocok, lalu hanya term yang
+# dikembalikan yang di-decode (dengan cache).
+#
+# Penulis (proses yang memegang GraphStore) mem-publish snapshot baru dengan menulis ke
+# file sementara lalu os.replace. SnapshotReader memeriksa inode file pada setiap
+# get_graph() dan berpindah ke snapshot baru; query yang sedang berjalan tetap memakai
+# snapshot lama sampai selesai.
+#
+# SnapshotPublisher adalah listener GraphStore (get_publisher): setiap insert/hapus
+# dicatat sebagai delta, thread publisher menempelkannya ke snapshot sebelumnya
+# (patch_snapshot) paling sering sekali per PUBLISH_INTERVAL, tanpa lock store;
+# graph hanya disalin penuh (di dalam store.read()) saat dimuat/dibangun ulang.
+# server.py dengan GADGET_SNAPSHOT_READERS=n memakai ReadPool (n proses) untuk query
+# tanpa inferensi selama snapshot sama dengan versi graph di store; jika belum
+# ter-publish, query dijalankan di proses server seperti biasa.
+#
+# Jalankan: python snapshot.py data_gadget.ttl [data_gadget.snap]
+
+from rdflib import Graph, BNode, Literal, URIRef
+from rdflib.store import Store
+from contextlib import contextmanager
+import json
+import mmap
+import multiprocessing
+import numpy as np
+import os
+import struct
+import threading
+import time
+
+from graph_store import fsync_dir, new_graph
+import profiling
+import sparql
+
+MAGIC = b'GSNAP001'
+ALIGN = 8
+FETCH_SIZE = 1000
+TERM_CACHE_SIZE = 200000
+PUBLISH_INTERVAL = 1.0
+# jumlah proses pembaca snapshot di server.py; 0 = query dijalankan di proses server
+SNAPSHOT_READERS = int(os.environ.get('GADGET_SNAPSHOT_READERS', '0'))
+# index -> posisi (s=0, p=1, o=2) sesuai urutan sort index
+INDEX_ORDER = {'spo': (0, 1, 2), 'pos': (1, 2, 0), 'osp': (2, 0, 1)}
+
+
+def snapshot_path(path):
+    return os.path.splitext(path)[0] + '.snap'
+
+
+def term_key(term):
+    if isinstance(term, Literal):
+        aux = '@' + term.language if term.language else str(term.datatype or '')
+        return b'L' + aux.encode('utf-8') + b'\0' + str(term).encode('utf-8')
+    if isinstance(term, BNode):
+        return b'B\0' + str(term).encode('utf-8')
+    return b'U\0' + str(term).encode('utf-8')
+
+
+def key_term(key):
+    kind = key[:1]
+    aux, value = key[1:].split(b'\0', 1)
+    value = value.decode('utf-8')
+    if kind == b'L':
+        aux = aux.decode('utf-8')
+        if aux.startswith('@'):
+            return Literal(value, lang=aux[1:])
+        return Literal(value, datatype=aux or None)
+    if kind == b'B':
+        return BNode(value)
+    return URIRef(value)
+
+
+def align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# -----------------------------
+# Tulis
+# -----------------------------
+
+def write_snapshot(triples, path, namespaces=(), generation=0):
+    with profiling.profile('graph', 'snapshot_write', detail=path) as prof:
+        with profiling.phase('encode'):
+            keys = {}
+            rows = []
+            for t in triples:
+                row = []
+                for term in t:
+                    key = keys.get(term)
+                    if key is None:
+                        key = keys[term] = term_key(term)
+                    row.append(key)
+                rows.append(row)
+            ordered = sorted(set(keys.values()))
+            ids = {key: i for i, key in enumerate(ordered)}
+            del keys
+            spo = np.array([[ids[k] for k in row] for row in rows], dtype=np.int32).reshape(-1, 3)
+            del rows
+            offsets = np.zeros(len(ordered) + 1, dtype=np.uint64)
+            np.cumsum([len(k) for k in ordered], out=offsets[1:])
+            blob = b''.join(ordered)
+        prof.rows = len(spo)
+        _write(path, spo, offsets, blob, namespaces, generation)
+    return path
+
+
+def patch_snapshot(path, added, removed, generation):
+    # snapshot baru = snapshot di path + delta, tanpa membaca graph. Term baru disisipkan
+    # ke kamus terurut (id lama digeser dengan searchsorted), baris triple dihapus/ditambah
+    # di array numpy, lalu index disusun ulang. Delta boleh tumpang tindih dengan isi
+    # snapshot (triple yang sudah ada / sudah terhapus dilewati). Term yang tidak lagi
+    # dipakai tetap di kamus sampai publish penuh berikutnya.
+    with profiling.profile('graph', 'snapshot_patch', detail=path) as prof:
+        snap = Snapshot(path)
+        with profiling.phase('encode'):
+            drop = []
+            for t in removed:
+                row = snap.row([snap.lookup(term) for term in t])
+                if row is not None:
+                    drop.append(row)
+            rows = []
+            for t in added:
+                ids = [snap.lookup(term) for term in t]
+                if snap.row(ids) is None:
+                    # term baru sementara diwakili kuncinya
+                    rows.append([term_key(term) if tid is None else tid for term, tid in zip(t, ids)])
+            fresh = sorted({k for row in rows for k in row if isinstance(k, bytes)})
+            # posisi sisip tiap kunci baru di antara kunci lama; id baru = posisi + urutannya
+            at = np.array([snap.search(k) for k in fresh], dtype=np.int64)
+            remap = np.arange(snap.terms, dtype=np.int64)
+            remap += np.searchsorted(at, remap, 'right')
+            fresh_ids = {k: int(i) + j for j, (k, i) in enumerate(zip(fresh, at))}
+
+            spo = remap[np.stack(snap.indexes['spo'], axis=1)]
+            spo = np.delete(spo, np.array(drop, dtype=np.int64), axis=0)
+            if rows:
+                new = [[fresh_ids[k] if isinstance(k, bytes) else int(remap[k]) for k in row] for row in rows]
+                spo = np.concatenate([spo, np.array(new, dtype=np.int64)])
+            spo = spo.astype(np.int32)
+
+            lengths = np.insert(np.diff(snap.offsets), at, [len(k) for k in fresh])
+            offsets = np.zeros(len(lengths) + 1, dtype=np.uint64)
+            np.cumsum(lengths, out=offsets[1:])
+            old = snap.blob()
+            pieces, last = [], 0
+            for k, i in zip(fresh, at):
+                cut = int(snap.offsets[i])
+                pieces += [old[last:cut], k]
+                last = cut
+            pieces.append(old[last:])
+            blob = b''.join(pieces)
+        prof.rows = len(drop) + len(rows)
+        namespaces = snap.meta['namespaces']
+        del snap
+        _write(path, spo, offsets, blob, namespaces, generation)
+    return path
+
+
+def _write(path, spo, offsets, blob, namespaces, generation):
+    with profiling.phase('index'):
+        s, p, o = spo[:, 0], spo[:, 1], spo[:, 2]
+        indexes = {
+            'spo': np.lexsort((o, p, s)),
+            'pos': np.lexsort((s, o, p)),
+            'osp': np.lexsort((p, s, o)),
+        }
+        sections = [('offsets', offsets.tobytes()), ('blob', blob)]
+        for name, order in indexes.items():
+            for col, letter in zip(spo[order].T, 'spo'):
+                sections.append((f'{name}.{letter}', np.ascontiguousarray(col).tobytes()))
+    layout, pos = {}, 0
+    for name, data in sections:
+        layout[name] = [pos, len(data)]
+        pos = align(pos + len(data))
+    meta = json.dumps({
+        'terms': len(offsets) - 1, 'triples': len(spo), 'generation': generation,
+        'namespaces': [[prefix, str(uri)] for prefix, uri in namespaces],
+        'created': time.time(), 'sections': layout,
+    }).encode('utf-8')
+
+    tmp = path + '.tmp'
+    with profiling.phase('write'):
+        with open(tmp, 'wb') as f:
+            head = MAGIC + struct.pack('<Q', len(meta)) + meta
+            f.write(head + b'\0' * (align(len(head)) - len(head)))
+            for name, data in sections:
+                f.write(data)
+                f.write(b'\0' * (align(len(data)) - len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        fsync_dir(path)
+
+
+def publish(store, path=None):
+    # snapshot penuh dari isi GraphStore saat ini. Triple disalin di dalam store.read():
+    # generation tetap selama penyalinan dan pembaca lain tidak tertahan; hanya penulis
+    # yang menunggu. Mengembalikan generation store yang tertulis di snapshot.
+    path = path or snapshot_path(store.path)
+    with store.read() as g:
+        triples = list(g)
+        namespaces = list(g.namespaces())
+        generation = store.generation
+    write_snapshot(triples, path, namespaces, generation)
+    return generation
+
+
+class SnapshotPublisher:
+    # listener GraphStore: publish (di thread) setelah graph berubah, paling sering
+    # sekali per interval; published = generation store yang ada di file snapshot.
+    # Insert/hapus dikumpulkan sebagai delta dan ditempelkan ke snapshot sebelumnya
+    # (patch_snapshot) tanpa menyalin graph; publish penuh hanya saat graph dibangun
+    # ulang (load/reload) atau setelah publish gagal.
+    def __init__(self, store, path=None, interval=PUBLISH_INTERVAL):
+        self.store = store
+        self.path = path or snapshot_path(store.path)
+        self.interval = interval
+        self.published = None
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._stop = False
+        self._full = True
+        self._added = set()
+        self._removed = set()
+        self._generation = None
+        self._thread = threading.Thread(target=self._run, name='snapshot-publisher', daemon=True)
+        self._thread.start()
+
+    def rebuild(self, g):
+        with self._cond:
+            self._full = True
+            self._added, self._removed = set(), set()
+            self._mark()
+
+    def apply(self, added, removed):
+        # dipanggil di bawah lock tulis store, setelah generation dinaikkan
+        with self._cond:
+            for t in removed:
+                self._added.discard(t)
+                self._removed.add(t)
+            for t in added:
+                self._removed.discard(t)
+                self._added.add(t)
+            self._generation = self.store.generation
+            self._mark()
+
+    def _mark(self):
+        with self._cond:
+            self._dirty = True
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty or self._stop)
+                if self._stop:
+                    return
+                self._dirty = False
+                full, added, removed, generation = self._full, self._added, self._removed, self._generation
+                self._full = False
+                self._added, self._removed = set(), set()
+            try:
+                if full or not os.path.exists(self.path):
+                    generation = publish(self.store, self.path)
+                else:
+                    patch_snapshot(self.path, added, removed, generation)
+            except Exception:
+                # mis. disk penuh: dicoba lagi setelah interval (penuh, karena delta sudah
+                # diambil), pembaca tetap di snapshot lama
+                generation = None
+            with self._cond:
+                if generation is None:
+                    self._full = True
+                    self._dirty = True
+                else:
+                    self.published = generation
+                    self._cond.notify_all()
+                self._cond.wait_for(lambda: self._stop, self.interval)
+
+    def wait(self, generation, timeout=None):
+        # True jika snapshot dengan generation >= generation sudah ter-publish
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self.published is not None and self.published >= generation, timeout)
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+def get_publisher(store, path=None, timeout=None):
+    # listener dibuat sekali per store; kembali setelah snapshot pertama tertulis
+    publisher = store.attach('snapshot', lambda: SnapshotPublisher(store, path))
+    publisher.wait(store.generation, timeout)
+    return publisher
+
+
+# -----------------------------
+# Baca
+# -----------------------------
+
+class Snapshot:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._mmap
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path}: bukan snapshot graph')
+        (meta_len,) = struct.unpack_from('<Q', buf, len(MAGIC))
+        head = len(MAGIC) + 8
+        self.meta = json.loads(bytes(buf[head:head + meta_len]))
+        base = align(head + meta_len)
+        sections = self.meta['sections']
+
+        def array(name, dtype):
+            start, size = sections[name]
+            return np.frombuffer(buf, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=base + start)
+
+        self.offsets = array('offsets', np.uint64)
+        self._blob = base + sections['blob'][0]
+        self.indexes = {name: tuple(array(f'{name}.{c}', np.int32) for c in 'spo')
+                        for name in ('spo', 'pos', 'osp')}
+        self.terms = self.meta['terms']
+        self._cache = {}
+        self._ids = {}
+
+    def __len__(self):
+        return self.meta['triples']
+
+    def key(self, i):
+        start = self._blob + int(self.offsets[i])
+        return self._mmap[start:self._blob + int(self.offsets[i + 1])]
+
+    def term(self, i):
+        term = self._cache.get(i)
+        if term is None:
+            if len(self._cache) >= TERM_CACHE_SIZE:
+                self._cache.clear()
+                self._ids.clear()
+            term = self._cache[i] = key_term(self.key(i))
+            # term hasil decode biasanya dipakai lagi sebagai pola (join SPARQL)
+            self._ids[term] = i
+        return term
+
+    def blob(self):
+        return self._mmap[self._blob:self._blob + int(self.offsets[-1])]
+
+    def search(self, key):
+        # posisi kunci di kamus terurut (binary search), atau posisi sisipnya
+        lo, hi = 0, self.terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, term):
+        tid = self._ids.get(term)
+        if tid is not None:
+            return tid
+        key = term_key(term)
+        lo = self.search(key)
+        if lo == self.terms or self.key(lo) != key:
+            return None
+        if len(self._ids) >= TERM_CACHE_SIZE:
+            self._cache.clear()
+            self._ids.clear()
+        self._ids[term] = lo
+        return lo
+
+    def row(self, ids):
+        # posisi triple [s, p, o] (id) di index spo, atau None jika tidak ada
+        if None in ids:
+            return None
+        lo, hi = 0, len(self)
+        for col, value in zip(self.indexes['spo'], ids):
+            arr = col[lo:hi]
+            value = np.int32(value)
+            lo, hi = lo + int(arr.searchsorted(value, 'left')), lo + int(arr.searchsorted(value, 'right'))
+        return lo if lo < hi else None
+
+    def match(self, ids):
+        # kolom (s, p, o) dari triple yang cocok dengan pola id [s, p, o] (None = bebas);
+        # posisi yang terikat di awal urutan index dicari dengan searchsorted, sisanya mask
+        s, p, o = ids
+        if s is not None or (p is None and o is None):
+            name = 'spo'
+        else:
+            name = 'pos' if p is not None else 'osp'
+        cols = self.indexes[name]
+        lo, hi = 0, len(self)
+        mask = None
+        prefix = True
+        for col in INDEX_ORDER[name]:
+            value = ids[col]
+            if value is None:
+                prefix = False
+                continue
+            arr = cols[col][lo:hi]
+            # nilai harus int32: int Python membuat numpy meng-cast seluruh kolom
+            value = np.int32(value)
+            if prefix:
+                lo, hi = lo + int(arr.searchsorted(value, 'left')), lo + int(arr.searchsorted(value, 'right'))
+            else:
+                m = arr == value
+                mask = m if mask is None else mask & m
+        if mask is None:
+            return [c[lo:hi] for c in cols]
+        return [c[lo:hi][mask] for c in cols]
+
+
+class SnapshotStore(Store):
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, snap):
+        super().__init__()
+        self.snap = snap
+
+    def add(self, triple, context=None, quoted=False):
+        raise TypeError('Snapshot graph hanya bisa dibaca')
+
+    def addN(self, quads):
+        raise TypeError('Snapshot graph hanya bisa dibaca')
+
+    def remove(self, triple, context=None):
+        raise TypeError('Snapshot graph hanya bisa dibaca')
+
+    def triples(self, triple_pattern, context=None):
+        snap = self.snap
+        ids = []
+        for term in triple_pattern:
+            tid = None
+            if term is not None:
+                tid = snap.lookup(term)
+                if tid is None:
+                    return
+            ids.append(tid)
+        cols = snap.match(ids)
+        term = snap.term
+        # posisi yang terikat tidak perlu di-decode: pakai term dari pola
+        s0, p0, o0 = triple_pattern
+        for start in range(0, len(cols[0]), FETCH_SIZE):
+            chunk = [c[start:start + FETCH_SIZE].tolist() for c in cols]
+            for s, p, o in zip(*chunk):
+                yield (s0 if s0 is not None else term(s), p0 if p0 is not None else term(p),
+                       o0 if o0 is not None else term(o)), iter(())
+
+    def __len__(self, context=None):
+        return len(self.snap)
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        pass
+
+    def namespace(self, prefix):
+        for p, uri in self.snap.meta['namespaces']:
+            if p == prefix:
+                return URIRef(uri)
+        return None
+
+    def prefix(self, namespace):
+        for p, uri in self.snap.meta['namespaces']:
+            if uri == str(namespace):
+                return p
+        return None
+
+    def namespaces(self):
+        for prefix, uri in self.snap.meta['namespaces']:
+            yield prefix, URIRef(uri)
+
+
+class SnapshotReader:
+    # pengganti GraphStore untuk proses pembaca (bisa dipakai dengan sparql.run_sparql);
+    # generation naik setiap kali berpindah ke snapshot baru
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.graph = None
+        self.generation = 0
+        self._sig = None
+
+    def get_graph(self):
+        st = os.stat(self.path)
+        sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if sig != self._sig:
+            with self.lock:
+                if sig != self._sig:
+                    snap = Snapshot(self.path)
+                    self.graph = Graph(store=SnapshotStore(snap), bind_namespaces='none')
+                    self._sig = sig
+                    self.generation += 1
+        return self.graph
+
+    @contextmanager
+    def read(self):
+        # snapshot tidak pernah berubah; pergantian snapshot tidak mengganggu query berjalan
+        yield self.get_graph()
+
+
+# -----------------------------
+# Pool proses pembaca
+# -----------------------------
+
+_reader = None
+
+
+def _init_worker(path):
+    global _reader
+    _reader = SnapshotReader(path)
+
+
+def _run_select(q):
+    if sparql.prepare(q).algebra.name != 'SelectQuery':
+        raise ValueError('Worker snapshot hanya menjalankan query SELECT')
+    return sparql.run_sparql(_reader, q)
+
+
+def _serialize(q, fmt, offset=0, max_rows=None, time_budget=sparql.TIME_BUDGET):
+    # hasil query apa pun (SELECT/ASK/CONSTRUCT/DESCRIBE) sudah diserialisasi, untuk
+    # server.py; batas waktu dan potongan baris sama dengan evaluasi di proses server
+    with _reader.read() as g:
+        qres = sparql.evaluate(g, sparql.prepare(q), offset, max_rows, time_budget)
+    return qres.serialize(format=fmt)
+
+
+class ReadPool:
+    # setiap worker membuka snapshot yang sama sekali (mmap), lalu menjawab SELECT
+    def __init__(self, path, processes=None, publisher=None):
+        self.publisher = publisher
+        self.pool = multiprocessing.get_context('spawn').Pool(
+            processes, initializer=_init_worker, initargs=(path,))
+
+    def current(self, store):
+        # snapshot di file sama dengan versi graph store (panggil di dalam store.read())
+        return self.publisher is not None and self.publisher.published == store.generation
+
+    def run(self, q):
+        return self.pool.apply(_run_select, (q,))
+
+    def map(self, qs):
+        return self.pool.map(_run_select, qs)
+
+    def serialize(self, q, fmt, offset=0, max_rows=None, time_budget=sparql.TIME_BUDGET):
+        return self.pool.apply(_serialize, (q, fmt, offset, max_rows, time_budget))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+if __name__ == '__main__':
+    import sys
+    src = sys.argv[1] if len(sys.argv) > 1 else 'data_gadget.ttl'
+    out = sys.argv[2] if len(sys.argv) > 2 else snapshot_path(src)
+    g = new_graph()
+    g.parse(src, format='turtle')
+    write_snapshot(g, out, g.namespaces())
+    print(f'{len(g)} triple -> {out} ({os.path.getsize(out) / 1e6:.1f} MB)')
@@ -0,0 +1,423 @@
+# Eksekusi SPARQL dengan cache
+# - query di-compile (prepareQuery) sekali per teks query
+# - hasil disimpan di LRU cache dengan kunci (store, generation graph, teks query);
+#   setiap insert lewat GraphStore menaikkan generation sehingga hasil lama otomatis
+#   tidak terpakai lagi. Evaluasi berjalan di dalam store.read(), jadi satu query
+#   hanya melihat satu versi graph.
+# - infer=True: query dijalankan atas graph + closure RDFS (inference.py)
+# - hasil dibangun per kolom dengan tipe: IRI berulang -> categorical, literal angka
+#   (ex:totalPrice) -> float, literal xsd:date/dateTime (ex:hasDate) -> datetime.
+#   Konversi hanya dilakukan untuk nilai unik per kolom, bukan per sel.
+# - SparqlCursor: eksekusi bertahap untuk query custom. Baris diambil per halaman dari
+#   thread terpisah, dengan batas jumlah baris dan waktu.
+# - evaluate: evaluasi dengan batas waktu dan potongan baris [offset, offset + max_rows)
+#   untuk endpoint server.py (dan worker snapshot), tanpa thread.
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.namespace import XSD
+from rdflib.query import Result
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+import hashlib
+import numpy as np
+import pandas as pd
+import os
+import queue
+import threading
+import time
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow opsional (sudah ikut terpasang bersama streamlit)
+    pa = None
+
+from graph_store import new_graph
+import inference
+import profiling
+
+# prefix yang sama dengan yang dipakai G.query() pada graph store
+INIT_NS = dict(new_graph().namespaces())
+
+RESULT_CACHE_SIZE = 128
+# DataFrame hasil memakai dtype Arrow (butuh pyarrow)
+ARROW_RESULTS = os.environ.get('GADGET_ARROW_RESULTS') == '1'
+
+NUMERIC_TYPES = {
+    XSD.decimal, XSD.double, XSD.float, XSD.integer, XSD.int, XSD.long, XSD.short,
+    XSD.byte, XSD.nonNegativeInteger, XSD.positiveInteger, XSD.negativeInteger,
+    XSD.nonPositiveInteger, XSD.unsignedInt, XSD.unsignedLong, XSD.unsignedShort,
+    XSD.unsignedByte,
+}
+DATE_TYPES = {XSD.date, XSD.dateTime}
+
+# batas untuk query custom (SparqlCursor)
+PAGE_SIZE = 100
+MAX_ROWS = 10000
+TIME_BUDGET = 10.0  # detik waktu eksekusi
+# cursor yang halamannya tidak diminta lagi selama ini dianggap ditinggalkan
+IDLE_TIMEOUT = 300.0
+# semua query ad-hoc lewat SparqlCursor dicatat di satu seri profil (teks query ada
+# di slow log)
+CURSOR_PROFILE_KEY = 'custom'
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class GraphChanged(Exception):
+    pass
+
+
+class QueryCancelled(Exception):
+    pass
+
+
+class CancellableGraph(Graph):
+    # graph yang sama (store dibagi, tanpa salinan) yang memeriksa check() di setiap
+    # pola dan setiap triple yang dibaca evaluasi rdflib. Satu langkah evaluasi (join,
+    # ORDER BY atas join) bisa berjalan lama tanpa menghasilkan baris; dengan ini
+    # langkah itu tetap bisa dihentikan dan lock baca store dilepas.
+    def __init__(self, graph, check):
+        super().__init__(store=graph.store, identifier=graph.identifier,
+                         namespace_manager=graph.namespace_manager)
+        self.check = check
+
+    def triples(self, triple):
+        check = self.check
+        check()
+        for t in super().triples(triple):
+            check()
+            yield t
+
+
+def cancellable(g, check):
+    # graph + closure inferensi: setiap graph di dalam agregat dibungkus
+    if isinstance(g, ReadOnlyGraphAggregate):
+        return ReadOnlyGraphAggregate([CancellableGraph(part, check) for part in g.graphs])
+    return CancellableGraph(g, check)
+
+
+def budget_check(time_budget):
+    deadline = time.monotonic() + time_budget
+
+    def check():
+        if time.monotonic() > deadline:
+            raise QueryBudgetExceeded(f'Query dihentikan: melewati batas waktu {time_budget:g} detik')
+    return check
+
+
+def evaluate(g, prepared, offset=0, max_rows=None, time_budget=TIME_BUDGET):
+    # hasil query dengan batas waktu; SELECT hanya berisi baris [offset, offset + max_rows)
+    # dan CONSTRUCT/DESCRIBE hanya triple pada rentang yang sama. Baris setelah batas
+    # tidak dievaluasi (kecuali ORDER BY/DISTINCT yang perlu seluruh hasil).
+    # Dijalankan di dalam store.read(); QueryBudgetExceeded jika melewati time_budget.
+    qres = cancellable(g, budget_check(time_budget)).query(prepared)
+    stop = None if max_rows is None else offset + max_rows
+    if qres.type == 'SELECT':
+        page = Result('SELECT')
+        page.vars = qres.vars
+        page.bindings = [{v: t for v, t in zip(qres.vars, row) if t is not None}
+                         for row in islice(qres, offset, stop)]
+        return page
+    if qres.type in ('CONSTRUCT', 'DESCRIBE') and (offset or stop is not None):
+        page = Result(qres.type)
+        page.graph = new_graph()
+        page.graph.addN((s, p, o, page.graph) for s, p, o in islice(qres.graph, offset, stop))
+        return page
+    return qres
+
+
+# parser pyparsing tidak thread-safe: parse bersamaan (mis. dua session menjalankan
+# query baru yang sama) bisa gagal dengan ParseException palsu
+PARSE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def prepare(q):
+    # parser SPARQL (pyparsing) baru di-import saat query pertama di-compile
+    from rdflib.plugins.sparql import prepareQuery
+    with PARSE_LOCK:
+        return prepareQuery(q, initNs=INIT_NS)
+
+
+def result_to_df(qres, arrow=False):
+    return rows_to_df(result_vars(qres), list(qres), arrow)
+
+
+def result_vars(qres):
+    if qres.type == 'SELECT':
+        return [str(v) for v in qres.vars]
+    if qres.type == 'ASK':
+        return ['ask']
+    return ['s', 'p', 'o']
+
+
+def rows_to_df(cols, rows, arrow=False):
+    if rows and not isinstance(rows[0], tuple):
+        # ASK menghasilkan satu nilai bool
+        rows = [(Literal(r),) for r in rows]
+    if not rows:
+        return pd.DataFrame(columns=cols)
+    arrow = arrow and pa is not None
+    data = {}
+    for name, values in zip(cols, zip(*rows)):
+        data[name] = term_column(values, arrow)
+    return pd.DataFrame(data)
+
+
+def term_column(values, arrow=False):
+    # None (variabel OPTIONAL yang tidak terikat) -> code -1 -> NA
+    codes, uniques = pd.factorize(np.array(values, dtype=object), use_na_sentinel=True)
+    missing = codes < 0
+    if len(uniques) and all(isinstance(u, Literal) for u in uniques):
+        datatypes = {u.datatype for u in uniques}
+        if datatypes <= NUMERIC_TYPES:
+            typed = typed_uniques(uniques, lambda v: pd.to_numeric(v, errors='coerce'))
+            if typed is not None:
+                return take(typed, codes, missing, arrow)
+        elif datatypes <= DATE_TYPES:
+            typed = typed_uniques(uniques, lambda v: pd.to_datetime(v, errors='coerce', format='ISO8601'))
+            if typed is not None:
+                return take(typed, codes, missing, arrow)
+    labels = [str(u) for u in uniques]
+    # IRI (brand, kategori, customer, ...) atau teks yang sering berulang -> categorical
+    if all(isinstance(u, URIRef) for u in uniques) or len(labels) * 2 <= len(codes):
+        if arrow:
+            arr = pa.DictionaryArray.from_arrays(
+                pa.array(codes, type=pa.int32(), mask=missing), pa.array(labels, type=pa.string()))
+            return pd.arrays.ArrowExtensionArray(arr)
+        return pd.Categorical.from_codes(codes, categories=labels)
+    return take(np.array(labels, dtype=object), codes, missing, arrow)
+
+
+def typed_uniques(uniques, convert):
+    # None jika ada literal yang tidak valid (mis. tanggal "12-12-2025"): kolom tetap teks
+    typed = convert([str(u) for u in uniques])
+    if pd.isna(typed).any():
+        return None
+    return np.asarray(typed)
+
+
+def take(uniques, codes, missing, arrow):
+    col = pd.Series(uniques).take(np.where(missing, 0, codes)).reset_index(drop=True)
+    if missing.any():
+        col = col.where(~missing)
+    if arrow:
+        return pd.arrays.ArrowExtensionArray(pa.array(col, from_pandas=True))
+    return col.array
+
+
+class ResultCache:
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            df = self._data.get(key)
+            if df is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return df
+
+    def put(self, key, df):
+        with self._lock:
+            self._data[key] = df
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+RESULT_CACHE = ResultCache()
+
+
+def query_label(q):
+    # label profil untuk query tanpa judul
+    return profiling.ADHOC_PREFIX + hashlib.sha1(q.encode('utf-8')).hexdigest()[:10]
+
+
+def run_sparql(store, q, arrow=ARROW_RESULTS, label=None, infer=False):
+    # DataFrame hasil dipakai bersama antar pemanggil; jangan diubah in-place
+    with profiling.profile('sparql', label or query_label(q), detail=q) as prof:
+        # listener dibuat sebelum store.read(): attach mengambil store.lock
+        closure = inference.get_closure(store) if infer else None
+        # baris dibaca dari satu versi graph; insert menunggu sampai evaluasi selesai
+        with store.read() as g:
+            if closure is not None:
+                g = closure.union()
+            key = (store, store.generation, q, arrow, infer)
+            with profiling.phase('cache'):
+                df = RESULT_CACHE.get(key)
+            if df is None:
+                with profiling.phase('parse'):
+                    prepared = prepare(q)
+                with profiling.phase('eval'):
+                    qres = g.query(prepared)
+                    rows = list(qres)
+        if df is None:
+            with profiling.phase('frame'):
+                df = rows_to_df(result_vars(qres), rows, arrow)
+            RESULT_CACHE.put(key, df)
+        prof.rows = len(df)
+    return df
+
+
+def cache_info():
+    info = prepare.cache_info()
+    return {
+        'hits': RESULT_CACHE.hits,
+        'misses': RESULT_CACHE.misses,
+        'size': len(RESULT_CACHE._data),
+        'prepared': info.currsize,
+        'prepared_hits': info.hits,
+        'prepared_misses': info.misses,
+    }
+
+
+class SparqlCursor:
+    # Query dijalankan di thread worker yang mengirim baris per halaman lewat queue
+    # berukuran kecil, sehingga worker berhenti (menunggu) jika halaman berikutnya belum
+    # diminta. Halaman yang sudah diambil disimpan agar bisa dibuka lagi (cursor offset).
+    # Worker berhenti setelah MAX_ROWS baris atau TIME_BUDGET detik eksekusi. Batas waktu
+    # dan pembatalan juga diperiksa di dalam evaluasi rdflib (CancellableGraph), jadi
+    # langkah yang lama tanpa menghasilkan baris tetap berhenti dan melepas lock baca.
+    # Cursor yang ditinggalkan (halaman tidak diminta selama IDLE_TIMEOUT) berhenti sendiri.
+    # Setiap halaman dibaca di dalam store.read(); selama menunggu halaman diminta, lock
+    # baca dilepas agar insert tidak tertahan. Jika graph berubah di antara dua halaman,
+    # cursor berhenti dengan GraphChanged (halaman yang sudah diambil tetap tersedia).
+
+    def __init__(self, store, q, page_size=PAGE_SIZE, max_rows=MAX_ROWS,
+                 time_budget=TIME_BUDGET, arrow=ARROW_RESULTS):
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.time_budget = time_budget
+        self.arrow = arrow
+        self.query = q
+        self.vars = None
+        self.pages = []
+        self.done = False
+        self.truncated = False
+        self._frames = {}
+        self._busy = 0.0
+        self._deadline = None
+        self._queue = queue.Queue(maxsize=1)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(store, q), daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _put(self, item):
+        start = time.monotonic()
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if time.monotonic() - start > IDLE_TIMEOUT:
+                    self._cancel.set()
+        # waktu menunggu halaman diminta tidak dihitung sebagai waktu eksekusi
+        return time.monotonic() - start
+
+    def _check(self):
+        if self._cancel.is_set():
+            raise QueryCancelled()
+        if time.monotonic() > self._deadline:
+            raise QueryBudgetExceeded(
+                f'Query dihentikan: melewati batas waktu {self.time_budget:g} detik')
+
+    def _run(self, store, q):
+        start = time.monotonic()
+        idle = 0.0
+        self._deadline = start + self.time_budget
+        try:
+            with store.read() as g:
+                generation = store.generation
+                qres = CancellableGraph(g, self._check).query(prepare(q))
+                self.vars = result_vars(qres)
+                rows = iter(qres)
+            count = 0
+            while True:
+                batch, kind = [], 'end'
+                with store.read():
+                    if store.generation != generation:
+                        raise GraphChanged('Graph berubah selama query dibaca; jalankan ulang query')
+                    for row in rows:
+                        if self._cancel.is_set():
+                            return
+                        batch.append(row)
+                        count += 1
+                        self._busy = time.monotonic() - start - idle
+                        if self._busy > self.time_budget:
+                            kind = 'budget'
+                            break
+                        if count >= self.max_rows:
+                            kind = 'truncated'
+                            break
+                        if len(batch) == self.page_size:
+                            kind = 'rows'
+                            break
+                if kind == 'budget':
+                    self._put(('error', QueryBudgetExceeded(
+                        f'Query dihentikan: melewati batas waktu {self.time_budget:g} detik')))
+                    return
+                if kind != 'rows':
+                    self._put((kind, batch))
+                    return
+                idle += self._put(('rows', batch))
+                self._deadline = start + idle + self.time_budget
+        except QueryCancelled:
+            pass
+        except Exception as e:
+            self._put(('error', e))
+
+    def _fetch(self):
+        wait = max(self.time_budget - self._busy, 0) + 0.5
+        try:
+            kind, payload = self._queue.get(timeout=wait)
+        except queue.Empty:
+            self.cancel()
+            self.done = True
+            raise QueryBudgetExceeded(
+                f'Query dihentikan: melewati batas waktu {self.time_budget:g} detik')
+        if kind == 'error':
+            self.done = True
+            raise payload
+        if kind != 'rows':
+            self.done = True
+            self.truncated = kind == 'truncated'
+        if payload or not self.pages:
+            self.pages.append(payload)
+
+    def fetch_page(self, i):
+        df = self._frames.get(i)
+        if df is not None:
+            return df
+        # hanya halaman yang benar-benar diambil/dibangun yang diprofil, bukan rerun
+        with profiling.profile('sparql', CURSOR_PROFILE_KEY, detail=self.query) as prof:
+            with profiling.phase('eval'):
+                while i >= len(self.pages) and not self.done:
+                    self._fetch()
+            if i >= len(self.pages):
+                return rows_to_df(self.vars or [], [], self.arrow)
+            with profiling.phase('frame'):
+                df = self._frames[i] = rows_to_df(self.vars, self.pages[i], self.arrow)
+            prof.rows = len(df)
+        return df
+
+    def has_next(self, i):
+        return i + 1 < len(self.pages) or not self.done
@@ -0,0 +1,240 @@
+# Klien tipis untuk endpoint SPARQL (server.py)
+# Dengan GADGET_API_URL (mis. http://127.0.0.1:8000) aplikasi Streamlit menjalankan
+# query lewat endpoint alih-alih di prosesnya sendiri. Hasil sparql-results+json
+# diubah kembali ke term rdflib lalu ke DataFrame dengan sparql.rows_to_df, jadi tipe
+# kolomnya sama dengan run_sparql lokal.
+#
+# Mode API: aplikasi tidak memuat graph, listener maupun log sendiri. Dropdown entitas,
+# halaman produk, pencarian dan agregat dashboard diambil dari endpoint JSON server.py
+# lewat RemoteEntities/RemoteProducts/RemoteSearch/RemoteAnalytics (antarmuka sama
+# dengan entity_index, product_view, search_index dan analytics), query custom lewat
+# RemoteCursor, dan insert lewat INSERT DATA dengan absent=<IRI> sehingga satu-satunya
+# penulis log adalah server.
+
+from rdflib import BNode, Graph, Literal, URIRef
+from io import StringIO
+from urllib.error import HTTPError
+from urllib.parse import quote, urlencode
+import json
+import os
+import urllib.request
+import pandas as pd
+
+import product_view
+import profiling
+import sparql
+
+API_URL = os.environ.get('GADGET_API_URL')
+TIMEOUT = 30.0
+# SELECT/ASK sebagai sparql-results+json, CONSTRUCT/DESCRIBE sebagai N-Triples
+QUERY_ACCEPT = 'application/sparql-results+json, application/n-triples;q=0.9'
+# waktu tunggu HTTP di atas batas waktu query, agar 503 dari server sempat diterima
+BUDGET_MARGIN = 5.0
+
+
+class EndpointError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def json_term(value):
+    if value is None:
+        return None
+    kind = value['type']
+    if kind == 'uri':
+        return URIRef(value['value'])
+    if kind == 'bnode':
+        return BNode(value['value'])
+    return Literal(value['value'], lang=value.get('xml:lang'), datatype=value.get('datatype'))
+
+
+def send(req, timeout):
+    # mengembalikan (content type tanpa parameter, body)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.headers.get_content_type(), resp.read()
+    except HTTPError as e:
+        raise EndpointError(f'{e.code}: {e.read().decode("utf-8", "replace")}', e.code) from None
+
+
+def post(url, body, content_type, accept, timeout=TIMEOUT):
+    return send(urllib.request.Request(url, data=body, method='POST',
+                                       headers={'Content-Type': content_type, 'Accept': accept}), timeout)[1]
+
+
+def get_json(base_url, path, params=None, timeout=TIMEOUT):
+    url = base_url.rstrip('/') + path + ('?' + urlencode(params) if params else '')
+    return json.loads(send(urllib.request.Request(url, headers={'Accept': 'application/json'}), timeout)[1])
+
+
+def query(base_url, q, timeout=TIMEOUT, infer=False, offset=0, max_rows=None, time_budget=None):
+    # mengembalikan (kolom, baris term rdflib) untuk SELECT, (['s', 'p', 'o'], triple) untuk
+    # CONSTRUCT/DESCRIBE, atau bool untuk ASK. offset/max_rows: hanya potongan hasil itu
+    # yang dievaluasi dan dikirim server; time_budget: batas waktu evaluasi di server.
+    form = {'query': q}
+    if infer:
+        form['infer'] = '1'
+    if offset:
+        form['offset'] = offset
+    if max_rows is not None:
+        form['max_rows'] = max_rows
+    if time_budget is not None:
+        form['timeout'] = time_budget
+        timeout = time_budget + BUDGET_MARGIN
+    req = urllib.request.Request(base_url.rstrip('/') + '/sparql', data=urlencode(form).encode('utf-8'),
+                                 method='POST', headers={'Content-Type': 'application/x-www-form-urlencoded',
+                                                         'Accept': QUERY_ACCEPT})
+    ctype, body = send(req, timeout)
+    if ctype == 'application/n-triples':
+        g = Graph()
+        g.parse(data=body.decode('utf-8'), format='nt')
+        return ['s', 'p', 'o'], list(g)
+    data = json.loads(body)
+    if 'boolean' in data:
+        return data['boolean']
+    cols = data['head']['vars']
+    rows = [tuple(json_term(b.get(c)) for c in cols) for b in data['results']['bindings']]
+    return cols, rows
+
+
+def run_sparql(base_url, q, arrow=sparql.ARROW_RESULTS, timeout=TIMEOUT, infer=False):
+    result = query(base_url, q, timeout, infer)
+    if isinstance(result, bool):
+        return sparql.rows_to_df(['ask'], [result], arrow)
+    cols, rows = result
+    return sparql.rows_to_df(cols, rows, arrow)
+
+
+def update(base_url, text, absent=(), timeout=TIMEOUT):
+    # absent: IRI yang belum boleh dipakai; jika sudah ada, EndpointError dengan status 409
+    if absent:
+        form = [('update', text)] + [('absent', str(iri)) for iri in absent]
+        post(base_url.rstrip('/') + '/sparql', urlencode(form).encode('utf-8'),
+             'application/x-www-form-urlencoded', '*/*', timeout)
+        return
+    post(base_url.rstrip('/') + '/sparql', text.encode('utf-8'), 'application/sparql-update', '*/*', timeout)
+
+
+def insert_data(base_url, triples, absent=(), timeout=TIMEOUT):
+    body = ''.join(f'  {s.n3()} {p.n3()} {o.n3()} .\n' for s, p, o in triples)
+    update(base_url, 'INSERT DATA {\n' + body + '}', absent, timeout)
+
+
+def serialize(base_url, format='turtle', timeout=TIMEOUT):
+    mime = {'turtle': 'text/turtle', 'nt': 'application/n-triples'}[format]
+    q = 'CONSTRUCT { ?s ?p ?o } WHERE { ?s ?p ?o }'
+    return post(base_url.rstrip('/') + '/sparql', urlencode({'query': q}).encode('utf-8'),
+                'application/x-www-form-urlencoded', mime, timeout).decode('utf-8')
+
+
+class RemoteEntities:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def local_names(self, rdf_type):
+        return get_json(self.base_url, '/entities', {'type': str(rdf_type)})
+
+    def customers(self):
+        return [tuple(row) for row in get_json(self.base_url, '/customers')]
+
+
+class RemoteProducts:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def _page(self, brand, category, sort, page):
+        params = {'sort': sort, 'page': page}
+        if brand is not None:
+            params['brand'] = brand
+        if category is not None:
+            params['category'] = category
+        return get_json(self.base_url, '/products', params)
+
+    def count(self, brand=None, category=None):
+        return self._page(brand, category, 'ID', 0)['total']
+
+    def query(self, brand=None, category=None, sort='ID', page=0):
+        data = self._page(brand, category, sort, page)
+        return pd.DataFrame(data['data'], columns=data['columns'] or product_view.COLUMNS), data['total']
+
+
+class RemoteSearch:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def search(self, text, limit=None):
+        # [(IRI, teks, [IRI tipe])]; berbeda dengan SearchIndex.search, tipe ikut dikirim
+        params = {'q': text} if limit is None else {'q': text, 'limit': limit}
+        return [(URIRef(iri), label, [URIRef(t) for t in types])
+                for iri, label, types in get_json(self.base_url, '/search', params)]
+
+
+class RemoteAnalytics:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def table(self, dimension):
+        url = self.base_url.rstrip('/') + '/views/' + quote(dimension)
+        body = send(urllib.request.Request(url, headers={'Accept': 'application/json'}), TIMEOUT)[1]
+        return pd.read_json(StringIO(body.decode('utf-8')), orient='split')
+
+
+class RemoteCursor:
+    # antarmuka sama dengan sparql.SparqlCursor. Setiap halaman diminta ke endpoint dengan
+    # offset/max_rows (satu baris lebih untuk tahu ada halaman berikutnya) dan batas
+    # waktu time_budget yang ditegakkan server (503 -> QueryBudgetExceeded). Halaman
+    # dievaluasi ulang di server per permintaan, tidak ada worker yang perlu dihentikan.
+    def __init__(self, base_url, q, page_size=sparql.PAGE_SIZE, max_rows=sparql.MAX_ROWS,
+                 time_budget=sparql.TIME_BUDGET, arrow=sparql.ARROW_RESULTS):
+        self.base_url = base_url
+        self.query = q
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.time_budget = time_budget
+        self.arrow = arrow
+        self.truncated = False
+        self._frames = {}
+        self._more = {}
+
+    def cancel(self):
+        pass
+
+    def _load(self, i):
+        start = i * self.page_size
+        size = min(self.page_size, self.max_rows - start)
+        if size <= 0:
+            return [], [], False
+        try:
+            result = query(self.base_url, self.query, offset=start, max_rows=size + 1,
+                           time_budget=self.time_budget)
+        except EndpointError as e:
+            if e.status == 503:
+                raise sparql.QueryBudgetExceeded(str(e).partition(': ')[2]) from None
+            raise
+        except TimeoutError:
+            raise sparql.QueryBudgetExceeded(
+                f'Query dihentikan: melewati batas waktu {self.time_budget:g} detik') from None
+        if isinstance(result, bool):
+            return ['ask'], [result] if i == 0 else [], False
+        cols, rows = result
+        more = len(rows) > size
+        if more and start + size >= self.max_rows:
+            self.truncated = True
+            more = False
+        return cols, rows[:size], more
+
+    def fetch_page(self, i):
+        df = self._frames.get(i)
+        if df is not None:
+            return df
+        with profiling.profile('sparql', sparql.CURSOR_PROFILE_KEY, detail=self.query) as prof:
+            with profiling.phase('remote'):
+                cols, rows, self._more[i] = self._load(i)
+            with profiling.phase('frame'):
+                df = self._frames[i] = sparql.rows_to_df(cols, rows, self.arrow)
+            prof.rows = len(df)
+        return df
+
+    def has_next(self, i):
+        return self._more.get(i, False)
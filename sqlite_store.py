@@ -0,0 +1,387 @@
+# Backend graph di atas SQLite (GADGET_STORE_BACKEND=sqlite)
+# Triple disimpan sebagai id integer di tabel `triple` dengan tiga index: SPO (primary
+# key), POS dan OSP. Setiap pola triple yang diminta rdflib (termasuk saat evaluasi
+# SPARQL) menjadi satu SELECT yang memakai index, bukan scan seluruh graph. Database
+# dibuka tanpa parsing apa pun, jadi waktu start tidak bergantung pada ukuran katalog.
+#
+# Setiap apply() juga menulis perubahannya ke tabel `change` dalam transaksi yang sama.
+# Proses lain yang melihat commit baru (PRAGMA data_version) memutar ulang baris
+# tersebut ke listener-nya (index, view) alih-alih membangun ulang dari seluruh graph.
+# Hanya CHANGE_LOG_ROWS baris terakhir yang disimpan; proses yang tertinggal lebih jauh
+# dari itu membangun ulang listener-nya sekali.
+
+from rdflib import Graph, BNode, Literal, URIRef
+from rdflib.namespace import FOAF
+from rdflib.store import Store
+from itertools import groupby
+import os
+import sqlite3
+import threading
+
+import profiling
+
+from graph_store import GraphStore, EX, SCHEMA_TRIPLES, diff_triples, new_graph
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS term (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    datatype TEXT NOT NULL DEFAULT '',
+    lang TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, value, datatype, lang)
+);
+CREATE TABLE IF NOT EXISTS triple (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triple_pos ON triple (p, o, s);
+CREATE INDEX IF NOT EXISTS triple_osp ON triple (o, s, p);
+CREATE TABLE IF NOT EXISTS change (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS namespace (
+    prefix TEXT PRIMARY KEY,
+    uri TEXT NOT NULL
+);
+'''
+
+FETCH_SIZE = 1000
+TERM_CACHE_SIZE = 200000
+CHANGE_LOG_ROWS = 100000
+
+
+def term_key(term):
+    if isinstance(term, Literal):
+        return ('L', str(term), str(term.datatype or ''), term.language or '')
+    if isinstance(term, BNode):
+        return ('B', str(term), '', '')
+    return ('U', str(term), '', '')
+
+
+def make_term(kind, value, datatype, lang):
+    if kind == 'L':
+        return Literal(value, datatype=datatype or None, lang=lang or None)
+    if kind == 'B':
+        return BNode(value)
+    return URIRef(value)
+
+
+class SQLiteStore(Store):
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None):
+        self._conn = None
+        self._lock = threading.RLock()
+        self._ids = {}
+        self._terms = {}
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration, create=True):
+        self._conn = sqlite3.connect(configuration, check_same_thread=False)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+        return 1
+
+    def close(self, commit_pending_transaction=False):
+        if self._conn is None:
+            return
+        with self._lock:
+            if commit_pending_transaction:
+                self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def rollback(self):
+        with self._lock:
+            self._conn.rollback()
+            self._ids.clear()
+            self._terms.clear()
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM triple LIMIT 1').fetchone() is None
+
+    def data_version(self):
+        # berubah jika koneksi lain (proses lain) melakukan commit
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    # -----------------------------
+    # Kamus term <-> id
+    # -----------------------------
+
+    def _remember(self, term, tid):
+        if len(self._ids) >= TERM_CACHE_SIZE:
+            self._ids.clear()
+            self._terms.clear()
+        self._ids[term] = tid
+        self._terms[tid] = term
+
+    def _lookup(self, term):
+        tid = self._ids.get(term)
+        if tid is None:
+            row = self._conn.execute(
+                'SELECT id FROM term WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?',
+                term_key(term)).fetchone()
+            if row is None:
+                return None
+            tid = row[0]
+            self._remember(term, tid)
+        return tid
+
+    def _intern(self, term):
+        tid = self._lookup(term)
+        if tid is None:
+            tid = self._conn.execute(
+                'INSERT INTO term (kind, value, datatype, lang) VALUES (?, ?, ?, ?)',
+                term_key(term)).lastrowid
+            self._remember(term, tid)
+        return tid
+
+    def _decode(self, ids):
+        terms = self._terms
+        found = {i: terms[i] for i in set(ids) if i in terms}
+        missing = [i for i in set(ids) if i not in found]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            rows = self._conn.execute(
+                'SELECT id, kind, value, datatype, lang FROM term WHERE id IN (%s)'
+                % ','.join('?' * len(chunk)), chunk).fetchall()
+            for tid, kind, value, datatype, lang in rows:
+                found[tid] = make_term(kind, value, datatype, lang)
+                self._remember(found[tid], tid)
+        return [found[i] for i in ids]
+
+    # -----------------------------
+    # Interface rdflib Store
+    # -----------------------------
+
+    def add(self, triple, context=None, quoted=False):
+        self.addN([(*triple, context)])
+
+    def addN(self, quads):
+        with self._lock:
+            rows = []
+            for s, p, o, c in quads:
+                rows.append((self._intern(s), self._intern(p), self._intern(o)))
+                Store.add(self, (s, p, o), c)
+            self._conn.executemany('INSERT OR IGNORE INTO triple (s, p, o) VALUES (?, ?, ?)', rows)
+
+    def remove(self, triple, context=None):
+        with self._lock:
+            matches = [t for t, _ in self.triples(triple, context)]
+            rows = [tuple(self._lookup(term) for term in t) for t in matches]
+            self._conn.executemany('DELETE FROM triple WHERE s = ? AND p = ? AND o = ?', rows)
+            for t in matches:
+                Store.remove(self, t, context)
+
+    def _where(self, triple):
+        conds, args = [], []
+        for col, term in zip('spo', triple):
+            if term is None:
+                continue
+            tid = self._lookup(term)
+            if tid is None:
+                return None, None
+            conds.append(f'{col} = ?')
+            args.append(tid)
+        return (' WHERE ' + ' AND '.join(conds)) if conds else '', args
+
+    def triples(self, triple_pattern, context=None):
+        with self._lock:
+            where, args = self._where(triple_pattern)
+            if where is None:
+                return
+            cur = self._conn.execute('SELECT s, p, o FROM triple' + where, args)
+            rows = cur.fetchmany(FETCH_SIZE)
+        while rows:
+            with self._lock:
+                terms = self._decode([i for row in rows for i in row])
+            for i in range(0, len(terms), 3):
+                yield (terms[i], terms[i + 1], terms[i + 2]), iter(())
+            with self._lock:
+                rows = cur.fetchmany(FETCH_SIZE)
+
+    # -----------------------------
+    # Log perubahan antar proses
+    # -----------------------------
+
+    def last_change(self):
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM change').fetchone()[0]
+
+    def log_changes(self, added, removed):
+        # dipanggil di dalam transaksi apply; mengembalikan (seq pertama, seq terakhir)
+        with self._lock:
+            rows = [('-', *(self._lookup(term) for term in t)) for t in removed]
+            rows += [('+', *(self._lookup(term) for term in t)) for t in added]
+            first = self.last_change() + 1
+            self._conn.executemany('INSERT INTO change (op, s, p, o) VALUES (?, ?, ?, ?)', rows)
+            last = self.last_change()
+            self._conn.execute('DELETE FROM change WHERE seq <= ?', (last - CHANGE_LOG_ROWS,))
+            return first, last
+
+    def changes(self, after, before=None):
+        # [(op, triple)] urut seq, atau None jika sebagian sudah dihapus dari log
+        with self._lock:
+            oldest = self._conn.execute('SELECT MIN(seq) FROM change').fetchone()[0]
+            if oldest is not None and oldest > after + 1:
+                return None
+            rows = self._conn.execute(
+                'SELECT op, s, p, o FROM change WHERE seq > ? AND seq < ? ORDER BY seq',
+                (after, before if before is not None else 2 ** 62)).fetchall()
+            terms = self._decode([i for row in rows for i in row[1:]])
+        return [(row[0], tuple(terms[3 * i:3 * i + 3])) for i, row in enumerate(rows)]
+
+    def __len__(self, context=None):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM triple').fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        with self._lock:
+            if not override and self.namespace(prefix) is not None:
+                return
+            self._conn.execute('INSERT OR REPLACE INTO namespace (prefix, uri) VALUES (?, ?)',
+                               (prefix, str(namespace)))
+
+    def namespace(self, prefix):
+        with self._lock:
+            row = self._conn.execute('SELECT uri FROM namespace WHERE prefix = ?', (prefix,)).fetchone()
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace):
+        with self._lock:
+            row = self._conn.execute('SELECT prefix FROM namespace WHERE uri = ?', (str(namespace),)).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT prefix, uri FROM namespace').fetchall()
+        for prefix, uri in rows:
+            yield prefix, URIRef(uri)
+
+
+class SQLiteGraphStore(GraphStore):
+    # GraphStore dengan database SQLite (data_gadget.sqlite) sebagai penyimpanan utama.
+    # File Turtle dan log-nya hanya dipakai untuk mengisi database saat pertama kali dibuat.
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.db_path = os.path.splitext(path)[0] + '.sqlite'
+        self._data_version = None
+        # seq terakhir di tabel change yang sudah diteruskan ke listener
+        self._change_seq = 0
+
+    def get_graph(self):
+        if self.graph is not None and self.rwlock.reading():
+            return self.graph
+        with self.lock:
+            if self.graph is None:
+                self._load(None)
+            else:
+                version = self.graph.store.data_version()
+                if version != self._data_version:
+                    # commit dari proses lain
+                    self._data_version = version
+                    with self.rwlock.write():
+                        self._catch_up()
+            return self.graph
+
+    def _catch_up(self, before=None):
+        # teruskan perubahan proses lain ke listener, urut seq; True jika listener
+        # dibangun ulang dari graph (log sudah terpotong)
+        store = self.graph.store
+        changes = store.changes(self._change_seq, before)
+        self._change_seq = store.last_change() if before is None else before - 1
+        if changes is None:
+            self.generation += 1
+            self._notify_rebuild()
+            return True
+        if changes:
+            self.generation += 1
+        for op, group in groupby(changes, key=lambda change: change[0]):
+            triples = [t for _, t in group]
+            if op == '+':
+                self._notify(triples, [])
+            else:
+                self._notify([], triples)
+        return False
+
+    def _load(self, stat, digest=None):
+        with profiling.profile('graph', 'load', detail=self.db_path) as prof:
+            store = SQLiteStore()
+            g = Graph(store=store)
+            g.open(self.db_path, create=True)
+            g.bind('ex', EX)
+            g.bind('foaf', FOAF)
+            if store.is_empty():
+                # isi awal = snapshot Turtle + log backend memory (.wal.old lalu .wal),
+                # sama seperti GraphStore._load: tulisan yang belum di-compact hanya ada di log
+                src = new_graph()
+                if os.path.exists(self.path):
+                    with profiling.phase('parse'):
+                        src.parse(self.path, format='turtle')
+                with profiling.phase('replay'):
+                    self._replay(src, self.old_log_path)
+                    self._replay(src, self.log_path)
+                with profiling.phase('import'):
+                    store.addN((s, p, o, g) for s, p, o in src)
+                store.addN((s, p, o, g) for s, p, o in SCHEMA_TRIPLES)
+            store.commit()
+            self.graph = g
+            self._data_version = store.data_version()
+            self._change_seq = store.last_change()
+            self.generation += 1
+            self._notify_rebuild()
+
+    def apply(self, added=(), removed=(), sync=True):
+        # commit SQLite sudah durable; tidak ada nomor urut untuk store.sync
+        with profiling.profile('graph', 'write') as prof, self.lock:
+            g = self.get_graph()
+            added, removed = diff_triples(g, added, removed)
+            if not added and not removed:
+                return None
+            prof.rows = len(added) + len(removed)
+            with self.rwlock.write():
+                try:
+                    with profiling.phase('apply'):
+                        for t in removed:
+                            g.store.remove(t)
+                        g.store.addN((s, p, o, g) for s, p, o in added)
+                        first, last = g.store.log_changes(added, removed)
+                    with profiling.phase('commit'):
+                        g.store.commit()
+                except Exception:
+                    g.store.rollback()
+                    raise
+                # commit proses lain yang masuk sebelum transaksi ini lebih dulu
+                rebuilt = self._catch_up(before=first)
+                self._data_version = g.store.data_version()
+                self._change_seq = last
+                self.generation += 1
+                if not rebuilt:
+                    self._notify(added, removed)
+
+    def compact(self, background=False):
+        with self.lock:
+            if self.graph is not None:
+                self.graph.store._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
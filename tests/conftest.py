@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_store import GraphStore
+import server
+
+TTL = '''@prefix ex: <http://example.org/gadgetstore#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+
+ex:Apple a ex:Brand .
+ex:Samsung a ex:Brand .
+ex:Laptop a ex:Category .
+ex:Smartphone a ex:Category .
+ex:iPhone15 a ex:Product ; rdfs:label "iPhone 15" ; ex:hasBrand ex:Apple ; ex:belongsToCategory ex:Smartphone .
+ex:GalaxyS24 a ex:Product ; rdfs:label "Galaxy S24" ; ex:hasBrand ex:Samsung ; ex:belongsToCategory ex:Smartphone .
+ex:MacBookAir a ex:Product ; rdfs:label "MacBook Air" ; ex:hasBrand ex:Apple ; ex:belongsToCategory ex:Laptop .
+ex:C1 a ex:Customer ; foaf:name "Budi" .
+'''
+
+
+@pytest.fixture
+def ttl_path(tmp_path):
+    path = tmp_path / 'data_gadget.ttl'
+    path.write_text(TTL, encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def endpoint(ttl_path):
+    # server asyncio di port acak, event loop di thread sendiri
+    store = GraphStore(ttl_path)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    srv = asyncio.run_coroutine_threadsafe(server.SparqlServer(store, '127.0.0.1', 0).start(), loop).result(30)
+    yield f'http://127.0.0.1:{srv.port}', store
+    asyncio.run_coroutine_threadsafe(srv.close(), loop).result(30)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
@@ -0,0 +1,68 @@
+import datetime
+
+from rdflib import RDF, Literal
+from rdflib.namespace import XSD
+import pandas as pd
+
+from compact_store import CompactGraphStore, CompactStore
+from graph_store import EX, GraphStore, new_graph
+import analytics
+import entity_index
+import product_view
+
+ORDER = [
+    (EX.O1, RDF.type, EX.Order),
+    (EX.O1, EX.purchasedBy, EX.C1),
+    (EX.O1, EX.totalPrice, Literal('1500.5', datatype=XSD.decimal)),
+    (EX.O1, EX.hasDate, Literal('2025-01-02', datatype=XSD.date)),
+    (EX.O1, EX.orderContains, EX.iPhone15),
+    (EX.O1, EX.orderContains, EX.MacBookAir),
+]
+
+
+def test_dictionary_precomputes_local_names_and_values():
+    g = new_graph(CompactStore())
+    price = Literal('99.5', datatype=XSD.decimal)
+    day = Literal('2025-02-03', datatype=XSD.date)
+    g.add((EX.iPhone15, EX.totalPrice, price))
+    g.add((EX.iPhone15, EX.hasDate, day))
+    g.add((EX.iPhone15, EX.hasDate, Literal('12-12-2025', datatype=XSD.date)))
+    dictionary = g.store.dictionary
+    assert dictionary.local_names[dictionary.lookup(EX.iPhone15)] == 'iPhone15'
+    assert dictionary.local_name(EX.iPhone15) == 'iPhone15'
+    assert dictionary.value(price) == 99.5
+    assert dictionary.value(day) == datetime.date(2025, 2, 3)
+    assert dictionary.value(Literal('12-12-2025', datatype=XSD.date)) is None
+    assert dictionary.value(Literal('teks')) is None
+
+
+def test_listeners_match_memory_backend(ttl_path):
+    results = []
+    for cls in (GraphStore, CompactGraphStore):
+        store = cls(ttl_path)
+        store.apply(added=ORDER)
+        view, index, sales = product_view.get_view(store), entity_index.get_index(store), analytics.get_analytics(store)
+        store.apply(added=[(EX.Pixel8, RDF.type, EX.Product), (EX.Pixel8, EX.hasBrand, EX.Google)],
+                    removed=[(EX.GalaxyS24, RDF.type, EX.Product)])
+        results.append((view.query()[0], sorted(index.local_names(EX.Product)),
+                        [sales.table(d) for d in analytics.DIMENSIONS]))
+    (view_a, names_a, tables_a), (view_b, names_b, tables_b) = results
+    pd.testing.assert_frame_equal(view_a, view_b)
+    assert names_a == names_b == ['MacBookAir', 'Pixel8', 'iPhone15']
+    for a, b in zip(tables_a, tables_b):
+        pd.testing.assert_frame_equal(a, b)
+    assert tables_b[3]['Tanggal'].tolist() == ['2025-01-02']
+
+
+def test_triples_snapshot_ids_before_rows_are_reused():
+    # baris yang dihapus saat iterasi berjalan lalu dipakai ulang tidak boleh muncul
+    # sebagai triple lain yang tidak cocok dengan pola
+    g = new_graph(CompactStore())
+    g.addN((EX[f'P{i}'], RDF.type, EX.Product, g) for i in range(2500))
+    it = g.triples((None, RDF.type, EX.Product))
+    next(it)
+    g.remove((EX.P2400, RDF.type, EX.Product))
+    g.add((EX.Other, EX.hasBrand, EX.Apple))
+    rest = list(it)
+    assert all(p == RDF.type and o == EX.Product for _, p, o in rest)
+    assert len(rest) == 2499
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+
+from rdflib import RDF, RDFS, Literal
+from rdflib.namespace import XSD
+import pytest
+
+from graph_store import EX, SCHEMA_TRIPLES, GraphStore
+import db
+import mysql_sync
+
+
+@pytest.fixture
+def shop(tmp_path):
+    # SQLite sebagai pengganti MySQL, skema dan pool yang sama dengan db.py
+    path = str(tmp_path / 'shop.sqlite')
+    db.create_sqlite_schema(path)
+    pool = db.sqlite_pool(path)
+    db.add_brands([('Apple',), ('Samsung',), ('Dual',)], pool)
+    db.add_categories([('Laptop',), ('Smartphone',), ('Dual',)], pool)
+    db.add_products([('P1', 'MacBook Air', 'Apple', 'Laptop'), ('P2', 'Galaxy S24', 'Samsung', 'Smartphone'),
+                     ('P3', None, 'Apple', 'Smartphone')], pool)
+    db.add_customers([('C1', 'Budi'), ('C2', 'Sari')], pool)
+    db.add_order_with_items('O1', 'C1', 1500.5, '2025-01-02', ['P1', 'P2'], pool)
+    db.add_order_with_items('O2', 'C2', 99, '2025-02-03', ['P3'], pool)
+    return path, pool
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / 'sync.ttl'
+    path.write_text('', encoding='utf-8')
+    return GraphStore(str(path))
+
+
+def execute(path, *statements):
+    conn = sqlite3.connect(path)
+    for sql in statements:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def data_triples(store):
+    with store.read() as g:
+        return set(g) - set(SCHEMA_TRIPLES)
+
+
+def test_full_sync(shop):
+    path, pool = shop
+    g = mysql_sync.mysql_to_rdf(pool)
+    assert (EX.P1, RDFS.label, Literal('MacBook Air', datatype=XSD.string)) in g
+    assert (EX.P3, RDFS.label, None) not in g
+    assert set(g.objects(EX.O1, EX.orderContains)) == {EX.P1, EX.P2}
+    assert (EX.O1, EX.totalPrice, Literal(1500.5, datatype=XSD.decimal)) in g
+    assert set(g.objects(EX.Dual, RDF.type)) == {EX.Brand, EX.Category}
+
+
+def test_extract_error_does_not_hang(shop):
+    path, pool = shop
+    tables = [('brand', mysql_sync.brand_triples), ('missing', mysql_sync.brand_triples)]
+    errors = []
+
+    def run():
+        try:
+            mysql_sync.sync_to_graph(mysql_sync.new_graph(), pool, tables, chunk_size=1)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert isinstance(errors[0], sqlite3.OperationalError)
+
+
+def test_incremental_matches_full(shop, store, tmp_path):
+    path, pool = shop
+    checkpoint = str(tmp_path / 'sync.json')
+    stats = mysql_sync.incremental_sync(store, pool, checkpoint)
+    assert stats['product'] == {'upserted': 3, 'deleted': 0}
+    assert data_triples(store) == set(mysql_sync.mysql_to_rdf(pool))
+
+    execute(path,
+            "INSERT INTO product VALUES ('P4', 'Pixel 9', 'Samsung', 'Smartphone')",
+            "UPDATE product SET label = 'MacBook Pro' WHERE id = 'P1'",
+            "UPDATE product SET id = 'P2x' WHERE id = 'P2'",
+            "DELETE FROM customer WHERE id = 'C2'",
+            "DELETE FROM order_contains WHERE order_id = 'O1' AND product_id = 'P1'",
+            "UPDATE orders SET total_price = 10 WHERE id = 'O2'")
+    stats = mysql_sync.incremental_sync(store, pool, checkpoint)
+    assert stats['product'] == {'upserted': 3, 'deleted': 1}
+    assert stats['customer'] == {'upserted': 0, 'deleted': 1}
+    assert data_triples(store) == set(mysql_sync.mysql_to_rdf(pool))
+
+    # tanpa perubahan: graph tidak disentuh
+    generation = store.generation
+    mysql_sync.incremental_sync(store, pool, checkpoint)
+    assert store.generation == generation
+
+
+def test_delete_keeps_types_from_other_tables(shop, store, tmp_path):
+    path, pool = shop
+    checkpoint = str(tmp_path / 'sync.json')
+    mysql_sync.incremental_sync(store, pool, checkpoint)
+    # tipe dari luar MySQL (mis. ditambahkan lewat UI)
+    store.apply(added=[(EX.Dual, RDF.type, EX.Customer)])
+    execute(path, "DELETE FROM brand WHERE id = 'Dual'")
+    mysql_sync.incremental_sync(store, pool, checkpoint)
+    with store.read() as g:
+        assert set(g.objects(EX.Dual, RDF.type)) == {EX.Category, EX.Customer}
+
+
+def test_change_log_pruned_per_consumer(shop, tmp_path):
+    path, pool = shop
+    stores = []
+    for name in ('a', 'b'):
+        ttl = tmp_path / f'{name}.ttl'
+        ttl.write_text('', encoding='utf-8')
+        stores.append((GraphStore(str(ttl)), str(tmp_path / f'{name}.json')))
+    for store, checkpoint in stores:
+        mysql_sync.incremental_sync(store, pool, checkpoint)
+
+    execute(path, "UPDATE product SET label = 'Baru' WHERE id = 'P3'")
+    store_a, checkpoint_a = stores[0]
+    mysql_sync.incremental_sync(store_a, pool, checkpoint_a)
+    conn = sqlite3.connect(path)
+    # b belum membaca perubahan ini: baris log tidak boleh dipangkas
+    assert conn.execute("SELECT COUNT(*) FROM sync_log WHERE tbl = 'product'").fetchone()[0] > 0
+    store_b, checkpoint_b = stores[1]
+    mysql_sync.incremental_sync(store_b, pool, checkpoint_b)
+    assert conn.execute("SELECT COUNT(*) FROM sync_log").fetchone()[0] == 0
+    conn.close()
+    with store_b.read() as g:
+        assert g.value(EX.P3, RDFS.label) == Literal('Baru', datatype=XSD.string)
@@ -0,0 +1,94 @@
+from urllib.parse import urlencode
+import time
+
+from rdflib import RDF, RDFS, Literal
+import pytest
+
+from graph_store import EX
+import sparql
+import sparql_client
+
+PRODUCTS = 'SELECT ?s WHERE { ?s a ex:Product } ORDER BY ?s'
+CROSS_JOIN = 'SELECT (COUNT(*) AS ?n) WHERE { ?a ?b ?c . ?d ?e ?f . ?g ?h ?i . ?j ?k ?l . ?m ?n2 ?o }'
+
+
+def test_select(endpoint):
+    url, store = endpoint
+    cols, rows = sparql_client.query(url, PRODUCTS)
+    assert cols == ['s']
+    assert [r[0] for r in rows] == [EX.GalaxyS24, EX.MacBookAir, EX.iPhone15]
+
+
+def test_ask_and_construct(endpoint):
+    url, store = endpoint
+    assert sparql_client.query(url, 'ASK { ex:iPhone15 a ex:Product }') is True
+    cols, rows = sparql_client.query(url, 'CONSTRUCT { ?s a ex:Brand } WHERE { ?s a ex:Brand }')
+    assert cols == ['s', 'p', 'o']
+    assert set(rows) == {(EX.Apple, RDF.type, EX.Brand), (EX.Samsung, RDF.type, EX.Brand)}
+
+
+def test_offset_and_max_rows(endpoint):
+    url, store = endpoint
+    cols, rows = sparql_client.query(url, PRODUCTS, offset=1, max_rows=1)
+    assert [r[0] for r in rows] == [EX.MacBookAir]
+
+
+def test_update_visible_to_queries_and_store(endpoint):
+    url, store = endpoint
+    triples = [(EX.Pixel9, RDF.type, EX.Product), (EX.Pixel9, RDFS.label, Literal('Pixel "9"'))]
+    sparql_client.insert_data(url, triples, absent=[EX.Pixel9])
+    assert sparql_client.query(url, 'ASK { ex:Pixel9 rdfs:label "Pixel \\"9\\"" }') is True
+    with store.read() as g:
+        assert (EX.Pixel9, RDF.type, EX.Product) in g
+
+
+def test_insert_conflict(endpoint):
+    url, store = endpoint
+    generation = store.generation
+    with pytest.raises(sparql_client.EndpointError) as e:
+        sparql_client.insert_data(url, [(EX.iPhone15, RDFS.label, Literal('lain'))], absent=[EX.iPhone15])
+    assert e.value.status == 409
+    assert store.generation == generation
+
+
+def test_unsupported_update(endpoint):
+    url, store = endpoint
+    with pytest.raises(sparql_client.EndpointError) as e:
+        sparql_client.update(url, 'DELETE WHERE { ?s ?p ?o }')
+    assert e.value.status == 501
+
+
+def test_remote_cursor_pages(endpoint):
+    url, store = endpoint
+    cursor = sparql_client.RemoteCursor(url, PRODUCTS, page_size=2, max_rows=3)
+    assert len(cursor.fetch_page(0)) == 2
+    assert cursor.has_next(0)
+    assert len(cursor.fetch_page(1)) == 1
+    assert not cursor.has_next(1)
+    assert cursor.truncated is False
+    cursor = sparql_client.RemoteCursor(url, 'SELECT ?s ?p ?o WHERE { ?s ?p ?o }', page_size=2, max_rows=4)
+    cursor.fetch_page(0)
+    cursor.fetch_page(1)
+    assert cursor.truncated and not cursor.has_next(1)
+
+
+def test_budget_stops_server_and_releases_writes(endpoint):
+    url, store = endpoint
+    cursor = sparql_client.RemoteCursor(url, CROSS_JOIN, time_budget=0.5)
+    start = time.monotonic()
+    with pytest.raises(sparql.QueryBudgetExceeded):
+        cursor.fetch_page(0)
+    assert time.monotonic() - start < 3
+    # evaluasi di server sudah berhenti: tulis berikutnya tidak menunggu query tadi
+    start = time.monotonic()
+    sparql_client.insert_data(url, [(EX.Oppo, RDF.type, EX.Brand)], absent=[EX.Oppo])
+    assert time.monotonic() - start < 1
+
+
+def test_invalid_timeout(endpoint):
+    url, store = endpoint
+    for value in ('nan', '-1', 'x'):
+        with pytest.raises(sparql_client.EndpointError) as e:
+            sparql_client.post(url + '/sparql', urlencode({'query': PRODUCTS, 'timeout': value}).encode(),
+                               'application/x-www-form-urlencoded', 'application/sparql-results+json')
+        assert e.value.status == 400
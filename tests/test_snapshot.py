@@ -0,0 +1,57 @@
+import random
+
+from rdflib import RDF, RDFS, BNode, Literal
+from rdflib.namespace import XSD
+
+from graph_store import EX, GraphStore
+import snapshot
+
+
+def snapshot_triples(path):
+    snap = snapshot.Snapshot(path)
+    return {t for t, _ in snapshot.SnapshotStore(snap).triples((None, None, None))}, snap
+
+
+def test_patch_matches_full_publish(ttl_path, tmp_path):
+    store = GraphStore(ttl_path)
+    path = str(tmp_path / 'data_gadget.snap')
+    snapshot.publish(store, path)
+    rng = random.Random(0)
+    terms = [EX.Apple, EX.Oppo, EX.Zebra, EX.aaa, BNode('b1'), Literal('Oppo'), Literal('Oppo', lang='id'),
+             Literal('12', datatype=XSD.integer), RDF.type, RDFS.label, EX.hasBrand]
+    for _ in range(20):
+        with store.read() as g:
+            present = list(g)
+        removed = rng.sample(present, 3)
+        added = {(rng.choice(terms[:5]), rng.choice(terms[8:]), rng.choice(terms)) for _ in range(4)} - set(removed)
+        store.apply(added=added, removed=removed)
+        dropped = set(rng.sample(sorted(added), 1))
+        store.apply(removed=dropped)
+        # delta yang tumpang tindih dengan isi snapshot dilewati
+        snapshot.patch_snapshot(path, (added - dropped) | set(present[:2]), set(removed) | dropped, store.generation)
+        with store.read() as g:
+            expected = set(g)
+        got, snap = snapshot_triples(path)
+        assert got == expected
+        assert [snap.key(i) for i in range(snap.terms)] == sorted(snap.key(i) for i in range(snap.terms))
+        for name, order in snapshot.INDEX_ORDER.items():
+            cols = snap.indexes[name]
+            rows = list(zip(*(cols[c].tolist() for c in order)))
+            assert rows == sorted(rows)
+
+
+def test_publisher_applies_deltas(ttl_path):
+    store = GraphStore(ttl_path)
+    publisher = snapshot.get_publisher(store, timeout=30)
+    try:
+        store.apply(added=[(EX.Oppo, RDF.type, EX.Brand), (EX.Oppo, RDFS.label, Literal('Oppo'))])
+        store.apply(removed=[(EX.Samsung, RDF.type, EX.Brand)])
+        store.apply(added=[(EX.Samsung, RDF.type, EX.Brand)], removed=[(EX.Oppo, RDFS.label, Literal('Oppo'))])
+        assert publisher.wait(store.generation, 30)
+        with store.read() as g:
+            expected = set(g)
+        got, snap = snapshot_triples(publisher.path)
+        assert got == expected
+        assert snap.meta['generation'] == store.generation
+    finally:
+        publisher.stop()
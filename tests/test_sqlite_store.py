@@ -0,0 +1,18 @@
+from rdflib import RDF
+
+from graph_store import EX, GraphStore
+from sqlite_store import SQLiteGraphStore
+
+
+def test_first_import_replays_memory_log(ttl_path):
+    # tulisan backend memory yang belum di-compact hanya ada di .wal
+    memory = GraphStore(ttl_path)
+    memory.apply(added=[(EX.Oppo, RDF.type, EX.Brand)])
+    memory.apply(removed=[(EX.Samsung, RDF.type, EX.Brand)])
+    with memory.read() as g:
+        expected = set(g)
+    store = SQLiteGraphStore(ttl_path)
+    with store.read() as g:
+        assert set(g) == expected
+        assert (EX.Oppo, RDF.type, EX.Brand) in g
+        assert (EX.Samsung, RDF.type, EX.Brand) not in g
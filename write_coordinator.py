@@ -0,0 +1,151 @@
+# Koordinator tulis: satu thread penulis untuk semua session
+# Session tidak memanggil store.apply sendiri-sendiri; permintaan tulis dimasukkan ke
+# antrian dan satu thread penulis mengumpulkan permintaan yang datang dalam
+# COMMIT_INTERVAL detik (maks. MAX_BATCH; 0 = ambil yang sudah mengantri saja) menjadi
+# satu commit: satu tulis log, satu update graph + listener, satu fsync. fsync ditunggu
+# di thread kedua sehingga penulis sudah bisa menerapkan batch berikutnya (group commit
+# GraphStore menggabungkan fsync yang bertumpuk). Pemanggil menunggu Future sampai
+# commit-nya ter-fsync, jadi setelah write() kembali data sudah tersimpan dan terlihat.
+#
+# Optimistic concurrency: pengecekan dilakukan penulis tepat sebelum commit, terhadap
+# graph terbaru plus permintaan sebelumnya di batch yang sama.
+# - absent=[uri]: ID baru tidak boleh sudah dipakai (dua session yang menyimpan Order
+#   dengan ID sama: satu berhasil, yang lain mendapat WriteConflict, bukan digabung)
+# - generation=n: graph tidak boleh berubah sejak dibaca pada versi n
+# Permintaan yang konflik ditolak sendiri; permintaan lain di batch tetap di-commit.
+
+from concurrent.futures import Future
+import os
+import queue
+import threading
+import time
+
+from graph_store import local_name
+import profiling
+
+# jeda maksimal mengumpulkan tulisan dari session lain ke dalam satu commit
+COMMIT_INTERVAL = float(os.environ.get('GADGET_COMMIT_INTERVAL', '0'))
+MAX_BATCH = 1000
+WRITE_TIMEOUT = 30.0
+
+
+class WriteConflict(Exception):
+    pass
+
+
+class WriteRequest:
+    def __init__(self, added, removed, absent, generation):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.absent = list(absent)
+        self.generation = generation
+        self.future = Future()
+
+
+class WriteCoordinator:
+    def __init__(self, store, interval=COMMIT_INTERVAL, max_batch=MAX_BATCH):
+        self.store = store
+        self.interval = interval
+        self.max_batch = max_batch
+        self.commits = 0
+        self.requests = 0
+        self.conflicts = 0
+        self._queue = queue.Queue()
+        self._synced = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='graph-writer', daemon=True)
+        self._thread.start()
+        self._sync_thread = threading.Thread(target=self._finish, name='graph-sync', daemon=True)
+        self._sync_thread.start()
+
+    def submit(self, added=(), removed=(), absent=(), generation=None):
+        req = WriteRequest(added, removed, absent, generation)
+        self._queue.put(req)
+        return req.future
+
+    def write(self, added=(), removed=(), absent=(), generation=None, timeout=WRITE_TIMEOUT):
+        # generation graph setelah commit; WriteConflict jika pengecekan gagal
+        return self.submit(added, removed, absent, generation).result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception as e:
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_exception(e)
+
+    def _finish(self):
+        # menunggu fsync lalu melepas pemanggil, urut sesuai commit
+        while True:
+            seq, accepted, generation = self._synced.get()
+            try:
+                if seq is not None:
+                    self.store.sync(seq)
+            except Exception as e:
+                for req in accepted:
+                    req.future.set_exception(e)
+                continue
+            for req in accepted:
+                req.future.set_result(generation)
+
+    def _check(self, g, req, subjects, changed):
+        if req.generation is not None and (changed or self.store.generation != req.generation):
+            return WriteConflict(f'Graph sudah berubah sejak dibaca (versi {req.generation})')
+        for s in req.absent:
+            if s in subjects or (s, None, None) in g:
+                return WriteConflict(f'ID {local_name(s)} sudah dipakai')
+        return None
+
+    def _commit(self, batch):
+        store = self.store
+        with profiling.profile('graph', 'group_commit') as prof:
+            prof.rows = len(batch)
+            accepted = []
+            added, removed = {}, {}
+            subjects = set()
+            # pengecekan dan apply di bawah lock store yang sama: tidak ada tulisan lain di antaranya
+            with store.lock:
+                g = store.get_graph()
+                for req in batch:
+                    error = self._check(g, req, subjects, bool(added or removed))
+                    if error is not None:
+                        self.conflicts += 1
+                        req.future.set_exception(error)
+                        continue
+                    # urutan antar permintaan dipertahankan: hapus setelah tambah membatalkan tambah
+                    for t in req.removed:
+                        added.pop(t, None)
+                        removed[t] = None
+                    for t in req.added:
+                        added[t] = None
+                    subjects.update(t[0] for t in req.added)
+                    accepted.append(req)
+                seq = None
+                if added or removed:
+                    seq = store.apply(added=list(added), removed=list(removed), sync=False)
+                generation = store.generation
+            self.commits += 1
+            self.requests += len(batch)
+        self._synced.put((seq, accepted, generation))
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(store):
+    # satu koordinator (dan satu thread penulis) per store, dipakai bersama semua session
+    with _writers_lock:
+        writer = _writers.get(store)
+        if writer is None:
+            writer = _writers[store] = WriteCoordinator(store)
+        return writer